@@ -0,0 +1,207 @@
+"""
+Local stand-in for Google Drive downloads
+=========================================
+A small HTTP server that answers like drive.google.com/uc and the Drive
+API's folder listing, for trying the downloader and sync without the
+internet:
+
+    with DriveStandIn({"id1": data, ...}) as drive:
+        drive_download.download_all(files, folder, base_url=drive.url)
+        drive_sync.sync_folder(drive.folder, folder, api_url=drive.api_url,
+                               base_url=drive.url)
+
+Like Drive, files over confirm_over bytes first get a virus scan warning
+page with a download_warning cookie, and are only sent once the request
+repeats the cookie's value as confirm=. Unknown ids get a small HTML
+"access denied" page with status 200, as private files do. Range
+requests ("bytes=N-") get 206 replies, unless their If-Range doesn't
+match the file's ETag, when the whole file is sent. Each request waits
+`latency` seconds, bodies are sent at `bandwidth` bytes a second per
+connection, ids in `flaky` fail with HTTP 503 that many times first, and
+ids in `cut` have their first transfer dropped after that many bytes.
+
+All files are in one folder, listed at api_url + "/files" with the
+fields drive_sync asks for, pageSize files a page. Listings and
+downloads carry ETags and answer If-None-Match with 304 Not Modified.
+put() and remove() change the folder while the server runs. See
+benchmarks/download_speed.py and benchmarks/sync_speed.py.
+"""
+
+import hashlib
+import json
+import re
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DENIED_PAGE = b"<html><body>You need access</body></html>"
+WARNING_PAGE = b"<html><body>Google Drive can't scan this file for viruses.</body></html>"
+SEND_CHUNK = 16 * 1024
+
+
+class DriveStandIn:
+    """Serves {file id: bytes} on a local port in a background thread."""
+
+    def __init__(self, files, confirm_over=1024 * 1024, latency=0.0, bandwidth=None,
+                 flaky=None, cut=None, names=None, folder="critters-folder"):
+        self.files = dict(files)
+        self.names = {file_id: (names or {}).get(file_id, f"{file_id}.heic") for file_id in files}
+        self.modified = {file_id: _now() for file_id in files}
+        self.folder = folder
+        self.confirm_over = confirm_over
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.flaky = dict(flaky or {})
+        self.cut = dict(cut or {})
+        self.ranges = 0  # Range requests answered with 206
+        self.not_modified = 0  # requests answered with 304
+        self.sent = 0  # file bytes sent
+        self.token = secrets.token_hex(8)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self.server.daemon_threads = True
+        host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.url = host + "/uc"
+        self.api_url = host + "/drive/v3"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def put(self, file_id, data, name=None):
+        """Add or replace a file in the folder."""
+        with self._lock:
+            self.files[file_id] = data
+            self.names[file_id] = name or self.names.get(file_id, f"{file_id}.heic")
+            self.modified[file_id] = _now()
+
+    def remove(self, file_id):
+        """Delete a file from the folder."""
+        with self._lock:
+            for table in (self.files, self.names, self.modified):
+                table.pop(file_id, None)
+
+    def metadata(self, file_id):
+        """A file's entry in the folder listing."""
+        data = self.files[file_id]
+        return {"id": file_id, "name": self.names[file_id], "mimeType": "image/heic",
+                "size": str(len(data)), "md5Checksum": hashlib.md5(data).hexdigest(),
+                "modifiedTime": self.modified[file_id]}
+
+    def _fail_now(self, file_id):
+        with self._lock:
+            self.requests += 1
+            if self.flaky.get(file_id, 0) > 0:
+                self.flaky[file_id] -= 1
+                return True
+        return False
+
+    def _cut_at(self, file_id):
+        with self._lock:
+            return self.cut.pop(file_id, None)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _etag(data):
+    return '"' + hashlib.md5(data).hexdigest() + '"'
+
+
+def _handler(drive):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+        def log_message(self, *args):
+            pass
+
+        def send_body(self, status, body, content_type, headers=(), cut_at=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            view = memoryview(body)
+            for start in range(0, len(body), SEND_CHUNK):
+                if cut_at is not None and start >= cut_at:
+                    self.close_connection = True
+                    return
+                self.wfile.write(view[start:start + SEND_CHUNK])
+                if content_type == "application/octet-stream":
+                    with drive._lock:
+                        drive.sent += len(view[start:start + SEND_CHUNK])
+                if drive.bandwidth:
+                    time.sleep(SEND_CHUNK / drive.bandwidth)
+
+        def not_modified(self, etag):
+            if self.headers.get("If-None-Match") != etag:
+                return False
+            drive.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return True
+
+        def send_listing(self, query):
+            match = re.match(r"'([^']+)' in parents", query.get("q", ""))
+            with drive._lock:
+                drive.requests += 1
+                ids = sorted(drive.files) if match and match.group(1) == drive.folder else []
+                entries = [drive.metadata(file_id) for file_id in ids]
+            start = int(query.get("pageToken", 0))
+            end = start + int(query.get("pageSize", 100))
+            page = {"files": entries[start:end]}
+            if end < len(entries):
+                page["nextPageToken"] = str(end)
+            body = json.dumps(page).encode()
+            etag = _etag(body)
+            if not self.not_modified(etag):
+                self.send_body(200, body, "application/json", [("ETag", etag)])
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            file_id = query.get("id", "")
+            time.sleep(drive.latency)
+            if url.path == "/drive/v3/files":
+                return self.send_listing(query)
+            if url.path != "/uc":
+                return self.send_body(404, b"not found", "text/plain")
+            if drive._fail_now(file_id):
+                return self.send_body(503, b"busy", "text/plain")
+            data = drive.files.get(file_id)
+            if data is None:
+                return self.send_body(200, DENIED_PAGE, "text/html")
+            if len(data) > drive.confirm_over and query.get("confirm") != drive.token:
+                cookie = f"download_warning_{file_id}={drive.token}; Path=/"
+                return self.send_body(200, WARNING_PAGE, "text/html", [("Set-Cookie", cookie)])
+            etag = _etag(data)
+            if self.not_modified(etag):
+                return
+            cut_at = drive._cut_at(file_id)
+            match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if_range = self.headers.get("If-Range")
+            if match and (if_range is None or if_range == etag):
+                offset = int(match.group(1))
+                if offset >= len(data):
+                    return self.send_body(416, b"", "text/plain",
+                                          [("Content-Range", f"bytes */{len(data)}")])
+                drive.ranges += 1
+                content_range = f"bytes {offset}-{len(data) - 1}/{len(data)}"
+                return self.send_body(206, data[offset:], "application/octet-stream",
+                                      [("Content-Range", content_range), ("ETag", etag)], cut_at)
+            self.send_body(200, data, "application/octet-stream", [("ETag", etag)], cut_at)
+
+    return Handler
@@ -0,0 +1,77 @@
+"""
+Memory used by 1M synthetic items: plain dicts vs inventory_item.Item
+=====================================================================
+Run from the project folder:
+
+    python benchmarks/item_memory.py [count]
+
+Both sides are built the way load_inventory builds them (json.loads of one
+document), so the strings are shared the same way in both cases and the
+difference is the per-item container and the price objects. The title,
+description and image strings are the same on both sides and make up most
+of what is left for Item.
+"""
+
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from inventory_item import items_from_dicts
+
+
+def synthetic_document(count):
+    """An inventory.json-shaped document with `count` items."""
+    rng = random.Random(1234)
+    animals = ["Bumble Bee", "Sea Horse", "Turtle", "Dog", "Kitty", "Snake", "Flower", "Butterfly"]
+    items = []
+    for n in range(count):
+        items.append({
+            "id": f"{n:08x}",
+            "title": f"{rng.choice(animals)} #{n}",
+            "description": f"handmade critter number {n}",
+            "price": float(rng.randint(1, 10)),
+            "image": f"creature_{n}.png",
+            "sold": rng.random() < 0.2,
+        })
+    return json.dumps({"items": items, "google_drive_folder_id": ""})
+
+
+def measure(build):
+    """Bytes still allocated by whatever build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"\n  Building {count:,} synthetic items...")
+    document = synthetic_document(count)
+
+    dict_bytes, dict_items = measure(lambda: json.loads(document)["items"])
+    del dict_items
+
+    def build_items():
+        items = json.loads(document)["items"]
+        return items_from_dicts(items)
+
+    item_bytes, items = measure(build_items)
+    del items
+
+    print(f"\n  {'representation':<20}{'total MB':>12}{'bytes/item':>14}")
+    print(f"  {'dict':<20}{dict_bytes / 1e6:>12.1f}{dict_bytes / count:>14.1f}")
+    print(f"  {'Item (__slots__)':<20}{item_bytes / 1e6:>12.1f}{item_bytes / count:>14.1f}")
+    print(f"\n  Item uses {100 * (1 - item_bytes / dict_bytes):.0f}% less memory.\n")
+
+
+if __name__ == "__main__":
+    main()
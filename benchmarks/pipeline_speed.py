@@ -0,0 +1,75 @@
+"""
+Download-then-convert vs pipelined download and convert
+=======================================================
+Run from the project folder:
+
+    python benchmarks/pipeline_speed.py [photo count]
+
+Serves synthetic photos from a local stand-in for Google Drive (see
+drive_standin.py) with a bandwidth cap, then times downloading them all
+before converting any, against photo_pipeline.download_and_convert(),
+which converts each photo as soon as it arrives. The pipelined time
+should be close to the larger of the two stage times, not their sum.
+"""
+
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import drive_download
+import image_convert
+import photo_pipeline
+from drive_standin import DriveStandIn
+
+PHOTO_SIZE = (2400, 1800)
+BANDWIDTH = 2 * 1024 * 1024  # bytes a second per connection
+
+
+def synthetic_photo(n):
+    """A noisy JPEG, so it neither downloads nor converts instantly."""
+    from PIL import Image
+    rng = random.Random(n)
+    img = Image.effect_noise(PHOTO_SIZE, 64).convert("RGB")
+    img.paste((rng.randint(0, 255), 0, 0), (0, 0, 400, 400))
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=95)
+    return out.getvalue()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    photos = {f"id{n:03d}": synthetic_photo(n) for n in range(count)}
+    files = [(file_id, f"photo_{file_id}.jpg") for file_id in photos]
+    quiet = lambda line: None
+
+    with DriveStandIn(photos, confirm_over=1 << 30, bandwidth=BANDWIDTH) as drive:
+        drive_download.DRIVE_URL = drive.url
+
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            downloaded = drive_download.download_all(files, tmp, report=quiet)
+            download_time = time.perf_counter() - start
+            jobs = [(path, Path(tmp) / (path.stem + ".png")) for path in downloaded]
+            converted = image_convert.convert_batch(jobs, report=quiet, manifest_file=None)
+            sequential = time.perf_counter() - start
+        convert_time = sequential - download_time
+
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            pipelined = photo_pipeline.download_and_convert(files, tmp, tmp, report=quiet,
+                                                            manifest_file=None)
+            pipeline_time = time.perf_counter() - start
+
+    print(f"\n  {count} photos: download {download_time:.2f} s + convert {convert_time:.2f} s"
+          f" = {sequential:.2f} s one after the other ({len(converted)} converted)")
+    print(f"  pipelined: {pipeline_time:.2f} s ({len(pipelined[1])} converted)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Full download vs delta sync of the Drive folder
+===============================================
+Run from the project folder:
+
+    python benchmarks/sync_speed.py [photo count]
+
+Serves a folder of synthetic photos from a local stand-in for Google
+Drive (see drive_standin.py) and syncs it into a temporary folder with
+drive_sync.sync_folder(): first from scratch, then with nothing changed,
+after one photo is replaced, one added and one removed, after one is
+re-saved unchanged (new modified time, same contents), and after a local
+copy is deleted. Each line shows the photos fetched, the requests made
+and the bytes the server sent.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import drive_sync
+from drive_standin import DriveStandIn
+
+FILE_SIZE = 512 * 1024
+
+
+def synthetic_photo(size=FILE_SIZE):
+    """Bytes that start like a HEIC file."""
+    return b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00mif1heic" + os.urandom(size - 24)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    photos = {f"id{n:04d}": synthetic_photo() for n in range(count)}
+
+    with DriveStandIn(photos, latency=0.01, bandwidth=16 * FILE_SIZE) as drive, \
+            tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / "drive.sync.json"
+        dest = Path(tmp) / "photos"
+        dest.mkdir()
+
+        def sync(label):
+            requests, sent = drive.requests, drive.sent
+            start = time.perf_counter()
+            changed = drive_sync.sync_folder(drive.folder, dest, api_url=drive.api_url,
+                                             base_url=drive.url, manifest_file=manifest,
+                                             report=lambda line: None)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<32}{len(changed):>8}{drive.requests - requests:>10}"
+                  f"{(drive.sent - sent) / 1e6:>10.1f}{elapsed:>9.2f}")
+
+        print(f"\n  {count} photos of {FILE_SIZE // 1024} KB")
+        print(f"  {'':<32}{'fetched':>8}{'requests':>10}{'MB sent':>10}{'s':>9}")
+        sync("first sync")
+        sync("nothing changed")
+        drive.put("id0000", synthetic_photo())
+        drive.put("new", synthetic_photo())
+        drive.remove("id0001")
+        sync("1 replaced, 1 added, 1 removed")
+        drive.put("id0002", drive.files["id0002"])
+        sync("1 re-saved unchanged")
+        (dest / "id0003.heic").unlink()
+        sync("1 local copy deleted")
+    print()
+
+
+if __name__ == "__main__":
+    main()
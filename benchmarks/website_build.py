@@ -0,0 +1,58 @@
+"""
+Website build time vs number of items
+=====================================
+Run from the project folder:
+
+    python benchmarks/website_build.py [largest count]
+
+For each size the site is built in a temporary folder three ways: a cold
+build (every page rendered), a rebuild after one item's sold flag was
+toggled, and a rebuild with nothing changed (no page is rendered).
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import website_builder
+from inventory_item import Item
+
+
+def synthetic_items(count):
+    """`count` Items that look like real inventory entries."""
+    rng = random.Random(1234)
+    animals = ["Bumble Bee", "Sea Horse", "Turtle", "Dog", "Kitty", "Snake", "Flower", "Butterfly"]
+    return [Item(f"{n:08x}", f"{rng.choice(animals)} #{n}", f"handmade critter number {n}",
+                 float(rng.randint(1, 10)), f"creature_{n}.png", rng.random() < 0.2)
+            for n in range(count)]
+
+
+def timed(build):
+    start = time.perf_counter()
+    build()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    counts = [n for n in (100, 1_000, 10_000, 100_000, 1_000_000) if n <= largest]
+
+    print(f"\n  {'items':>10}{'cold ms':>12}{'1 toggle ms':>14}{'unchanged ms':>15}{'site MB':>10}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            items = synthetic_items(count)
+            cold = timed(lambda: website_builder.build_website(items, tmp))
+            items[count // 2].sold = not items[count // 2].sold
+            toggle = timed(lambda: website_builder.build_website(items, tmp))
+            unchanged = timed(lambda: website_builder.build_website(items, tmp))
+            size = sum(path.stat().st_size for path in Path(tmp).rglob("*.html")) / 1e6
+            print(f"  {count:>10,}{cold:>12.1f}{toggle:>14.1f}{unchanged:>15.1f}{size:>10.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,18 @@
 Download images from Google Drive and convert HEIC to PNG
 """
 import os
-import requests
 from pathlib import Path
 
+import drive_sync
+import image_convert
+import photo_pipeline
+
 try:
-    from PIL import Image
     import pillow_heif
     pillow_heif.register_heif_opener()
 except ImportError:
     print("Installing required libraries...")
     os.system("pip install pillow pillow-heif")
-    from PIL import Image
     import pillow_heif
     pillow_heif.register_heif_opener()
 
@@ -23,7 +24,8 @@ TEMP_DIR = SCRIPT_DIR / "temp_downloads"
 IMAGES_DIR.mkdir(exist_ok=True)
 TEMP_DIR.mkdir(exist_ok=True)
 
-# Google Drive file IDs and names from the 3D Creatures folder
+# Google Drive file IDs and names from the 3D Creatures folder, used when
+# there is no Drive folder or API key to sync with (see drive_sync)
 DRIVE_FILES = [
     ("1rBncurE4kLHBH2HfPLu8QACdEWRLCs5l", "creature_01.heic"),
     ("1szgfG6wS8YSIKemg5OW_xmxnH_W_Ik_O", "creature_02.heic"),
@@ -37,80 +39,30 @@ DRIVE_FILES = [
     ("1hrxUULJlE5A2nr5K9Dlv5-PoFLleBwmN", "creature_10.heic"),
 ]
 
-def download_from_drive(file_id, filename):
-    """Download a file from Google Drive."""
-    url = f"https://drive.google.com/uc?export=download&id={file_id}"
-
-    print(f"  Downloading {filename}...", end=" ", flush=True)
-
-    try:
-        # First request to get confirmation token if needed
-        session = requests.Session()
-        response = session.get(url, stream=True)
-
-        # Check for virus scan warning page (large files)
-        for key, value in response.cookies.items():
-            if key.startswith('download_warning'):
-                url = f"https://drive.google.com/uc?export=download&confirm={value}&id={file_id}"
-                response = session.get(url, stream=True)
-                break
-
-        if response.status_code == 200:
-            filepath = TEMP_DIR / filename
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            # Check if we got actual image data (not HTML error page)
-            file_size = filepath.stat().st_size
-            if file_size < 1000:  # Likely an error page
-                print(f"Failed (got {file_size} bytes - likely access denied)")
-                filepath.unlink()
-                return None
-
-            print(f"OK ({file_size // 1024} KB)")
-            return filepath
-        else:
-            print(f"Failed (HTTP {response.status_code})")
-            return None
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
-
-def convert_heic_to_png(heic_path):
-    """Convert HEIC file to PNG."""
-    try:
-        img = Image.open(heic_path)
-        output_name = Path(heic_path).stem + ".png"
-        output_path = IMAGES_DIR / output_name
-        img.save(output_path, "PNG")
-        print(f"  Converted: {output_name}")
-        return output_path
-    except Exception as e:
-        print(f"  Error converting {heic_path}: {e}")
-        return None
-
 def main():
     print("\n" + "=" * 60)
     print("  Downloading and Converting Images from Google Drive")
     print("=" * 60 + "\n")
 
-    downloaded = []
-    for file_id, filename in DRIVE_FILES:
-        result = download_from_drive(file_id, filename)
-        if result:
-            downloaded.append(result)
+    folder_id = drive_sync.folder_id()
+    if folder_id and drive_sync.DRIVE_API_KEY:
+        # Only photos that are new or changed in the Drive folder are fetched
+        try:
+            downloaded = drive_sync.sync_folder(folder_id, TEMP_DIR, drive_sync.DRIVE_API_KEY)
+        except (drive_sync.SyncError, OSError) as e:
+            print(f"  Sync failed: {e}")
+            downloaded = []
+        jobs = [(path, IMAGES_DIR / (path.stem + ".png")) for path in downloaded]
+        converted = image_convert.convert_batch(jobs)
+
+        print(f"\n  Downloaded {len(downloaded)} new or changed files.")
+    else:
+        # Each photo is converted as soon as it has downloaded
+        downloaded, converted = photo_pipeline.download_and_convert(DRIVE_FILES, TEMP_DIR, IMAGES_DIR)
 
-    print(f"\n  Downloaded {len(downloaded)} of {len(DRIVE_FILES)} files.\n")
+        print(f"\n  Downloaded {len(downloaded)} of {len(DRIVE_FILES)} files.")
 
     if downloaded:
-        print("  Converting HEIC to PNG...\n")
-        converted = []
-        for heic_file in downloaded:
-            result = convert_heic_to_png(heic_file)
-            if result:
-                converted.append(result)
-
         print(f"\n  Successfully converted {len(converted)} images!")
 
     # List resulting PNG files
@@ -2,17 +2,18 @@
 Download images from Google Drive and convert HEIC to PNG
 """
 import os
-import requests
 from pathlib import Path
 
+import drive_sync
+import image_convert
+import photo_pipeline
+
 try:
-    from PIL import Image
     import pillow_heif
     pillow_heif.register_heif_opener()
 except ImportError:
     print("Installing required libraries...")
     os.system("pip install pillow pillow-heif")
-    from PIL import Image
     import pillow_heif
     pillow_heif.register_heif_opener()
 
@@ -37,61 +38,25 @@ DRIVE_FILES = [
     ("1hrxUULJlE5A2nr5K9Dlv5-PoFLleBwmN", "IMG_20260108_211843.heic"),
 ]
 
-def download_from_drive(file_id, filename):
-    """Download a file from Google Drive."""
-    # Google Drive direct download URL
-    url = f"https://drive.google.com/uc?export=download&id={file_id}"
-
-    print(f"  Downloading {filename}...", end=" ")
-
-    try:
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            filepath = TEMP_DIR / filename
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print("OK")
-            return filepath
-        else:
-            print(f"Failed (HTTP {response.status_code})")
-            return None
-    except Exception as e:
-        print(f"Error: {e}")
-        return None
-
-def convert_heic_to_png(heic_path, output_name=None):
-    """Convert HEIC file to PNG."""
-    try:
-        img = Image.open(heic_path)
-
-        if output_name is None:
-            output_name = Path(heic_path).stem + ".png"
-
-        output_path = IMAGES_DIR / output_name
-        img.save(output_path, "PNG")
-        print(f"  Converted: {output_name}")
-        return output_path
-    except Exception as e:
-        print(f"  Error converting {heic_path}: {e}")
-        return None
-
-def convert_local_heic_files():
+def convert_heic_files(heic_files, workers=image_convert.CONVERT_WORKERS):
+    """Convert HEIC files to PNGs in the images folder, several at a time.
+
+    Returns the PNG paths that were made, in the same order as heic_files.
+    """
+    jobs = [(heic_file, IMAGES_DIR / (Path(heic_file).stem + ".png")) for heic_file in heic_files]
+    return image_convert.convert_batch(jobs, workers)
+
+def convert_local_heic_files(workers=image_convert.CONVERT_WORKERS):
     """Convert any HEIC files already in the images or temp folder."""
-    heic_files = list(TEMP_DIR.glob("*.heic")) + list(TEMP_DIR.glob("*.HEIC"))
-    heic_files += list(IMAGES_DIR.glob("*.heic")) + list(IMAGES_DIR.glob("*.HEIC"))
+    # One listing per folder: on Windows *.heic and *.HEIC match the same files
+    heic_files = [path for folder in (TEMP_DIR, IMAGES_DIR) for path in sorted(folder.iterdir())
+                  if path.suffix.lower() == ".heic"]
 
     if not heic_files:
         print("  No HEIC files found to convert.")
         return []
 
-    converted = []
-    for heic_file in heic_files:
-        result = convert_heic_to_png(heic_file)
-        if result:
-            converted.append(result)
-
-    return converted
+    return convert_heic_files(heic_files, workers)
 
 def main():
     print("\n" + "=" * 60)
@@ -101,26 +66,19 @@ def main():
     print("\n  Options:")
     print("    [1] Download from Google Drive and convert to PNG")
     print("    [2] Convert existing HEIC files in temp/images folder")
-    print("    [3] Exit")
+    print("    [3] Sync the Google Drive folder (only new or changed photos)")
+    print("    [4] Exit")
 
-    choice = input("\n  Enter choice (1-3): ").strip()
+    choice = input("\n  Enter choice (1-4): ").strip()
 
     if choice == "1":
         print("\n  Downloading images from Google Drive...")
         print("  (Note: Files must be publicly accessible or you must be signed in)\n")
 
-        downloaded = []
-        for file_id, filename in DRIVE_FILES:
-            result = download_from_drive(file_id, filename)
-            if result:
-                downloaded.append(result)
-
-        print(f"\n  Downloaded {len(downloaded)} files.")
+        # Each photo is converted to PNG as soon as it has downloaded
+        downloaded, converted = photo_pipeline.download_and_convert(DRIVE_FILES, TEMP_DIR, IMAGES_DIR)
 
-        if downloaded:
-            print("\n  Converting to PNG...")
-            for heic_file in downloaded:
-                convert_heic_to_png(heic_file)
+        print(f"\n  Downloaded {len(downloaded)} files, converted {len(converted)}.")
 
         print(f"\n  Done! Check the 'images' folder for PNG files.")
 
@@ -130,6 +88,19 @@ def main():
         print(f"\n  Converted {len(converted)} files.")
 
     elif choice == "3":
+        folder_id = drive_sync.folder_id() or input("\n  Drive folder ID (the end of its link): ").strip()
+        api_key = drive_sync.DRIVE_API_KEY or input("  Drive API key: ").strip()
+        print("\n  Syncing photos from Google Drive...\n")
+        try:
+            synced = drive_sync.sync_folder(folder_id, TEMP_DIR, api_key)
+        except (drive_sync.SyncError, OSError) as e:
+            print(f"  Sync failed: {e}")
+            synced = []
+
+        converted = convert_heic_files(synced) if synced else []
+        print(f"\n  Downloaded {len(synced)} new or changed files, converted {len(converted)}.")
+
+    elif choice == "4":
         print("\n  Goodbye!\n")
         return
 
@@ -0,0 +1,307 @@
+"""
+3Doodle Critters Drive Downloads
+================================
+Download photos from Google Drive, several at a time.
+
+download_all() runs DOWNLOAD_WORKERS downloads at once over one shared
+requests.Session, whose connection pool is sized to match, so connections
+are reused rather than opened per file. A request that fails with a
+network error or a busy server (HTTP 5xx/429) is retried up to RETRIES
+times, waiting BACKOFF seconds and doubling each time. Bodies are read in
+chunks that grow while data arrives quickly and shrink when it doesn't.
+
+The first chunk is checked for a photo's magic bytes (a HEIC "ftyp" box,
+JPEG or PNG), so an HTML error page is rejected straight away rather than
+saved. Data goes to a NAME.part file that is only renamed to NAME once
+complete; a retry, or the next run, carries on from the end of the .part
+file with an HTTP Range request. The ETag (or Last-Modified date) the
+.part file was started from is kept in NAME.part.validator and sent as
+If-Range, so if the file changed meanwhile the server sends all of it
+and the download starts over rather than splicing two versions together.
+A finished file is checked against the size the server announced and,
+when known, the expected size and MD5.
+fetch_file() can also send the ETag of the copy already on disk, so an
+unchanged file is answered with 304 Not Modified instead of being sent
+again (see drive_sync).
+
+DRIVE_URL can be swapped for a local stand-in server; see
+benchmarks/drive_standin.py. Used by convert_images.py and
+download_and_convert.py.
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as TransferError
+
+from file_utils import file_hash
+
+DRIVE_URL = "https://drive.google.com/uc"
+
+# Downloads running at once
+DOWNLOAD_WORKERS = 4
+
+# Retries after the first try, and the pause (seconds) before the first one
+RETRIES = 3
+BACKOFF = 1.0
+
+# Seconds to wait for the server before giving up on a try
+TIMEOUT = 30
+
+# Read sizes (bytes); the size doubles or halves to keep each read near
+# CHUNK_TARGET seconds
+CHUNK_MIN = 64 * 1024
+CHUNK_MAX = 4 * 1024 * 1024
+CHUNK_TARGET = 0.25
+
+# How photo files start: (offset, bytes)
+PHOTO_SIGNATURES = (
+    (4, b"ftyp"),            # HEIC / HEIF / AVIF
+    (0, b"\xff\xd8\xff"),    # JPEG
+    (0, b"\x89PNG\r\n\x1a\n"),  # PNG
+)
+
+_session = None  # for download_file calls without a session
+
+
+class DownloadError(Exception):
+    """A download that failed in a way retrying won't fix."""
+
+
+class _TryAgain(Exception):
+    """A failure worth retrying (HTTP 5xx or 429, or a bad resume)."""
+
+
+RETRYABLE = (requests.ConnectionError, requests.Timeout, TransferError, _TryAgain)
+
+
+def make_session(workers=DOWNLOAD_WORKERS):
+    """A Session whose connection pool keeps a connection per worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def looks_like_photo(head):
+    """True if the first bytes of a file are those of a photo."""
+    return any(head[offset:offset + len(magic)] == magic for offset, magic in PHOTO_SIGNATURES)
+
+
+def _describe(head):
+    if head.lstrip()[:1] == b"<":
+        return "got an HTML page - likely access denied"
+    return "not a photo"
+
+
+def _expected_total(response, offset):
+    """The full file size the server announced, or None."""
+    if response.status_code == 206:
+        match = re.match(r"bytes (\d+)-\d+/(\d+)", response.headers.get("Content-Range", ""))
+        if not match or int(match.group(1)) != offset:
+            return None
+        return int(match.group(2))
+    length = response.headers.get("Content-Length")
+    if length is None or response.headers.get("Content-Encoding"):
+        return None
+    return int(length)
+
+
+def _validator(response):
+    """What to send as If-Range to resume this response's file, or None.
+
+    If-Range needs a strong ETag; a weak one falls back to Last-Modified.
+    """
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def _validator_path(part_path):
+    return part_path.with_name(part_path.name + ".validator")
+
+
+def _read_validator(part_path):
+    try:
+        return _validator_path(part_path).read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+
+def _discard_part(part_path):
+    """Delete a .part file and its validator."""
+    part_path.unlink(missing_ok=True)
+    _validator_path(part_path).unlink(missing_ok=True)
+
+
+def _save(response, part_path, append):
+    """Write a response body to part_path in adaptively sized chunks.
+
+    A new file's first chunk must look like a photo, or DownloadError is
+    raised before anything is written. A new file's validator is saved
+    first, so an interrupted download can be resumed.
+    """
+    chunk_size = CHUNK_MIN
+    response.raw.decode_content = True
+    chunk = response.raw.read(chunk_size)
+    if not append:
+        if not looks_like_photo(chunk):
+            raise DownloadError(_describe(chunk))
+        validator = _validator(response)
+        if validator:
+            _validator_path(part_path).write_text(validator, encoding='utf-8')
+        else:
+            _validator_path(part_path).unlink(missing_ok=True)  # can't be resumed safely
+    with open(part_path, 'ab' if append else 'wb') as f:
+        while chunk:
+            start = time.perf_counter()
+            f.write(chunk)
+            chunk = response.raw.read(chunk_size)
+            elapsed = time.perf_counter() - start
+            if elapsed < CHUNK_TARGET / 2 and chunk_size < CHUNK_MAX:
+                chunk_size *= 2
+            elif elapsed > CHUNK_TARGET * 2 and chunk_size > CHUNK_MIN:
+                chunk_size //= 2
+
+
+def _fetch(session, file_id, filepath, base_url, expected_size, expected_md5, etag):
+    """One try at downloading a file, carrying on from its .part file."""
+    part_path = filepath.with_name(filepath.name + ".part")
+    try:
+        offset = part_path.stat().st_size
+    except FileNotFoundError:
+        offset = 0
+    validator = _read_validator(part_path) if offset else None
+    if offset and (validator is None or (expected_size is not None and offset > expected_size)):
+        _discard_part(part_path)  # no telling whether it is still the same file
+        offset = 0
+    if offset:
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+    elif etag and filepath.exists():
+        headers = {"If-None-Match": etag}
+    else:
+        headers = {}
+
+    params = {"export": "download", "id": file_id}
+    response = session.get(base_url, params=params, headers=headers, stream=True, timeout=TIMEOUT)
+
+    # Large files get a virus scan warning page first; confirm it
+    for key, value in response.cookies.items():
+        if key.startswith('download_warning'):
+            response.close()
+            response = session.get(base_url, params=dict(params, confirm=value),
+                                   headers=headers, stream=True, timeout=TIMEOUT)
+            break
+
+    with response:
+        if response.status_code >= 500 or response.status_code == 429:
+            raise _TryAgain(f"HTTP {response.status_code}")
+        if response.status_code == 304 and "If-None-Match" in headers:
+            return filepath, etag, False
+        if response.status_code == 416:
+            _discard_part(part_path)  # the .part file doesn't fit this file any more
+            raise _TryAgain("HTTP 416")
+        if response.status_code not in (200, 206):
+            raise DownloadError(f"HTTP {response.status_code}")
+        # 200 to a Range request: the file changed, so start again from zero
+        append = response.status_code == 206 and offset > 0
+        total = _expected_total(response, offset)
+        if append and total is None:
+            _discard_part(part_path)
+            raise _TryAgain("unexpected Content-Range")
+        _save(response, part_path, append)
+        reply_etag = response.headers.get("ETag")
+
+    file_size = part_path.stat().st_size
+    problem = None
+    if total is not None and file_size != total:
+        problem = f"got {file_size} of {total} bytes"
+    elif expected_size is not None and file_size != expected_size:
+        problem = f"got {file_size} bytes, expected {expected_size}"
+    elif expected_md5 is not None and file_hash(part_path, "md5") != expected_md5.lower():
+        problem = "MD5 does not match"
+    if problem:
+        _discard_part(part_path)
+        raise DownloadError(problem)
+    os.replace(part_path, filepath)
+    _validator_path(part_path).unlink(missing_ok=True)
+    return filepath, reply_etag, True
+
+
+def fetch_file(file_id, filename, dest_dir, session=None, base_url=None,
+               expected_size=None, expected_md5=None, etag=None):
+    """Download one Drive file into dest_dir, unless it hasn't changed.
+
+    base_url defaults to DRIVE_URL. expected_size and expected_md5 (hex),
+    when given, are checked once the file is complete. etag is the ETag
+    the copy already in dest_dir was sent with, if known; the server can
+    then answer that it hasn't changed. Returns (path, ETag, whether the
+    file was transferred). Raises DownloadError, or the last network
+    error once the retries are used up.
+    """
+    global _session
+    base_url = base_url or DRIVE_URL
+    if session is None:
+        if _session is None:
+            _session = make_session()
+        session = _session
+    filepath = Path(dest_dir) / filename
+    for attempt in range(RETRIES + 1):
+        try:
+            return _fetch(session, file_id, filepath, base_url, expected_size, expected_md5, etag)
+        except RETRYABLE:
+            if attempt == RETRIES:
+                raise
+            time.sleep(BACKOFF * 2 ** attempt)
+
+
+def download_file(file_id, filename, dest_dir, session=None, base_url=None,
+                  expected_size=None, expected_md5=None):
+    """Download one Drive file into dest_dir and return its path.
+
+    Arguments and errors are as for fetch_file.
+    """
+    return fetch_file(file_id, filename, dest_dir, session, base_url,
+                      expected_size, expected_md5)[0]
+
+
+def download_all(files, dest_dir, workers=DOWNLOAD_WORKERS, base_url=None, report=print,
+                 on_download=None):
+    """Download files into dest_dir, several at a time.
+
+    files are (file id, file name) tuples, optionally followed by the
+    expected size and MD5. report is called with a progress line per
+    file. on_download, if given, is called with each downloaded path from
+    the thread that downloaded it, before that thread starts another
+    file, so blocking in it holds the downloads back. Returns the
+    downloaded paths in the order given; failed files are left out.
+    """
+    files = list(files)
+    results = [None] * len(files)
+    total = len(files)
+
+    def download(file_id, filename, *expected):
+        filepath = download_file(file_id, filename, dest_dir, session, base_url, *expected)
+        if on_download is not None:
+            on_download(filepath)
+        return filepath
+
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(download, *file): index for index, file in enumerate(files)}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            filename = files[index][1]
+            try:
+                results[index] = future.result()
+                size_kb = results[index].stat().st_size // 1024
+                report(f"  [{done}/{total}] Downloaded {filename} ({size_kb} KB)")
+            except Exception as e:
+                report(f"  [{done}/{total}] Failed {filename}: {e}")
+    return [result for result in results if result is not None]
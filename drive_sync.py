@@ -0,0 +1,202 @@
+"""
+3Doodle Critters Drive Sync
+===========================
+Keep temp_downloads/ up to date with the photos folder on Google Drive,
+fetching only photos that are new or changed.
+
+Instead of a fixed list of file ids, sync_folder() lists the folder
+through the Drive API and compares each photo's size, modified time and
+MD5 with drive.sync.json, which remembers what was fetched last time
+(and each file's ETag). Requests are conditional where possible:
+
+- the listing is sent with the previous listing's ETag, so an unchanged
+  folder costs a single 304 Not Modified reply;
+- photos whose details match and whose local copy is still there are not
+  requested at all;
+- the rest are fetched through drive_download with the stored ETag, so a
+  photo whose details changed but whose contents didn't is not sent again.
+
+Photos that disappeared from the folder are forgotten; their local copies
+are left alone. DRIVE_API_URL and drive_download.DRIVE_URL can point at a
+local stand-in server; see benchmarks/drive_standin.py.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+
+import drive_download
+from file_utils import atomic_write
+import inventory_store
+import inventory_stream
+
+SCRIPT_DIR = Path(__file__).parent
+MANIFEST_FILE = SCRIPT_DIR / "drive.sync.json"
+
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+
+# The Drive folder to sync (the id at the end of the folder's link), if
+# not the inventory's google_drive_folder_id, and an API key for listing
+# it; left empty, the scripts ask for the key
+DRIVE_FOLDER_ID = ""
+DRIVE_API_KEY = ""
+
+LISTING_FIELDS = "nextPageToken, files(id, name, mimeType, size, md5Checksum, modifiedTime)"
+PHOTO_SUFFIXES = {".heic", ".heif", ".jpg", ".jpeg", ".png"}
+
+# Details that tell whether a photo changed
+COMPARED = ("name", "size", "md5Checksum", "modifiedTime")
+
+
+class SyncError(Exception):
+    """The folder couldn't be listed."""
+
+
+def folder_id():
+    """The Drive folder to sync: DRIVE_FOLDER_ID, or else the inventory's
+    google_drive_folder_id ("" if neither is set)."""
+    if DRIVE_FOLDER_ID:
+        return DRIVE_FOLDER_ID
+    # Only the top-level settings are read, not the items
+    if inventory_store.use_sqlite():
+        meta = inventory_store.load_sqlite_meta()
+    else:
+        meta = inventory_stream.read_meta()
+    return meta.get("google_drive_folder_id") or ""
+
+
+def is_photo(entry):
+    """True for listing entries that are photos (not folders or documents)."""
+    return (entry.get("mimeType", "").startswith("image/")
+            or Path(entry.get("name", "")).suffix.lower() in PHOTO_SUFFIXES)
+
+
+def _get_page(session, url, params, headers):
+    """GET one listing page, retrying like drive_download does."""
+    for attempt in range(drive_download.RETRIES + 1):
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=drive_download.TIMEOUT)
+            if response.status_code < 500 and response.status_code != 429:
+                return response
+            error = SyncError(f"listing failed: HTTP {response.status_code}")
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        if attempt == drive_download.RETRIES:
+            raise error
+        time.sleep(drive_download.BACKOFF * 2 ** attempt)
+
+
+def list_folder(folder_id, session, api_url=None, api_key=None, etag=None):
+    """The photos in a Drive folder.
+
+    Returns (photos, listing ETag), where photos are the listing entries
+    (dicts of LISTING_FIELDS), or None if the listing still has the given
+    etag. The ETag is only returned for a listing that fits on one page.
+    Raises SyncError if the folder can't be listed.
+    """
+    params = {"q": f"'{folder_id}' in parents and trashed = false",
+              "fields": LISTING_FIELDS, "pageSize": 1000}
+    if api_key:
+        params["key"] = api_key
+    photos = []
+    listing_etag = None
+    while True:
+        first_page = "pageToken" not in params
+        headers = {"If-None-Match": etag} if etag and first_page else {}
+        response = _get_page(session, (api_url or DRIVE_API_URL) + "/files", params, headers)
+        if response.status_code == 304 and headers:
+            return None, etag
+        if response.status_code != 200:
+            raise SyncError(f"listing failed: HTTP {response.status_code}")
+        page = response.json()
+        if first_page:
+            listing_etag = response.headers.get("ETag")
+        photos += [entry for entry in page.get("files", []) if is_photo(entry)]
+        if not page.get("nextPageToken"):
+            break
+        params["pageToken"] = page["nextPageToken"]
+        listing_etag = None  # one ETag can't vouch for several pages
+    return photos, listing_etag
+
+
+def _load_manifest(manifest_file, folder_id):
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("folder") == folder_id:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"folder": folder_id, "listing_etag": None, "listing": [], "files": {}}
+
+
+def _save_manifest(manifest, manifest_file):
+    with atomic_write(manifest_file) as tmp_path, \
+            open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+
+
+def sync_folder(folder_id, dest_dir, api_key=None, workers=drive_download.DOWNLOAD_WORKERS,
+                api_url=None, base_url=None, manifest_file=MANIFEST_FILE, report=print):
+    """Bring dest_dir up to date with the photos in a Drive folder.
+
+    report is called with a progress line per photo fetched. Returns the
+    paths of the photos that were new or changed, in listing order.
+    Raises SyncError if the folder can't be listed; photos that fail to
+    download are reported and tried again next time.
+    """
+    dest_dir = Path(dest_dir)
+    manifest = _load_manifest(manifest_file, folder_id)
+    known = manifest["files"]
+
+    with drive_download.make_session(workers) as session:
+        listing, listing_etag = list_folder(folder_id, session, api_url, api_key,
+                                            manifest["listing_etag"])
+        if listing is None:
+            listing = manifest["listing"]
+            report("  Folder unchanged since the last sync.")
+        manifest["listing"] = listing
+        manifest["listing_etag"] = listing_etag
+
+        wanted = []
+        for photo in listing:
+            entry = known.get(photo["id"])
+            unchanged = entry is not None and all(entry.get(key) == photo.get(key) for key in COMPARED)
+            if not unchanged or not (dest_dir / photo["name"]).exists():
+                wanted.append(photo)
+        report(f"  {len(listing)} photo(s) in the folder, {len(wanted)} new or changed.")
+
+        changed = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for index, photo in enumerate(wanted):
+                entry = known.get(photo["id"])
+                etag = entry["etag"] if entry and entry["name"] == photo["name"] else None
+                size = int(photo["size"]) if "size" in photo else None
+                futures[pool.submit(drive_download.fetch_file, photo["id"], photo["name"], dest_dir,
+                                    session, base_url, size, photo.get("md5Checksum"), etag)] = index
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                photo = wanted[index]
+                try:
+                    path, etag, transferred = future.result()
+                except Exception as e:
+                    report(f"  [{done}/{len(wanted)}] Failed {photo['name']}: {e}")
+                    continue
+                known[photo["id"]] = dict({key: photo.get(key) for key in COMPARED}, etag=etag)
+                _save_manifest(manifest, manifest_file)  # so an interrupted sync resumes
+                if transferred:
+                    changed[index] = path
+                    report(f"  [{done}/{len(wanted)}] Downloaded {photo['name']} "
+                           f"({path.stat().st_size // 1024} KB)")
+                else:
+                    report(f"  [{done}/{len(wanted)}] Not modified: {photo['name']}")
+
+    listed = {photo["id"] for photo in listing}
+    for file_id in list(known.keys() - listed):
+        del known[file_id]
+    _save_manifest(manifest, manifest_file)
+    return [changed[index] for index in sorted(changed)]
@@ -0,0 +1,61 @@
+"""
+3Doodle Critters File Helpers
+=============================
+Small file-handling pieces shared by the inventory, website, picture and
+download code. Nothing here imports the rest of the project, so any
+module (and any worker process) can use it cheaply.
+"""
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+HASH_CHUNK = 1024 * 1024
+
+
+def file_hash(path, algorithm="sha256"):
+    """Hash (hex) of a file, streamed rather than read in one go.
+
+    algorithm is any name hashlib.new() accepts, e.g. "md5".
+    """
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        digest = hashlib.new(algorithm)
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def stamp_to_json(stamp):
+    """A stamp of file sizes and modification times (see
+    inventory_store.disk_version) as it is stored in JSON."""
+    return [list(part) if part is not None else None for part in stamp]
+
+
+@contextmanager
+def atomic_write(path):
+    """Give a temporary path to write path's new contents to.
+
+    When the block ends without an error the temporary file is renamed
+    over path, so nobody ever sees a half-written file. Each call gets a
+    temporary file of its own (from tempfile.mkstemp, next to path), so
+    writers running at once don't clash. If the block deletes the
+    temporary file, path is left as it is.
+
+        with atomic_write(path) as tmp_path, open(tmp_path, 'w') as f:
+            json.dump(data, f)
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    tmp_path = Path(tmp_path)
+    try:
+        yield tmp_path
+        if tmp_path.exists():
+            os.chmod(tmp_path, 0o644)  # mkstemp makes it private to us
+            os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
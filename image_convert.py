@@ -0,0 +1,293 @@
+"""
+3Doodle Critters Image Conversion
+=================================
+Convert batches of HEIC photos to PNG, several at a time.
+
+Decoding and encoding a photo is CPU-bound, so convert_batch() spreads the
+files over a process pool (CONVERT_WORKERS processes, one per CPU by
+default). Progress and errors are printed as each file finishes, and the
+converted files are returned in the order they were given, as the old
+one-at-a-time loops did. Used by convert_images.py and
+download_and_convert.py.
+
+convert.manifest.json remembers each converted photo's size, modification
+time and hash along with the PNG made from it. A photo whose PNG is still
+there and whose contents haven't changed is skipped, so re-running a batch
+only converts new or changed photos. The manifest is saved after every
+file, so an interrupted batch carries on where it stopped.
+
+A full-resolution photo takes a lot of memory once decoded, so running
+one per CPU can run a small machine out of RAM. Before converting, each
+photo's decoded size is estimated from its header (nothing is decoded),
+and a photo is only started when it fits in MEMORY_BUDGET alongside the
+ones already running; a photo bigger than the whole budget runs on its
+own. Photos over MAX_PIXELS are written at a reduced size.
+"""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import image_store
+from file_utils import atomic_write
+
+MANIFEST_FILE = Path(__file__).parent / "convert.manifest.json"
+
+# Processes converting at once (None = one per CPU)
+CONVERT_WORKERS = None
+
+# Memory (bytes) the photos being converted at once may take between them
+MEMORY_BUDGET = 1024 * 1024 * 1024
+
+# Photos with more pixels than this are shrunk (by a whole factor) to fit
+MAX_PIXELS = 50_000_000
+
+_heif_registered = False
+
+
+def _open_image(path):
+    """Open an image with Pillow, HEIC included."""
+    global _heif_registered
+    from PIL import Image
+    if not _heif_registered:
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+        _heif_registered = True
+    return Image.open(path)
+
+
+def plan_job(heic_path, max_pixels=MAX_PIXELS):
+    """Estimate a conversion from the photo's header.
+
+    Returns (memory in bytes, reduce factor): the memory is the decoded
+    frame plus the picture being written, and the output is shrunk by the
+    factor in each direction so it has at most max_pixels. A file that
+    can't be read gives (0, 1); converting it will report the error.
+    """
+    try:
+        with _open_image(heic_path) as img:  # reads the header only
+            width, height = img.size
+            bands = len(img.getbands())
+    except Exception:
+        return 0, 1
+    factor = 1
+    while width * height > max_pixels * factor * factor:
+        factor += 1
+    frame = width * height * bands
+    return frame + frame // (factor * factor), factor
+
+
+def convert_file(heic_path, output_path, reduce=1):
+    """Convert one photo to PNG and return the output path.
+
+    With reduce > 1 the picture is shrunk by that factor in each
+    direction. The PNG is written to a temporary file and renamed into
+    place, so an interrupted conversion never leaves half a PNG behind.
+    Raises on failure. Runs in a worker process.
+    """
+    output_path = Path(output_path)
+    with atomic_write(output_path) as tmp_path, _open_image(heic_path) as img:
+        if reduce > 1:
+            img = img.reduce(reduce)
+        img.save(tmp_path, "PNG")
+    return output_path
+
+
+class ConversionManifest:
+    """Which photos have been converted, and from what contents."""
+
+    def __init__(self, manifest_file=MANIFEST_FILE):
+        self.manifest_file = Path(manifest_file)
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.changed = False
+
+    @staticmethod
+    def _key(heic_path):
+        return str(Path(heic_path).resolve())
+
+    def check(self, heic_path, output_path):
+        """Return (up to date, source details) for a job.
+
+        Up to date means the job's PNG exists and was made from a photo
+        with the same contents. The photo is only hashed when its size or
+        modification time changed. Source details go to record().
+        """
+        st = os.stat(heic_path)
+        details = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        entry = self.entries.get(self._key(heic_path))
+        output = str(Path(output_path).resolve())
+        if entry is None or entry["output"] != output or not os.path.exists(output):
+            return False, details
+        if entry["size"] == details["size"] and entry["mtime_ns"] == details["mtime_ns"]:
+            return True, entry
+        details["hash"] = image_store.file_hash(heic_path)
+        if details["hash"] == entry["hash"]:
+            self.record(heic_path, output_path, details)  # only touched
+            return True, details
+        return False, details
+
+    def record(self, heic_path, output_path, details):
+        """Remember that a photo was converted to output_path."""
+        if "hash" not in details:
+            details = dict(details, hash=image_store.file_hash(heic_path))
+        self.entries[self._key(heic_path)] = {
+            "size": details["size"], "mtime_ns": details["mtime_ns"],
+            "hash": details["hash"], "output": str(Path(output_path).resolve())}
+        self.changed = True
+
+    def save(self):
+        """Write the manifest out, atomically, if anything changed."""
+        if not self.changed:
+            return
+        with atomic_write(self.manifest_file) as tmp_path, \
+                open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        self.changed = False
+
+
+def convert_batch(jobs, workers=CONVERT_WORKERS, report=print, manifest_file=MANIFEST_FILE,
+                  memory_budget=MEMORY_BUDGET, max_pixels=MAX_PIXELS, total=None):
+    """Convert (heic path, output path) jobs, several at a time.
+
+    jobs is usually a list, but may be any iterable, such as one fed by
+    downloads as they finish (see photo_pipeline); it is then read while
+    workers are free, in a thread of its own so jobs already started keep
+    being collected as they finish, and total gives the job count for the
+    progress lines. Jobs the manifest shows are already done are skipped (pass
+    manifest_file=None to convert everything). Jobs are started in order
+    as memory_budget allows; from a list, smaller ones further on may go
+    first when the next doesn't fit. report is called with a progress
+    line per file. A job whose output path was already given by an
+    earlier job is skipped. Returns the output paths that were converted
+    or already up to date, in job order; failed files are left out.
+    """
+    manifest = ConversionManifest(manifest_file) if manifest_file else None
+    streaming = not hasattr(jobs, "__len__")
+    source = iter(jobs)
+    results = []
+    waiting = []  # (index, heic path, output path, manifest details, memory, reduce factor)
+    running = {}  # future -> waiting entry
+    outputs = {}  # resolved output path -> the photo it is made from
+    in_use = 0
+    done = 0
+
+    def progress(line):
+        nonlocal done
+        done += 1
+        report(f"  [{done}/{total or '?'}] {line}")
+
+    def admit(heic_path, output_path):
+        output_key = Path(output_path).resolve()
+        if output_key in outputs:
+            line = f"Skipped {heic_path}: {Path(output_path).name} is made from {outputs[output_key]}"
+            if streaming:
+                progress(line)
+            else:
+                report(f"  {line}")
+            return
+        outputs[output_key] = heic_path
+        index = len(results)
+        results.append(None)
+        details = None
+        if manifest is not None:
+            try:
+                up_to_date, details = manifest.check(heic_path, output_path)
+            except OSError as e:
+                if streaming:
+                    progress(f"Error converting {heic_path}: {e}")
+                else:
+                    report(f"  Error converting {heic_path}: {e}")
+                return
+            if up_to_date:
+                results[index] = Path(output_path)
+                if streaming:
+                    progress(f"Up to date: {Path(output_path).name}")
+                return
+        waiting.append((index, heic_path, output_path, details) + plan_job(heic_path, max_pixels))
+
+    def finished(job, result=None, error=None):
+        index, heic_path, output_path, details, _memory, factor = job
+        if error is None:
+            results[index] = result
+            reduced = f" (reduced 1/{factor})" if factor > 1 else ""
+            progress(f"Converted: {Path(output_path).name}{reduced}")
+            if manifest is not None:
+                manifest.record(heic_path, output_path, details)
+                manifest.save()
+        else:
+            progress(f"Error converting {heic_path}: {error}")
+
+    exhausted = not streaming
+    if not streaming:
+        for heic_path, output_path in source:
+            admit(heic_path, output_path)
+        skipped = sum(result is not None for result in results)
+        if skipped:
+            report(f"  {skipped} file(s) already converted and unchanged.")
+        total = len(waiting)
+
+    def arrived(job):
+        nonlocal exhausted
+        if job is None:
+            exhausted = True
+        else:
+            admit(*job)
+
+    slots = 1 if workers == 1 or (not streaming and total <= 1) else workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=slots) if slots > 1 else None
+    # Reads a streamed source, which may wait for each job to arrive
+    reader = ThreadPoolExecutor(max_workers=1) if pool is not None and streaming else None
+    next_job = None  # reader future for the next streamed job
+    try:
+        while True:
+            for job in list(waiting):
+                if len(running) >= slots:
+                    break
+                if running and in_use + job[4] > memory_budget:
+                    continue  # try a smaller photo
+                waiting.remove(job)
+                if pool is None:
+                    try:
+                        finished(job, convert_file(job[1], job[2], job[5]))
+                    except Exception as e:
+                        finished(job, error=e)
+                    continue
+                running[pool.submit(convert_file, job[1], job[2], job[5])] = job
+                in_use += job[4]
+
+            if not exhausted and next_job is None and len(running) + len(waiting) < slots:
+                if reader is None:
+                    arrived(next(source, None))  # nothing else is running
+                    continue
+                next_job = reader.submit(next, source, None)
+
+            if running or next_job is not None:
+                pending = set(running) if next_job is None else set(running) | {next_job}
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    if future is next_job:
+                        next_job = None
+                        arrived(future.result())
+                        continue
+                    job = running.pop(future)
+                    in_use -= job[4]
+                    try:
+                        finished(job, future.result())
+                    except Exception as e:
+                        finished(job, error=e)
+            elif exhausted and not waiting:
+                break
+    finally:
+        if reader is not None:
+            reader.shutdown(wait=False)
+        if pool is not None:
+            pool.shutdown()
+        if manifest is not None:
+            manifest.save()  # photos that were only touched
+
+    return [result for result in results if result is not None]
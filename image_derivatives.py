@@ -0,0 +1,176 @@
+"""
+3Doodle Critters Image Derivatives
+==================================
+Smaller copies of the pictures in images/ for the website.
+
+The pictures in images/ are full-size masters, often several MB. For each
+one the website build makes resized copies at DERIVATIVE_WIDTHS in WebP
+and JPEG, in images/derived/, so browsers can pick the smallest that
+looks sharp (see website_builder's cards, which use srcset/sizes).
+
+Derived file names include a hash of the master's contents, so a master
+is only resized again when it actually changes. images/derived/index.json
+remembers each master's size, modification time and hash, so an
+unchanged master isn't even re-read.
+
+Pillow is needed to make derivatives; without it (or for a picture it
+can't open) the website simply links the master as before.
+"""
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+import image_store
+from file_utils import atomic_write
+
+DERIVED_DIR = image_store.IMAGES_DIR / "derived"
+INDEX_NAME = "index.json"
+
+# Widths (in pixels) to make; wider than the master is skipped
+DERIVATIVE_WIDTHS = (320, 640, 960)
+
+# (extension, Pillow format, save options)
+FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+_pillow = None  # whether Pillow is installed, once checked
+
+
+def _make(source, digest, derived_dir):
+    """Resize one master into derived_dir; returns its index entry."""
+    from PIL import Image
+
+    stem = Path(source).stem
+    with Image.open(source) as img:
+        img.load()
+        width, height = img.size
+        widths = [w for w in DERIVATIVE_WIDTHS if w < width] or [width]
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        base = img.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {ext: [] for ext, _, _ in FORMATS}
+    for w in widths:
+        h = max(1, round(height * w / width))
+        resized = base.resize((w, h), Image.LANCZOS) if w != width else base
+        for ext, fmt, options in FORMATS:
+            name = f"{stem}-{digest[:12]}-{w}.{ext}"
+            out = resized
+            if fmt == "JPEG" and out.mode == "RGBA":
+                # JPEG has no transparency: flatten onto white
+                out = Image.new("RGB", out.size, "white")
+                out.paste(resized, mask=resized.getchannel("A"))
+            with atomic_write(derived_dir / name) as tmp_path:
+                out.save(tmp_path, fmt, **options)
+            variants[ext].append([w, name])
+    return {"width": width, "height": height, "variants": variants}
+
+
+def pillow_available():
+    """True if Pillow can be imported."""
+    global _pillow
+    if _pillow is None:
+        _pillow = importlib.util.find_spec("PIL") is not None
+    return _pillow
+
+
+class DerivativeCache:
+    """Looks up (and makes when needed) the derivatives of each master.
+
+    Derivatives and their index are kept in derived_dir (DERIVED_DIR by
+    default), which nothing else should write to: prune() deletes
+    whatever in it the last build didn't use.
+    """
+
+    def __init__(self, derived_dir=None):
+        self.derived_dir = Path(derived_dir or DERIVED_DIR)
+        self.index_file = self.derived_dir / INDEX_NAME
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.changed = False
+        self.used = set()  # pictures looked up since this cache was made
+
+    def picture(self, image_name):
+        """Derivative details for a picture in images/, or None.
+
+        Returns (width, height, webp, jpeg) where webp and jpeg are tuples
+        of (width, file name in derived_dir). The result is a plain
+        tuple so it can go into the website's shard digests.
+        """
+        if not image_name:
+            return None
+        self.used.add(image_name)
+        source = os.path.join(image_store.IMAGES_DIR, image_name)  # quicker than a Path
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = self.entries.get(image_name)
+        if entry is None or entry["stamp"] != stamp:
+            entry = self._refresh(image_name, source, stamp, entry)
+            if entry is None:
+                return None
+        variants = entry["variants"]
+        return (entry["width"], entry["height"],
+                tuple(tuple(v) for v in variants["webp"]),
+                tuple(tuple(v) for v in variants["jpg"]))
+
+    def _present(self, entry):
+        return all((self.derived_dir / name).exists()
+                   for variants in entry["variants"].values() for _w, name in variants)
+
+    def _refresh(self, image_name, source, stamp, old):
+        """Hash the master and make its derivatives unless they exist."""
+        if not pillow_available():
+            return None  # the website uses the master
+        try:
+            digest = image_store.file_hash(source)
+            if old is not None and old["hash"] == digest and self._present(old):
+                entry = dict(old, stamp=stamp)  # only touched, not changed
+            else:
+                self.derived_dir.mkdir(parents=True, exist_ok=True)
+                entry = _make(source, digest, self.derived_dir)
+                entry.update(hash=digest, stamp=stamp)
+                if old is not None:
+                    self._remove(old, keep=entry)
+        except Exception:
+            return None  # not a picture Pillow can read
+        self.entries[image_name] = entry
+        self.changed = True
+        return entry
+
+    def _remove(self, old, keep):
+        keep_names = {name for variants in keep["variants"].values() for _w, name in variants}
+        for variants in old["variants"].values():
+            for _w, name in variants:
+                if name not in keep_names:
+                    try:
+                        os.remove(self.derived_dir / name)
+                    except FileNotFoundError:
+                        pass
+
+    def prune(self):
+        """Forget pictures nobody looked up, deleting their derivatives.
+
+        Call after a lookup for every item, e.g. at the end of a build.
+        """
+        for image_name in list(self.entries.keys() - self.used):
+            self._remove(self.entries.pop(image_name), keep={"variants": {}})
+            self.changed = True
+
+    def save(self):
+        """Write the index back if anything changed."""
+        if not self.changed:
+            return
+        self.derived_dir.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.index_file) as tmp_path, \
+                open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        self.changed = False
@@ -0,0 +1,139 @@
+"""
+3Doodle Critters Image Store
+============================
+Bring picture files into the images folder used by the website.
+
+Pictures are stored under a name made from a hash of their contents
+(e.g. 3f9a0c1d2e4b5a69.png), so bringing in the same file twice just
+finds the copy that is already there. HEIC photos are converted to JPG on
+the way in and named after the hash of the original photo.
+
+Older pictures with other names (creature_01.png, ...) can be moved over
+with content_address_images(); see dedupe_images in inventory_manager,
+which also updates the inventory and removes duplicate files.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+from file_utils import atomic_write, file_hash
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+IMAGES_DIR = SCRIPT_DIR / "images"
+
+# Ensure images directory exists
+IMAGES_DIR.mkdir(exist_ok=True)
+
+# Hex digits of the SHA-256 used in file names (64 bits)
+NAME_HASH_LENGTH = 16
+
+# Picture types content_address_images renames (HEIC originals are left
+# alone for the conversion scripts)
+WEB_IMAGE_TYPES = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"}
+
+
+def content_name(digest, ext):
+    """The images-folder file name for content with this hash."""
+    return f"{digest[:NAME_HASH_LENGTH]}{ext.lower()}"
+
+
+def is_content_name(name):
+    """True if a file name looks like one made by content_name."""
+    stem = Path(name).stem
+    return len(stem) == NAME_HASH_LENGTH and all(c in "0123456789abcdef" for c in stem)
+
+
+def _write_in(image_filename, write):
+    """Create a file in the images folder atomically.
+
+    write(path) fills a temporary file with a name of its own, so several
+    imports can run at once. Names are content hashes, so if the file
+    turns up from another import meanwhile, that copy is just as good.
+    """
+    target = IMAGES_DIR / image_filename
+    try:
+        with atomic_write(target) as tmp_path:
+            write(tmp_path)
+    except OSError:
+        if not target.exists():
+            raise
+
+
+def _copy_in(image_path, image_filename):
+    """Copy a file into the images folder under a new name, atomically."""
+    _write_in(image_filename, lambda tmp_path: shutil.copyfile(image_path, tmp_path))
+
+
+def import_image(image_path):
+    """Bring an image into the images folder and return its file name.
+
+    If the same picture is already there, its name is returned and
+    nothing is copied. HEIC photos are converted to JPG on the way in,
+    since browsers cannot show them. Raises OSError (or a PIL error) if
+    the file can't be read.
+    """
+    image_path = Path(image_path)
+    ext = image_path.suffix.lower()
+    digest = file_hash(image_path)
+
+    if ext == '.heic':
+        image_filename = content_name(digest, ".jpg")
+        if (IMAGES_DIR / image_filename).exists():
+            return image_filename
+
+        # Convert HEIC to JPG
+        from PIL import Image
+        import pillow_heif
+        pillow_heif.register_heif_opener()
+
+        def convert(tmp_path):
+            with Image.open(image_path) as img:
+                img.convert('RGB').save(tmp_path, 'JPEG', quality=85)
+
+        _write_in(image_filename, convert)
+        return image_filename
+
+    image_filename = content_name(digest, ext)
+    if not (IMAGES_DIR / image_filename).exists():
+        _copy_in(image_path, image_filename)
+    return image_filename
+
+
+def content_address_images():
+    """Give every picture in the images folder its content-hash name.
+
+    The new file is added next to the old one (as a hard link where
+    possible), so nothing disappears before the inventory points at the
+    new names. Files with identical contents all map to the same new
+    name. Returns {old name: new name}; once the inventory is updated,
+    pass it to remove_images() to delete the old files.
+    """
+    renames = {}
+    for path in sorted(IMAGES_DIR.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in WEB_IMAGE_TYPES:
+            continue
+        if is_content_name(path.name):
+            continue
+        new_name = content_name(file_hash(path), path.suffix)
+        new_path = IMAGES_DIR / new_name
+        if not new_path.exists():
+            try:
+                os.link(path, new_path)
+            except OSError:
+                _copy_in(path, new_name)
+        renames[path.name] = new_name
+    return renames
+
+
+def remove_images(names):
+    """Delete pictures from the images folder (missing ones are skipped)."""
+    removed = 0
+    for name in names:
+        try:
+            os.remove(IMAGES_DIR / name)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
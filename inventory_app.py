@@ -4,21 +4,24 @@
 A kid-friendly app to manage shop inventory.
 """
 
-import json
 import os
 import uuid
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from pathlib import Path
 from PIL import Image, ImageTk
-import shutil
 import subprocess
 
+import image_store
+import inventory_store
+import website_builder
+from inventory_item import Item
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
-INVENTORY_FILE = SCRIPT_DIR / "inventory.json"
-IMAGES_DIR = SCRIPT_DIR / "images"
-WEBSITE_FILE = SCRIPT_DIR / "index.html"
+INVENTORY_FILE = inventory_store.INVENTORY_FILE
+IMAGES_DIR = image_store.IMAGES_DIR
+WEBSITE_FILE = website_builder.WEBSITE_FILE
 
 # Ensure directories exist
 IMAGES_DIR.mkdir(exist_ok=True)
@@ -58,18 +61,57 @@ class InventoryApp:
         self.create_widgets()
         self.refresh_item_list()
 
+        # Pick up changes saved by the command-line manager while we were open
+        self.root.bind('<FocusIn>', self.check_for_outside_changes)
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+
     def load_inventory(self):
-        """Load inventory from JSON file."""
-        if INVENTORY_FILE.exists():
-            with open(INVENTORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"items": [], "google_drive_folder_id": ""}
-
-    def save_inventory(self):
-        """Save inventory to JSON file and regenerate website."""
-        with open(INVENTORY_FILE, 'w') as f:
-            json.dump(self.inventory, f, indent=2)
-        self.generate_website()
+        """Load inventory from storage (inventory.json or inventory.db)."""
+        return inventory_store.load_inventory()
+
+    def check_for_outside_changes(self, event=None):
+        """Reload the inventory if another program saved it.
+
+        Runs when the window gains focus (focus moving between fields
+        doesn't count). The selected item stays selected, and anything
+        typed into the form but not saved yet is kept.
+        """
+        if event is not None and event.widget is not self.root:
+            return
+        if not inventory_store.changed_on_disk(self.inventory):
+            return
+        editing = self.form_has_edits()
+        selected_id = self.selected_item['id'] if self.selected_item else None
+        self.inventory = inventory_store.reload_if_changed(self.inventory)
+        self.refresh_item_list()
+
+        self.selected_item = self.inventory.index.get(selected_id)
+        if self.selected_item is not None:
+            position = self.inventory.index.position(selected_id)
+            self.item_listbox.selection_set(position)
+            self.item_listbox.see(position)
+            if not editing:
+                self.populate_form(self.selected_item)
+        elif not editing:
+            self.clear_form()
+        self.status_var.set("Inventory was changed elsewhere - reloaded!")
+
+    def form_has_edits(self):
+        """True if the form differs from the selected item (or is filled in
+        for a new one)."""
+        item = self.selected_item or {}
+        return (self.title_entry.get() != item.get('title', '')
+                or self.desc_entry.get('1.0', 'end-1c') != item.get('description', '')
+                or self.price_entry.get() != str(item.get('price', ''))
+                or self.sold_var.get() != item.get('sold', False)
+                or self.current_image != item.get('image'))
+
+    def on_close(self):
+        """Fold saved changes into inventory.json so the next start is quick."""
+        try:
+            inventory_store.export_json(self.inventory)
+        finally:
+            self.root.destroy()
 
     def generate_item_id(self):
         """Generate a unique item ID."""
@@ -332,12 +374,14 @@ class InventoryApp:
 
         if filepath:
             filepath = Path(filepath)
-            # If not already in images folder, copy it
+            # If not already in images folder, bring it in (a picture that
+            # is already there under another name is found, not copied)
             if filepath.parent != IMAGES_DIR:
-                new_filename = f"{self.generate_item_id()}{filepath.suffix}"
-                new_path = IMAGES_DIR / new_filename
-                shutil.copy(filepath, new_path)
-                self.current_image = new_filename
+                try:
+                    self.current_image = image_store.import_image(filepath)
+                except Exception as e:
+                    messagebox.showerror("Oops!", f"Couldn't use that picture:\n\n{e}")
+                    return
             else:
                 self.current_image = filepath.name
 
@@ -384,21 +428,23 @@ class InventoryApp:
             self.selected_item['sold'] = self.sold_var.get()
             if self.current_image:
                 self.selected_item['image'] = self.current_image
+            saved_item, op = self.selected_item, "update"
             self.status_var.set(f"Updated: {title}")
         else:
             # Add new
-            new_item = {
-                'id': self.generate_item_id(),
-                'title': title,
-                'description': description,
-                'price': price,
-                'image': self.current_image,
-                'sold': self.sold_var.get()
-            }
-            self.inventory.setdefault("items", []).append(new_item)
+            new_item = Item(
+                id=self.generate_item_id(),
+                title=title,
+                description=description,
+                price=price,
+                image=self.current_image,
+                sold=self.sold_var.get()
+            )
+            saved_item, op = new_item, "add"
             self.status_var.set(f"Added: {title}")
 
-        self.save_inventory()
+        inventory_store.save_item(self.inventory, saved_item, op)
+        self.generate_website()
         self.refresh_item_list()
         self.clear_form()
 
@@ -412,8 +458,8 @@ class InventoryApp:
 
         title = self.selected_item.get('title', 'this item')
         if messagebox.askyesno("Delete?", f"Are you sure you want to delete '{title}'?"):
-            self.inventory["items"].remove(self.selected_item)
-            self.save_inventory()
+            inventory_store.delete_item(self.inventory, self.selected_item['id'])
+            self.generate_website()
             self.refresh_item_list()
             self.clear_form()
             self.status_var.set(f"Deleted: {title}")
@@ -432,6 +478,9 @@ class InventoryApp:
             # Change to the project directory
             os.chdir(SCRIPT_DIR)
 
+            # Make sure inventory.json holds every saved change
+            inventory_store.export_json(self.inventory)
+
             # Stage all changes (including new images)
             result = subprocess.run(
                 ['git', 'add', '.'],
@@ -485,188 +534,7 @@ class InventoryApp:
 
     def generate_website(self):
         """Generate the website HTML from inventory."""
-        items = self.inventory.get("items", [])
-
-        products_html = ""
-        for item in items:
-            sold_class = "sold" if item.get('sold', False) else ""
-            sold_badge = '<span class="sold-badge">SOLD</span>' if item.get('sold', False) else ""
-
-            if item.get('image'):
-                image_html = f'<img src="images/{item["image"]}" alt="{item["title"]}">'
-            else:
-                image_html = '<div class="no-image">No Image</div>'
-
-            products_html += f'''
-                <div class="product-card {sold_class}">
-                    <div class="product-image">
-                        {image_html}
-                        {sold_badge}
-                    </div>
-                    <div class="product-info">
-                        <h3>{item["title"]}</h3>
-                        <p>{item["description"]}</p>
-                        <span class="price">${item["price"]:.2f}</span>
-                    </div>
-                </div>
-'''
-
-        if not products_html:
-            products_html = '''
-                <div class="no-products">
-                    <p>New items coming soon! Check back later.</p>
-                </div>
-'''
-
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>3Doodle Critters | Handmade 3D Pen Art</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Fredoka+One&family=Nunito:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        :root {{
-            --purple: #9B59B6;
-            --purple-dark: #7D3C98;
-            --teal: #1ABC9C;
-            --teal-dark: #16A085;
-            --pink: #FF6B9D;
-            --pink-light: #FFB8D0;
-            --yellow: #FFDC50;
-            --cream: #FFF9F0;
-            --text-dark: #2C3E50;
-        }}
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: 'Nunito', sans-serif; background: var(--cream); color: var(--text-dark); line-height: 1.6; }}
-        .bg-decoration {{ position: fixed; top: 0; left: 0; width: 100%; height: 100%; pointer-events: none; z-index: -1; overflow: hidden; }}
-        .bg-decoration::before, .bg-decoration::after {{ content: ''; position: absolute; border-radius: 50%; opacity: 0.1; }}
-        .bg-decoration::before {{ width: 400px; height: 400px; background: var(--purple); top: -100px; right: -100px; }}
-        .bg-decoration::after {{ width: 300px; height: 300px; background: var(--teal); bottom: -50px; left: -50px; }}
-        header {{ background: linear-gradient(135deg, var(--yellow) 0%, #3498DB 50%, var(--purple) 100%); padding: 2rem 1rem; text-align: center; }}
-        h1 {{ font-family: 'Fredoka One', cursive; font-size: 3rem; color: white; text-shadow: 3px 3px 0 rgba(0,0,0,0.2); margin-bottom: 0.5rem; }}
-        .tagline {{ font-size: 1.3rem; color: white; opacity: 0.95; font-weight: 600; }}
-        nav {{ background: white; padding: 1rem; box-shadow: 0 2px 10px rgba(0,0,0,0.1); position: sticky; top: 0; z-index: 100; }}
-        nav ul {{ list-style: none; display: flex; justify-content: center; flex-wrap: wrap; gap: 1rem; }}
-        nav a {{ text-decoration: none; color: var(--purple-dark); font-weight: 700; padding: 0.5rem 1.5rem; border-radius: 25px; transition: all 0.3s ease; }}
-        nav a:hover {{ background: var(--purple); color: white; }}
-        main {{ max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }}
-        section {{ margin-bottom: 4rem; }}
-        h2 {{ font-family: 'Fredoka One', cursive; font-size: 2.2rem; color: var(--purple); text-align: center; margin-bottom: 2rem; }}
-        h2::after {{ content: ''; display: block; width: 80px; height: 4px; background: linear-gradient(90deg, var(--teal), var(--pink)); margin: 0.5rem auto 0; border-radius: 2px; }}
-        .welcome {{ background: white; border-radius: 20px; padding: 2.5rem; text-align: center; box-shadow: 0 5px 20px rgba(155, 89, 182, 0.15); border: 3px solid var(--pink-light); }}
-        .welcome p {{ font-size: 1.2rem; max-width: 700px; margin: 0 auto; }}
-        .welcome .highlight {{ color: var(--purple); font-weight: 700; }}
-        .products-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 2rem; }}
-        .product-card {{ background: white; border-radius: 20px; overflow: hidden; box-shadow: 0 5px 20px rgba(0,0,0,0.1); transition: transform 0.3s ease, box-shadow 0.3s ease; }}
-        .product-card:hover {{ transform: translateY(-5px); box-shadow: 0 10px 30px rgba(155, 89, 182, 0.2); }}
-        .product-card.sold {{ opacity: 0.7; }}
-        .product-image {{ width: 100%; height: 250px; background: linear-gradient(135deg, var(--pink-light) 0%, #E8DAEF 100%); display: flex; align-items: center; justify-content: center; position: relative; overflow: hidden; }}
-        .product-image img {{ width: 100%; height: 100%; object-fit: cover; }}
-        .product-image .no-image {{ color: var(--purple); font-weight: 600; }}
-        .sold-badge {{ position: absolute; top: 15px; right: -35px; background: var(--pink); color: white; padding: 5px 40px; font-weight: 700; transform: rotate(45deg); font-size: 0.9rem; }}
-        .product-info {{ padding: 1.5rem; }}
-        .product-info h3 {{ font-family: 'Fredoka One', cursive; color: var(--teal-dark); font-size: 1.3rem; margin-bottom: 0.5rem; }}
-        .product-info p {{ color: #666; margin-bottom: 1rem; min-height: 3rem; }}
-        .price {{ font-family: 'Fredoka One', cursive; font-size: 1.5rem; color: var(--pink); }}
-        .no-products {{ text-align: center; padding: 3rem; color: var(--purple); font-size: 1.2rem; }}
-        .order-steps {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 2rem; }}
-        .step {{ background: white; border-radius: 20px; padding: 2rem; text-align: center; box-shadow: 0 5px 20px rgba(0,0,0,0.08); border-top: 5px solid var(--teal); }}
-        .step-number {{ width: 50px; height: 50px; background: linear-gradient(135deg, var(--purple), var(--pink)); color: white; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-family: 'Fredoka One', cursive; font-size: 1.5rem; margin: 0 auto 1rem; }}
-        .step h3 {{ color: var(--purple-dark); margin-bottom: 0.5rem; }}
-        .payment-options {{ display: flex; flex-wrap: wrap; justify-content: center; gap: 1.5rem; margin-top: 1.5rem; }}
-        .payment-option {{ background: white; padding: 1.5rem 2rem; border-radius: 15px; box-shadow: 0 3px 15px rgba(0,0,0,0.08); text-align: center; min-width: 150px; }}
-        .payment-option .icon {{ font-size: 2.5rem; margin-bottom: 0.5rem; }}
-        .payment-option h4 {{ color: var(--teal-dark); font-weight: 700; }}
-        .delivery-options {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 2rem; margin-top: 1.5rem; }}
-        .delivery-card {{ background: white; border-radius: 20px; padding: 2rem; text-align: center; box-shadow: 0 5px 20px rgba(0,0,0,0.08); border-left: 5px solid var(--pink); }}
-        .delivery-card .icon {{ font-size: 3rem; margin-bottom: 1rem; }}
-        .delivery-card h3 {{ color: var(--purple-dark); margin-bottom: 0.5rem; }}
-        .contact-box {{ background: linear-gradient(135deg, var(--yellow) 0%, #3498DB 50%, var(--purple) 100%); border-radius: 20px; padding: 3rem; text-align: center; color: white; }}
-        .contact-box h2 {{ color: white; }}
-        .contact-box h2::after {{ background: white; }}
-        .contact-box p {{ font-size: 1.2rem; margin-bottom: 1.5rem; }}
-        .contact-email {{ display: inline-block; background: white; color: var(--purple-dark); font-family: 'Fredoka One', cursive; font-size: 1.3rem; padding: 1rem 2rem; border-radius: 30px; text-decoration: none; transition: transform 0.3s ease; }}
-        .contact-email:hover {{ transform: scale(1.05); }}
-        footer {{ background: var(--text-dark); color: white; text-align: center; padding: 2rem; margin-top: 2rem; }}
-        footer p {{ opacity: 0.8; }}
-        .footer-hearts {{ font-size: 1.5rem; margin-bottom: 0.5rem; }}
-        @media (max-width: 768px) {{ h1 {{ font-size: 2rem; }} .tagline {{ font-size: 1rem; }} h2 {{ font-size: 1.8rem; }} nav ul {{ gap: 0.5rem; }} nav a {{ padding: 0.4rem 1rem; font-size: 0.9rem; }} }}
-    </style>
-</head>
-<body>
-    <div class="bg-decoration"></div>
-    <header>
-        <div class="logo">
-            <h1>3Doodle Critters</h1>
-            <p class="tagline">Handmade 3D Pen Art</p>
-        </div>
-    </header>
-    <nav>
-        <ul>
-            <li><a href="#welcome">Home</a></li>
-            <li><a href="#products">Shop</a></li>
-            <li><a href="#how-to-order">How to Order</a></li>
-            <li><a href="#payment">Payment</a></li>
-            <li><a href="#contact">Contact</a></li>
-        </ul>
-    </nav>
-    <main>
-        <section id="welcome" class="welcome">
-            <h2>Welcome!</h2>
-            <p>Hi! I'm <span class="highlight">Mira</span>, and I make cute animals and fun creations using a <span class="highlight">3D printing pen</span>! Each piece is carefully crafted by hand, making every 3Doodle unique and special. Check out my critters below and take one home today!</p>
-        </section>
-        <section id="products">
-            <h2>My Creations</h2>
-            <div class="products-grid">
-{products_html}
-            </div>
-        </section>
-        <section id="how-to-order">
-            <h2>How to Order</h2>
-            <div class="order-steps">
-                <div class="step"><div class="step-number">1</div><h3>Pick Your Critters</h3><p>Browse the shop and decide which 3Doodles you'd like!</p></div>
-                <div class="step"><div class="step-number">2</div><h3>Send a Message</h3><p>Email us with what you want to order and how you'd like to receive it.</p></div>
-                <div class="step"><div class="step-number">3</div><h3>Get Your Critters!</h3><p>Pick up locally or have them shipped to you!</p></div>
-            </div>
-        </section>
-        <section id="delivery">
-            <h2>Delivery Options</h2>
-            <div class="delivery-options">
-                <div class="delivery-card"><div class="icon">🏠</div><h3>Local Pickup</h3><p>Pick up your 3Doodles in person! Free for neighbors and local orders.</p></div>
-                <div class="delivery-card"><div class="icon">📦</div><h3>Shipping</h3><p>We can ship your critters anywhere! Shipping cost depends on location.</p></div>
-            </div>
-        </section>
-        <section id="payment">
-            <h2>Payment Options</h2>
-            <p style="text-align: center; margin-bottom: 1rem;">We accept several easy ways to pay:</p>
-            <div class="payment-options">
-                <div class="payment-option"><div class="icon">💵</div><h4>Cash</h4><p>For local pickup</p></div>
-                <div class="payment-option"><div class="icon">🅿️</div><h4>PayPal</h4><p>Safe & easy online</p></div>
-                <div class="payment-option"><div class="icon">💳</div><h4>Venmo</h4><p>Quick mobile payment</p></div>
-                <div class="payment-option"><div class="icon">💳</div><h4>Card</h4><p>Via Stripe</p></div>
-            </div>
-        </section>
-        <section id="contact">
-            <div class="contact-box">
-                <h2>Ready to Order?</h2>
-                <p>Send us an email and we'll get back to you super fast!</p>
-                <a href="mailto:Mira@3DoodleCritters.com" class="contact-email">Mira@3DoodleCritters.com</a>
-                <p style="margin-top: 1.5rem; font-size: 1rem; opacity: 0.9;">Please include: which items you want, your name, and if you want pickup or shipping!</p>
-            </div>
-        </section>
-    </main>
-    <footer>
-        <div class="footer-hearts">💛 💙 💜</div>
-        <p>Made with love by Mira | 3Doodle Critters &copy; 2026</p>
-    </footer>
-</body>
-</html>'''
-
-        with open(WEBSITE_FILE, 'w', encoding='utf-8') as f:
-            f.write(html)
+        website_builder.build_website(self.inventory.get("items", []))
 
 
 def main():
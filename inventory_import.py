@@ -0,0 +1,145 @@
+"""
+3Doodle Critters Bulk Import
+============================
+Add lots of items at once from a CSV or JSONL file.
+
+Every row needs a title and a price; description, image and sold are
+optional. In a CSV file those are the column headers. A JSONL file has one
+JSON object per line with the same keys. image is the path to a picture:
+relative paths are looked for next to the import file first, then in the
+images folder.
+
+Rows are read and checked one at a time and pictures are copied in on
+several threads. Nothing is saved here; the caller adds the returned items
+and saves them all in one go (see inventory_manager.bulk_import).
+"""
+
+import csv
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import image_store
+from inventory_item import Item
+
+# How many pictures to copy / convert at the same time
+IMAGE_WORKERS = 4
+
+TRUE_WORDS = {"1", "true", "yes", "y", "x", "sold"}
+FALSE_WORDS = {"", "0", "false", "no", "n", "available"}
+
+
+def iter_rows(path):
+    """Yield (line number, row dict) from a .csv or .jsonl file."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, {(k or "").strip().lower(): v for k, v in row.items()}
+    elif path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_no, e
+                    continue
+                yield line_no, row
+    else:
+        raise ValueError(f"Don't know how to import {path.name} (use .csv or .jsonl)")
+
+
+def validate_row(row):
+    """Check a row and return (title, description, price, image, sold).
+
+    Raises ValueError with a short, friendly reason if the row is bad.
+    """
+    if not isinstance(row, dict):
+        raise ValueError(f"not a valid row ({row})")
+
+    title = str(row.get("title") or "").strip()
+    if not title:
+        raise ValueError("title is missing")
+
+    description = str(row.get("description") or "").strip()
+
+    raw_price = row.get("price")
+    if isinstance(raw_price, (int, float)) and not isinstance(raw_price, bool):
+        price = float(raw_price)
+    else:
+        try:
+            price = float(str(raw_price or "").strip().lstrip("$"))
+        except ValueError:
+            raise ValueError(f"price {raw_price!r} is not a number")
+    if price < 0:
+        raise ValueError("price must be positive")
+
+    image = str(row.get("image") or "").strip().strip('"') or None
+
+    sold = row.get("sold", False)
+    if not isinstance(sold, bool):
+        word = str(sold or "").strip().lower()
+        if word in TRUE_WORDS:
+            sold = True
+        elif word in FALSE_WORDS:
+            sold = False
+        else:
+            raise ValueError(f"sold should be yes or no, not {sold!r}")
+
+    return title, description, price, image, sold
+
+
+def _find_image(image, base_dir):
+    """Return (path to import, None) or (None, name already in images)."""
+    candidate = Path(image)
+    if not candidate.is_absolute():
+        candidate = base_dir / candidate
+    if candidate.exists():
+        if candidate.parent.resolve() == image_store.IMAGES_DIR.resolve():
+            return None, candidate.name
+        return candidate, None
+    if (image_store.IMAGES_DIR / image).exists():
+        return None, Path(image).name
+    raise ValueError(f"image {image!r} not found")
+
+
+def read_items(path, workers=IMAGE_WORKERS):
+    """Read, check and prepare the items in an import file.
+
+    Returns (items, problems): the new Items, ready to add to the inventory,
+    and a list of "line N: reason" messages for rows that were skipped or
+    whose picture couldn't be brought in.
+    """
+    path = Path(path)
+    base_dir = path.parent
+    items = []
+    problems = []
+    pending = []  # (item, line number, future) for pictures being copied
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for line_no, row in iter_rows(path):
+            try:
+                if isinstance(row, Exception):
+                    raise ValueError(f"not valid JSON ({row})")
+                title, description, price, image, sold = validate_row(row)
+                image_path, image_name = _find_image(image, base_dir) if image else (None, None)
+            except ValueError as e:
+                problems.append(f"line {line_no}: {e}")
+                continue
+
+            item = Item(str(uuid.uuid4())[:8], title, description, price, image_name, sold)
+            items.append(item)
+            if image_path is not None:
+                pending.append((item, line_no, pool.submit(image_store.import_image, image_path)))
+
+        for item, line_no, future in pending:
+            try:
+                item.image = future.result()
+            except Exception as e:
+                problems.append(f"line {line_no}: picture not imported ({e})")
+
+    return items, problems
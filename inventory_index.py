@@ -0,0 +1,200 @@
+"""
+3Doodle Critters Inventory Index
+================================
+Lookup tables over inventory["items"] so finding, removing and filtering
+items does not have to scan the whole list.
+
+The index keeps:
+  - item id -> item
+  - the ids of sold and of available items
+  - a sorted price list for price-range queries
+  - item id -> position in inventory["items"]
+  - a word search index (inventory_search.SearchIndex), built on first search
+
+It is updated a step at a time as items are added, edited and removed;
+inventory_store does that whenever an item is saved.
+"""
+
+import math
+from bisect import bisect_left, insort
+
+from inventory_search import SearchIndex
+
+# Renumber all positions after this many removals
+RENUMBER_AFTER = 1024
+
+
+class InventoryIndex:
+    """Indexes over a list of item dicts (the list itself is shared)."""
+
+    def __init__(self, items):
+        self.items = items
+        self.by_id = {}
+        self.sold_ids = set()
+        self.available_ids = set()
+        self._prices = []     # sorted (price, id) pairs
+        self._indexed = {}    # id -> (price, sold) as currently indexed
+        self._positions = {}  # id -> position in self.items (may be a bit high)
+        self._removed = 0     # removals since positions were last renumbered
+        self.text = None      # SearchIndex, once something has searched
+
+        for item in items:
+            self._index(item)
+        self._prices.sort()
+        self._renumber()
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, item_id):
+        return item_id in self.by_id
+
+    # -- keeping the index up to date ---------------------------------------
+
+    def _index(self, item, sort=False):
+        """Add an item to the id, status and price tables."""
+        item_id = item["id"]
+        price = float(item.get("price", 0))
+        sold = bool(item.get("sold", False))
+        self.by_id[item_id] = item
+        (self.sold_ids if sold else self.available_ids).add(item_id)
+        if sort:
+            insort(self._prices, (price, item_id))
+        else:
+            self._prices.append((price, item_id))
+        self._indexed[item_id] = (price, sold)
+
+    def _unindex(self, item_id):
+        """Take an item out of the id, status and price tables."""
+        price, sold = self._indexed.pop(item_id)
+        del self.by_id[item_id]
+        (self.sold_ids if sold else self.available_ids).discard(item_id)
+        i = bisect_left(self._prices, (price, item_id))
+        del self._prices[i]
+
+    def _renumber(self):
+        """Record the exact position of every item."""
+        self._positions = {item["id"]: i for i, item in enumerate(self.items)}
+        self._removed = 0
+
+    def add(self, item):
+        """Add a new item to the index, appending it to the list unless it
+        was already appended there."""
+        item_id = item["id"]
+        if item_id in self._indexed:
+            self.update(item)
+            return
+        # Items appended to the list but not indexed yet are at its end
+        end = len(self.items)
+        for i in range(end - 1, end - 1 - (end - len(self.by_id)), -1):
+            if self.items[i] is item:
+                self._positions[item_id] = i
+                break
+        else:
+            self._positions[item_id] = end
+            self.items.append(item)
+        self._index(item, sort=True)
+        if self.text is not None:
+            self.text.add(item)
+
+    def update(self, item):
+        """Re-index an item after it was edited."""
+        item_id = item["id"]
+        if item_id not in self._indexed:
+            self.add(item)
+            return
+        if self.text is not None:
+            self.text.update(item)
+        if (float(item.get("price", 0)), bool(item.get("sold", False))) == self._indexed[item_id]:
+            return
+        self._unindex(item_id)
+        self._index(item, sort=True)
+
+    def remove(self, item_id):
+        """Remove an item from the list (if it is still there) and the
+        index, and return it; None if it was not indexed."""
+        item = self.by_id.get(item_id)
+        if item is None:
+            return None
+        try:
+            del self.items[self.position(item_id)]
+        except KeyError:
+            pass  # already taken out of the list
+        self._positions.pop(item_id, None)
+        self._unindex(item_id)
+        if self.text is not None:
+            self.text.remove(item_id)
+        self._removed += 1
+        if self._removed >= RENUMBER_AFTER:
+            self._renumber()
+        return item
+
+    # -- lookups -------------------------------------------------------------
+
+    def get(self, item_id, default=None):
+        """Return the item with this id."""
+        return self.by_id.get(item_id, default)
+
+    def position(self, item_id):
+        """Return where the item sits in inventory["items"].
+
+        Removing an item shifts everything after it down by one. Rather than
+        renumbering on every removal, the recorded position is treated as an
+        upper bound: the item is at most one place lower per removal since
+        the last renumbering, so only that short stretch is searched.
+        """
+        item = self.by_id[item_id]
+        guess = min(self._positions[item_id], len(self.items) - 1)
+        for i in range(guess, max(0, guess - self._removed) - 1, -1):
+            if self.items[i] is item:
+                self._positions[item_id] = i
+                return i
+        # The list was changed behind our back; start again from scratch
+        self._renumber()
+        return self._positions[item_id]
+
+    def sold(self):
+        """Sold items, in inventory order."""
+        return self._in_order(self.sold_ids)
+
+    def available(self):
+        """Items not sold yet, in inventory order."""
+        return self._in_order(self.available_ids)
+
+    def _in_order(self, ids):
+        if len(ids) * 8 > len(self.items):
+            # A large share of the list: one pass beats sorting by position
+            return [item for item in self.items if item["id"] in ids]
+        return [self.by_id[item_id] for item_id in sorted(ids, key=self.position)]
+
+    def price_range(self, low=None, high=None):
+        """Items with low <= price <= high, cheapest first."""
+        start = 0 if low is None else bisect_left(self._prices, (float(low),))
+        end = len(self._prices) if high is None else bisect_left(self._prices, (math.nextafter(float(high), math.inf),))
+        return [self.by_id[item_id] for _, item_id in self._prices[start:end]]
+
+    def search(self, query):
+        """Items with every word of query in their title or description.
+
+        Words match as prefixes ("butt" finds "butterfly"). Results are in
+        inventory order.
+        """
+        if self.text is None:
+            self.text = SearchIndex.build(self.items)
+        return self._in_order(self.text.query(query))
+
+    def filter(self, sold=None, low=None, high=None):
+        """Items matching a sold flag and/or price range.
+
+        With a price range the results are cheapest first, otherwise they
+        are in inventory order.
+        """
+        if low is None and high is None:
+            if sold is None:
+                return list(self.items)
+            return self.sold() if sold else self.available()
+        items = self.price_range(low, high)
+        if sold is not None:
+            ids = self.sold_ids if sold else self.available_ids
+            items = [item for item in items if item["id"] in ids]
+        return items
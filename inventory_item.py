@@ -0,0 +1,149 @@
+"""
+3Doodle Critters Inventory Item
+===============================
+A compact stand-in for the item dicts in inventory.json.
+
+Item uses __slots__, so it has no per-item key table like a dict does, and
+prices that repeat across the catalog share one float object. It still
+answers item['title'], item.get('image') and so on, so code written for the
+old dicts keeps working, and to_dict() gives back exactly the JSON schema.
+"""
+
+# Fields every item has, in inventory.json order
+FIELDS = ("id", "title", "description", "price", "image", "sold")
+
+_DEFAULTS = {"title": "", "description": "", "price": 0.0, "image": None, "sold": False}
+
+# Shared float objects for prices seen so far (most catalogs reuse a handful)
+_prices = {}
+_MAX_SHARED_PRICES = 4096
+
+
+def _shared_price(price):
+    shared = _prices.get(price)
+    if shared is not None and type(shared) is type(price):
+        return shared
+    if len(_prices) < _MAX_SHARED_PRICES:
+        _prices[price] = price
+    return price
+
+
+class Item:
+    """One inventory item."""
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, id, title="", description="", price=0.0, image=None, sold=False, extra=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.price = _shared_price(price)
+        self.image = image
+        self.sold = sold
+        self.extra = extra or None  # any keys not in FIELDS, or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an Item from an inventory.json item dict."""
+        if isinstance(data, cls):
+            return data
+        extra = {k: v for k, v in data.items() if k not in _FIELD_SET}
+        return cls(
+            data["id"],
+            data.get("title", ""),
+            data.get("description", ""),
+            data.get("price", 0.0),
+            data.get("image"),
+            data.get("sold", False),
+            extra,
+        )
+
+    def to_dict(self):
+        """Return the item as an inventory.json item dict."""
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "price": self.price,
+            "image": self.image,
+            "sold": self.sold,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # -- dict-style access, so code written for item dicts keeps working -----
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if key == "price":
+                value = _shared_price(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            setattr(self, key, _DEFAULTS.get(key))
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in _FIELD_SET or bool(self.extra and key in self.extra)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(FIELDS) + (list(self.extra) if self.extra else [])
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __eq__(self, other):
+        if isinstance(other, (Item, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Item({self.to_dict()!r})"
+
+
+_FIELD_SET = frozenset(FIELDS)
+
+
+def to_json(obj):
+    """json.dump(default=...) hook that writes Items as plain dicts."""
+    if isinstance(obj, Item):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def items_from_dicts(dicts):
+    """Convert a list of item dicts into Items."""
+    return [Item.from_dict(data) for data in dicts]
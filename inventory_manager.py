@@ -2,62 +2,274 @@
 3Doodle Critters Inventory Manager
 ==================================
 A utility to manage shop inventory - add items with pictures, prices, and descriptions.
+
+Run without arguments for the menu. For big inventories there are also
+one-off commands that stream items from disk instead of loading them all:
+
+    python inventory_manager.py list
+    python inventory_manager.py list available 5-20
+    python inventory_manager.py website
+    python inventory_manager.py export
+    python inventory_manager.py import new_critters.csv
+    python inventory_manager.py search blue dragon
+    python inventory_manager.py dedupe-images
 """
 
-import json
 import os
 import sys
 import uuid
+from contextlib import contextmanager
 from pathlib import Path
 
+import image_store
+import inventory_import
+import inventory_store
+import inventory_stream
+import website_builder
+from inventory_item import Item
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
-INVENTORY_FILE = SCRIPT_DIR / "inventory.json"
-IMAGES_DIR = SCRIPT_DIR / "images"
-WEBSITE_FILE = SCRIPT_DIR / "index.html"
+INVENTORY_FILE = inventory_store.INVENTORY_FILE
+IMAGES_DIR = image_store.IMAGES_DIR
+WEBSITE_FILE = website_builder.WEBSITE_FILE
 
-# Ensure images directory exists
-IMAGES_DIR.mkdir(exist_ok=True)
+# Items shown per page when listing
+PAGE_SIZE = 20
 
 def load_inventory():
-    """Load inventory from JSON file."""
-    if INVENTORY_FILE.exists():
-        with open(INVENTORY_FILE, 'r') as f:
-            return json.load(f)
-    return {"items": [], "google_drive_folder_id": ""}
+    """Load inventory from storage (inventory.json or inventory.db)."""
+    return inventory_store.load_inventory()
 
 def save_inventory(inventory, update_website=True):
-    """Save inventory to JSON file and optionally regenerate website."""
-    with open(INVENTORY_FILE, 'w') as f:
-        json.dump(inventory, f, indent=2)
+    """Save the whole inventory and optionally regenerate website."""
+    inventory_store.save_inventory(inventory)
 
     if update_website:
         # Auto-regenerate website
         generate_website_silent(inventory)
 
+def save_item(inventory, item, op="update", update_website=True):
+    """Save one added or edited item and optionally regenerate website.
+
+    op is "add", "update" or "toggle". An added item is appended to
+    inventory["items"] if it isn't there yet, and the item indexes (price,
+    sold and search) are updated straight away. Inside inventory_session()
+    the item is only marked as changed; the session saves everything when
+    it ends.
+    """
+    inventory_store.mark_dirty(inventory, item, op)
+    if _in_session(inventory):
+        return
+    inventory_store.flush_changes(inventory)
+
+    if update_website:
+        generate_website_silent(inventory)
+
+def delete_item(inventory, item, update_website=True):
+    """Remove one item from inventory["items"] and its indexes, save the
+    removal and optionally regenerate website."""
+    inventory_store.mark_dirty(inventory, item, "remove")
+    if _in_session(inventory):
+        return
+    inventory_store.flush_changes(inventory)
+
+    if update_website:
+        generate_website_silent(inventory)
+
+def _in_session(inventory):
+    return getattr(inventory, "session_depth", 0) > 0
+
+@contextmanager
+def inventory_session(inventory=None, update_website=True):
+    """Make many changes, then save them all at once.
+
+    Inside the block, save_item() and delete_item() only note what changed.
+    When the block ends, every change is written in a single atomic write
+    and the website is rebuilt at most once. If the block raises, nothing
+    is written and the inventory goes back to how it is on disk.
+
+        with inventory_session() as inv:
+            for item in inv["items"]:
+                item["price"] = round(item["price"] * 1.1, 2)
+                save_item(inv, item)
+
+    Pass the inventory from load_inventory() to use one you already have.
+    Sessions can be nested; only the outermost one saves.
+    """
+    if inventory is None:
+        inventory = load_inventory()
+    else:
+        # Start from a clean slate so a rollback only undoes this session
+        inventory_store.flush_changes(inventory)
+
+    inventory.session_depth += 1
+    try:
+        yield inventory
+    except BaseException:
+        inventory.session_depth -= 1
+        if inventory.session_depth == 0:
+            inventory_store.revert(inventory)
+        raise
+    inventory.session_depth -= 1
+    if inventory.session_depth > 0:
+        return
+
+    changed = inventory_store.flush_changes(inventory)
+    if changed and update_website:
+        generate_website_silent(inventory)
+
 def generate_item_id():
     """Generate a unique item ID."""
     return str(uuid.uuid4())[:8]
 
-def list_items(inventory):
-    """Display all items in inventory."""
-    items = inventory.get("items", [])
-    if not items:
-        print("\n  No items in inventory yet.\n")
+def parse_filter(words):
+    """Turn filter words into (sold, low, high) for filter_items.
+
+    Understands "sold", "available" and a price range like "5-20", "5-"
+    or "-20". Raises ValueError for anything else.
+    """
+    sold = low = high = None
+    for word in words:
+        word = word.strip().lower()
+        if word == "sold":
+            sold = True
+        elif word in ("available", "avail", "unsold"):
+            sold = False
+        elif "-" in word:
+            start, _, stop = word.replace("$", "").partition("-")
+            low = float(start) if start else None
+            high = float(stop) if stop else None
+        elif word:
+            raise ValueError(f"don't understand {word!r}")
+    return sold, low, high
+
+def filter_items(items, sold=None, low=None, high=None):
+    """Yield the items matching a sold flag and/or price range."""
+    for item in items:
+        if sold is not None and bool(item.get("sold", False)) != sold:
+            continue
+        price = float(item.get("price", 0))
+        if (low is not None and price < low) or (high is not None and price > high):
+            continue
+        yield item
+
+def list_items(inventory, filter_words=None):
+    """Display items in inventory, a page at a time, optionally filtered."""
+    if filter_words is None:
+        filter_words = input("\n  Filter (Enter for all, or e.g. 'available 5-20'): ").split()
+    try:
+        sold, low, high = parse_filter(filter_words)
+    except ValueError as e:
+        print(f"  Invalid filter: {e}.")
         return
-
-    print("\n" + "=" * 60)
-    print("  CURRENT INVENTORY")
-    print("=" * 60)
-    for i, item in enumerate(items, 1):
-        status = "SOLD" if item.get("sold", False) else "Available"
-        print(f"\n  [{i}] {item['title']}")
-        print(f"      ID: {item['id']}")
-        print(f"      Price: ${item['price']:.2f}")
-        print(f"      Status: {status}")
-        print(f"      Description: {item['description'][:50]}..." if len(item.get('description', '')) > 50 else f"      Description: {item.get('description', 'N/A')}")
-        print(f"      Image: {item.get('image', 'No image')}")
-    print("\n" + "=" * 60 + "\n")
+    if sold is None and low is None and high is None:
+        print_items(inventory.get("items", []))
+        return
+    index = inventory_store.index_of(inventory)
+    print_numbered(_numbered(index, index.filter(sold, low, high)),
+                   heading="MATCHING ITEMS", empty="No items match that filter.")
+
+def _numbered(index, items):
+    """Pair items with their number in the full list."""
+    return ((index.position(item["id"]) + 1, item) for item in items)
+
+def format_item(number, item):
+    """The text shown for one item in a listing."""
+    status = "SOLD" if item.get("sold", False) else "Available"
+    description = item.get('description', 'N/A')
+    if len(item.get('description', '')) > 50:
+        description = item['description'][:50] + "..."
+    return (f"\n  [{number}] {item['title']}\n"
+            f"      ID: {item['id']}\n"
+            f"      Price: ${item['price']:.2f}\n"
+            f"      Status: {status}\n"
+            f"      Description: {description}\n"
+            f"      Image: {item.get('image', 'No image')}\n")
+
+def _pages(texts, page_size):
+    """Group a stream of texts into lists of page_size."""
+    page = []
+    for text in texts:
+        page.append(text)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+def print_items(items, heading="CURRENT INVENTORY", empty="No items in inventory yet."):
+    """Display items from any iterable (a list, or a stream from disk)."""
+    return print_numbered(enumerate(items, 1), heading, empty)
+
+def print_numbered(numbered_items, heading="CURRENT INVENTORY", empty="No items in inventory yet.",
+                   page_size=PAGE_SIZE):
+    """Display (number, item) pairs, a page at a time.
+
+    Items are formatted lazily and each page goes out in one write. When
+    both ends are a terminal the user is asked before each further page;
+    otherwise (piped to a file, say) everything is written straight out.
+    Returns how many items were shown.
+    """
+    out = sys.stdout
+    interactive = sys.stdin.isatty() and out.isatty()
+    pages = _pages((format_item(number, item) for number, item in numbered_items), page_size)
+    page = next(pages, None)
+    if page is None:
+        print(f"\n  {empty}\n")
+        return 0
+
+    rule = "=" * 60
+    out.write(f"\n{rule}\n  {heading}\n{rule}\n")
+    count = 0
+    while page is not None:
+        out.write("".join(page))
+        count += len(page)
+        page = next(pages, None)
+        if page is not None and interactive:
+            out.flush()
+            if input(f"\n  -- {count} shown: Enter for more, q to stop -- ").strip().lower() == "q":
+                break
+    out.write(f"\n{rule}\n\n")
+    out.flush()
+    return count
+
+def choose_item(inventory, action):
+    """Ask which item to act on, by ID or list number, and return it.
+
+    Returns None if the user cancels or picks something that isn't there.
+    """
+    items = inventory.get("items", [])
+    index = inventory_store.index_of(inventory)
+    while True:
+        answer = input(f"\n  Enter item ID or number to {action} (L to list, 0 to cancel): ").strip()
+        if answer in ("", "0"):
+            return None
+        if answer.lower() == "l":
+            list_items(inventory)
+            continue
+        item = index.get(answer)
+        if item is not None:
+            return item
+        if not answer.isdigit():
+            print("  No item with that ID.")
+            return None
+        number = int(answer)
+        if number < 1 or number > len(items):
+            print("  Invalid selection.")
+            return None
+        return items[number - 1]
+
+def search_items(inventory, query=None):
+    """Find items by words in their title or description."""
+    if query is None:
+        query = input("\n  Search for: ").strip()
+        if not query:
+            return
+    results = inventory_store.search(inventory, query)
+    print_numbered(_numbered(inventory_store.index_of(inventory), results),
+                   heading=f"SEARCH: {query} ({len(results)} found)",
+                   empty=f"Nothing matches '{query}'.")
 
 def add_item(inventory):
     """Add a new item to inventory."""
@@ -95,29 +307,16 @@ def add_item(inventory):
     if image_choice == "1":
         image_path = input("  Enter full path to image: ").strip().strip('"')
         if os.path.exists(image_path):
-            # Copy image to images folder
-            ext = Path(image_path).suffix.lower()
-            if ext == '.heic':
-                # Convert HEIC to JPG
-                try:
-                    from PIL import Image
-                    import pillow_heif
-                    pillow_heif.register_heif_opener()
-
-                    img = Image.open(image_path)
-                    image_filename = f"{generate_item_id()}.jpg"
-                    output_path = IMAGES_DIR / image_filename
-                    img.convert('RGB').save(output_path, 'JPEG', quality=85)
+            # Copy image to images folder (HEIC is converted to JPG)
+            try:
+                image_filename = image_store.import_image(image_path)
+                if Path(image_path).suffix.lower() == '.heic':
                     print(f"  Converted and saved as: {image_filename}")
-                except Exception as e:
-                    print(f"  Error converting HEIC: {e}")
-                    image_filename = None
-            else:
-                # Copy as-is
-                import shutil
-                image_filename = f"{generate_item_id()}{ext}"
-                shutil.copy(image_path, IMAGES_DIR / image_filename)
-                print(f"  Copied as: {image_filename}")
+                else:
+                    print(f"  Copied as: {image_filename}")
+            except Exception as e:
+                print(f"  Error importing image: {e}")
+                image_filename = None
         else:
             print("  File not found. Skipping image.")
 
@@ -130,17 +329,16 @@ def add_item(inventory):
                 image_filename = None
 
     # Create item
-    item = {
-        "id": generate_item_id(),
-        "title": title,
-        "description": description,
-        "price": price,
-        "image": image_filename,
-        "sold": False
-    }
-
-    inventory["items"].append(item)
-    save_inventory(inventory)
+    item = Item(
+        id=generate_item_id(),
+        title=title,
+        description=description,
+        price=price,
+        image=image_filename,
+        sold=False
+    )
+
+    save_item(inventory, item, op="add")
 
     print(f"\n  Item '{title}' added successfully!")
     print(f"  Item ID: {item['id']}\n")
@@ -152,20 +350,9 @@ def edit_item(inventory):
         print("\n  No items to edit.\n")
         return
 
-    list_items(inventory)
-
-    try:
-        choice = int(input("  Enter item number to edit (0 to cancel): "))
-        if choice == 0:
-            return
-        if choice < 1 or choice > len(items):
-            print("  Invalid selection.")
-            return
-    except ValueError:
-        print("  Invalid input.")
+    item = choose_item(inventory, "edit")
+    if item is None:
         return
-
-    item = items[choice - 1]
     print(f"\n  Editing: {item['title']}")
     print("  (Press Enter to keep current value)\n")
 
@@ -188,7 +375,7 @@ def edit_item(inventory):
     if new_image:
         item['image'] = new_image
 
-    save_inventory(inventory)
+    save_item(inventory, item)
     print(f"\n  Item updated successfully!\n")
 
 def remove_item(inventory):
@@ -198,25 +385,13 @@ def remove_item(inventory):
         print("\n  No items to remove.\n")
         return
 
-    list_items(inventory)
-
-    try:
-        choice = int(input("  Enter item number to remove (0 to cancel): "))
-        if choice == 0:
-            return
-        if choice < 1 or choice > len(items):
-            print("  Invalid selection.")
-            return
-    except ValueError:
-        print("  Invalid input.")
+    item = choose_item(inventory, "remove")
+    if item is None:
         return
-
-    item = items[choice - 1]
     confirm = input(f"  Are you sure you want to remove '{item['title']}'? (y/n): ").strip().lower()
 
     if confirm == 'y':
-        items.pop(choice - 1)
-        save_inventory(inventory)
+        delete_item(inventory, item)
         print(f"\n  Item removed successfully!\n")
     else:
         print("  Cancelled.\n")
@@ -228,638 +403,120 @@ def toggle_sold(inventory):
         print("\n  No items in inventory.\n")
         return
 
-    list_items(inventory)
-
-    try:
-        choice = int(input("  Enter item number to toggle sold status (0 to cancel): "))
-        if choice == 0:
-            return
-        if choice < 1 or choice > len(items):
-            print("  Invalid selection.")
-            return
-    except ValueError:
-        print("  Invalid input.")
+    item = choose_item(inventory, "toggle sold status")
+    if item is None:
         return
-
-    item = items[choice - 1]
     item['sold'] = not item.get('sold', False)
     status = "SOLD" if item['sold'] else "Available"
-    save_inventory(inventory)
+    save_item(inventory, item, op="toggle")
     print(f"\n  '{item['title']}' marked as: {status}\n")
 
+def bulk_import(inventory, path=None):
+    """Add every item from a CSV or JSONL file, with one save at the end."""
+    if path is None:
+        print("\n" + "=" * 60)
+        print("  BULK IMPORT")
+        print("=" * 60)
+        print("\n  Columns: title, price, description, image, sold")
+        path = input("\n  Enter path to .csv or .jsonl file: ").strip().strip('"')
+    if not os.path.exists(path):
+        print("  File not found. Cancelled.\n")
+        return 0
+
+    try:
+        items, problems = inventory_import.read_items(path)
+    except ValueError as e:
+        print(f"  {e}\n")
+        return 0
+
+    for problem in problems:
+        print(f"  Skipped {problem}")
+
+    # One inventory write and one website build for the whole batch
+    with inventory_session(inventory):
+        for item in items:
+            save_item(inventory, item, op="add")
+
+    print(f"\n  Imported {len(items)} items ({len(problems)} problems).\n")
+    return len(items)
+
 def generate_website_silent(inventory):
     """Generate the website HTML silently (no output)."""
     _generate_website_html(inventory)
 
 def generate_website(inventory):
     """Generate the website HTML from inventory (with output)."""
-    _generate_website_html(inventory)
-    items = inventory.get("items", [])
+    count = _generate_website_html(inventory)
+    inventory_store.export_json(inventory)
     print(f"\n  Website updated: {WEBSITE_FILE}")
-    print(f"  Total items: {len(items)}\n")
+    print(f"  Total items: {count}\n")
+
+def dedupe_images(inventory):
+    """Rename pictures to content-hash names and delete duplicate files.
+
+    Item pictures are pointed at the new names in one save, and
+    inventory.json is rewritten, before any old file is removed.
+    """
+    renames = image_store.content_address_images()
+    if not renames:
+        print("\n  All pictures already have content names.\n")
+        return 0
+
+    with inventory_session(inventory):
+        for item in inventory.get("items", []):
+            new_name = renames.get(item.get("image"))
+            if new_name:
+                item["image"] = new_name
+                save_item(inventory, item)
+    inventory_store.export_json(inventory)
+    removed = image_store.remove_images(renames)
+
+    duplicates = len(renames) - len(set(renames.values()))
+    print(f"\n  Renamed {removed} pictures; {duplicates} were duplicates and are now shared.\n")
+    return removed
+
+def storage_menu(inventory):
+    """Show the storage engine and let the user switch or export."""
+    engine = "SQLite (inventory.db)" if inventory_store.use_sqlite() else "JSON (inventory.json)"
+    print("\n" + "=" * 60)
+    print("  STORAGE")
+    print("=" * 60)
+    print(f"\n  Current storage: {engine}")
+    print("""
+    [1] Switch to SQLite storage (faster for big inventories)
+    [2] Switch back to inventory.json
+    [3] Export inventory.json for the website
+    [4] Rename pictures by content (removes duplicate files)
+    [5] Back
+""")
+    choice = input("  Choose option (1-5): ").strip()
+
+    if choice == "1":
+        if inventory_store.use_sqlite():
+            print("\n  Already using SQLite.\n")
+            return
+        count = inventory_store.migrate_to_sqlite()
+        print(f"\n  Moved {count} items into inventory.db.\n")
+    elif choice == "2":
+        if not inventory_store.use_sqlite():
+            print("\n  Already using inventory.json.\n")
+            return
+        count = inventory_store.migrate_to_json()
+        print(f"\n  Moved {count} items back into inventory.json.\n")
+    elif choice == "3":
+        path = inventory_store.export_json(inventory)
+        print(f"\n  Exported: {path}\n")
+    elif choice == "4":
+        dedupe_images(inventory)
 
 def _generate_website_html(inventory):
-    """Internal function to generate the website HTML."""
-    items = inventory.get("items", [])
+    """Internal function to generate the website HTML.
 
-    # Generate product cards HTML
-    products_html = ""
-    for item in items:
-        sold_class = "sold" if item.get('sold', False) else ""
-        sold_badge = '<span class="sold-badge">SOLD</span>' if item.get('sold', False) else ""
-
-        if item.get('image'):
-            image_html = f'<img src="images/{item["image"]}" alt="{item["title"]}">'
-        else:
-            image_html = '<div class="no-image">No Image</div>'
-
-        products_html += f'''
-                <div class="product-card {sold_class}">
-                    <div class="product-image">
-                        {image_html}
-                        {sold_badge}
-                    </div>
-                    <div class="product-info">
-                        <h3>{item["title"]}</h3>
-                        <p>{item["description"]}</p>
-                        <span class="price">${item["price"]:.2f}</span>
-                    </div>
-                </div>
-'''
-
-    if not products_html:
-        products_html = '''
-                <div class="no-products">
-                    <p>New items coming soon! Check back later.</p>
-                </div>
-'''
-
-    # Full HTML template
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>3Doodle Critters | Handmade 3D Pen Art</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Fredoka+One&family=Nunito:wght@400;600;700&display=swap" rel="stylesheet">
-    <style>
-        :root {{
-            --purple: #9B59B6;
-            --purple-dark: #7D3C98;
-            --teal: #1ABC9C;
-            --teal-dark: #16A085;
-            --pink: #FF6B9D;
-            --pink-light: #FFB8D0;
-            --yellow: #FFDC50;
-            --cream: #FFF9F0;
-            --text-dark: #2C3E50;
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Nunito', sans-serif;
-            background: var(--cream);
-            color: var(--text-dark);
-            line-height: 1.6;
-        }}
-
-        .bg-decoration {{
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            pointer-events: none;
-            z-index: -1;
-            overflow: hidden;
-        }}
-
-        .bg-decoration::before,
-        .bg-decoration::after {{
-            content: '';
-            position: absolute;
-            border-radius: 50%;
-            opacity: 0.1;
-        }}
-
-        .bg-decoration::before {{
-            width: 400px;
-            height: 400px;
-            background: var(--purple);
-            top: -100px;
-            right: -100px;
-        }}
-
-        .bg-decoration::after {{
-            width: 300px;
-            height: 300px;
-            background: var(--teal);
-            bottom: -50px;
-            left: -50px;
-        }}
-
-        header {{
-            background: linear-gradient(135deg, var(--pink) 0%, var(--purple) 50%, var(--teal) 100%);
-            padding: 2rem 1rem;
-            text-align: center;
-            position: relative;
-            overflow: hidden;
-        }}
-
-        header::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: url("data:image/svg+xml,%3Csvg width='60' height='60' viewBox='0 0 60 60' xmlns='http://www.w3.org/2000/svg'%3E%3Cg fill='none' fill-rule='evenodd'%3E%3Cg fill='%23ffffff' fill-opacity='0.1'%3E%3Ccircle cx='30' cy='30' r='4'/%3E%3C/g%3E%3C/g%3E%3C/svg%3E");
-        }}
-
-        .logo {{
-            position: relative;
-            z-index: 1;
-        }}
-
-        h1 {{
-            font-family: 'Fredoka One', cursive;
-            font-size: 3rem;
-            color: white;
-            text-shadow: 3px 3px 0 rgba(0,0,0,0.2);
-            margin-bottom: 0.5rem;
-        }}
-
-        .tagline {{
-            font-size: 1.3rem;
-            color: white;
-            opacity: 0.95;
-            font-weight: 600;
-        }}
-
-        nav {{
-            background: white;
-            padding: 1rem;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            position: sticky;
-            top: 0;
-            z-index: 100;
-        }}
-
-        nav ul {{
-            list-style: none;
-            display: flex;
-            justify-content: center;
-            flex-wrap: wrap;
-            gap: 1rem;
-        }}
-
-        nav a {{
-            text-decoration: none;
-            color: var(--purple-dark);
-            font-weight: 700;
-            padding: 0.5rem 1.5rem;
-            border-radius: 25px;
-            transition: all 0.3s ease;
-        }}
-
-        nav a:hover {{
-            background: var(--purple);
-            color: white;
-        }}
-
-        main {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 2rem 1rem;
-        }}
-
-        section {{
-            margin-bottom: 4rem;
-        }}
-
-        h2 {{
-            font-family: 'Fredoka One', cursive;
-            font-size: 2.2rem;
-            color: var(--purple);
-            text-align: center;
-            margin-bottom: 2rem;
-            position: relative;
-        }}
-
-        h2::after {{
-            content: '';
-            display: block;
-            width: 80px;
-            height: 4px;
-            background: linear-gradient(90deg, var(--teal), var(--pink));
-            margin: 0.5rem auto 0;
-            border-radius: 2px;
-        }}
-
-        .welcome {{
-            background: white;
-            border-radius: 20px;
-            padding: 2.5rem;
-            text-align: center;
-            box-shadow: 0 5px 20px rgba(155, 89, 182, 0.15);
-            border: 3px solid var(--pink-light);
-        }}
-
-        .welcome p {{
-            font-size: 1.2rem;
-            max-width: 700px;
-            margin: 0 auto;
-        }}
-
-        .welcome .highlight {{
-            color: var(--purple);
-            font-weight: 700;
-        }}
-
-        .products-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-            gap: 2rem;
-        }}
-
-        .product-card {{
-            background: white;
-            border-radius: 20px;
-            overflow: hidden;
-            box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }}
-
-        .product-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 10px 30px rgba(155, 89, 182, 0.2);
-        }}
-
-        .product-card.sold {{
-            opacity: 0.7;
-        }}
-
-        .product-image {{
-            width: 100%;
-            height: 250px;
-            background: linear-gradient(135deg, var(--pink-light) 0%, #E8DAEF 100%);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .product-image img {{
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-        }}
-
-        .product-image .no-image {{
-            color: var(--purple);
-            font-weight: 600;
-        }}
-
-        .sold-badge {{
-            position: absolute;
-            top: 15px;
-            right: -35px;
-            background: var(--pink);
-            color: white;
-            padding: 5px 40px;
-            font-weight: 700;
-            transform: rotate(45deg);
-            font-size: 0.9rem;
-        }}
-
-        .product-info {{
-            padding: 1.5rem;
-        }}
-
-        .product-info h3 {{
-            font-family: 'Fredoka One', cursive;
-            color: var(--teal-dark);
-            font-size: 1.3rem;
-            margin-bottom: 0.5rem;
-        }}
-
-        .product-info p {{
-            color: #666;
-            margin-bottom: 1rem;
-            min-height: 3rem;
-        }}
-
-        .price {{
-            font-family: 'Fredoka One', cursive;
-            font-size: 1.5rem;
-            color: var(--pink);
-        }}
-
-        .no-products {{
-            text-align: center;
-            padding: 3rem;
-            color: var(--purple);
-            font-size: 1.2rem;
-        }}
-
-        .order-steps {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 2rem;
-        }}
-
-        .step {{
-            background: white;
-            border-radius: 20px;
-            padding: 2rem;
-            text-align: center;
-            box-shadow: 0 5px 20px rgba(0,0,0,0.08);
-            border-top: 5px solid var(--teal);
-        }}
-
-        .step-number {{
-            width: 50px;
-            height: 50px;
-            background: linear-gradient(135deg, var(--purple), var(--pink));
-            color: white;
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-family: 'Fredoka One', cursive;
-            font-size: 1.5rem;
-            margin: 0 auto 1rem;
-        }}
-
-        .step h3 {{
-            color: var(--purple-dark);
-            margin-bottom: 0.5rem;
-        }}
-
-        .payment-options {{
-            display: flex;
-            flex-wrap: wrap;
-            justify-content: center;
-            gap: 1.5rem;
-            margin-top: 1.5rem;
-        }}
-
-        .payment-option {{
-            background: white;
-            padding: 1.5rem 2rem;
-            border-radius: 15px;
-            box-shadow: 0 3px 15px rgba(0,0,0,0.08);
-            text-align: center;
-            min-width: 150px;
-        }}
-
-        .payment-option .icon {{
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
-        }}
-
-        .payment-option h4 {{
-            color: var(--teal-dark);
-            font-weight: 700;
-        }}
-
-        .delivery-options {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 2rem;
-            margin-top: 1.5rem;
-        }}
-
-        .delivery-card {{
-            background: white;
-            border-radius: 20px;
-            padding: 2rem;
-            text-align: center;
-            box-shadow: 0 5px 20px rgba(0,0,0,0.08);
-            border-left: 5px solid var(--pink);
-        }}
-
-        .delivery-card .icon {{
-            font-size: 3rem;
-            margin-bottom: 1rem;
-        }}
-
-        .delivery-card h3 {{
-            color: var(--purple-dark);
-            margin-bottom: 0.5rem;
-        }}
-
-        .contact-box {{
-            background: linear-gradient(135deg, var(--purple) 0%, var(--teal) 100%);
-            border-radius: 20px;
-            padding: 3rem;
-            text-align: center;
-            color: white;
-        }}
-
-        .contact-box h2 {{
-            color: white;
-        }}
-
-        .contact-box h2::after {{
-            background: white;
-        }}
-
-        .contact-box p {{
-            font-size: 1.2rem;
-            margin-bottom: 1.5rem;
-        }}
-
-        .contact-email {{
-            display: inline-block;
-            background: white;
-            color: var(--purple-dark);
-            font-family: 'Fredoka One', cursive;
-            font-size: 1.3rem;
-            padding: 1rem 2rem;
-            border-radius: 30px;
-            text-decoration: none;
-            transition: transform 0.3s ease;
-        }}
-
-        .contact-email:hover {{
-            transform: scale(1.05);
-        }}
-
-        footer {{
-            background: var(--text-dark);
-            color: white;
-            text-align: center;
-            padding: 2rem;
-            margin-top: 2rem;
-        }}
-
-        footer p {{
-            opacity: 0.8;
-        }}
-
-        .footer-hearts {{
-            font-size: 1.5rem;
-            margin-bottom: 0.5rem;
-        }}
-
-        @media (max-width: 768px) {{
-            h1 {{
-                font-size: 2rem;
-            }}
-
-            .tagline {{
-                font-size: 1rem;
-            }}
-
-            h2 {{
-                font-size: 1.8rem;
-            }}
-
-            nav ul {{
-                gap: 0.5rem;
-            }}
-
-            nav a {{
-                padding: 0.4rem 1rem;
-                font-size: 0.9rem;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="bg-decoration"></div>
-
-    <header>
-        <div class="logo">
-            <h1>3Doodle Critters</h1>
-            <p class="tagline">Handmade 3D Pen Art</p>
-        </div>
-    </header>
-
-    <nav>
-        <ul>
-            <li><a href="#welcome">Home</a></li>
-            <li><a href="#products">Shop</a></li>
-            <li><a href="#how-to-order">How to Order</a></li>
-            <li><a href="#payment">Payment</a></li>
-            <li><a href="#contact">Contact</a></li>
-        </ul>
-    </nav>
-
-    <main>
-        <section id="welcome" class="welcome">
-            <h2>Welcome!</h2>
-            <p>
-                Hi! I'm <span class="highlight">Mira</span>, and I make cute animals and fun creations using a <span class="highlight">3D printing pen</span>!
-                Each piece is carefully crafted by hand, making every 3Doodle unique and special.
-                Check out my critters below and take one home today!
-            </p>
-        </section>
-
-        <section id="products">
-            <h2>My Creations</h2>
-            <div class="products-grid">
-{products_html}
-            </div>
-        </section>
-
-        <section id="how-to-order">
-            <h2>How to Order</h2>
-            <div class="order-steps">
-                <div class="step">
-                    <div class="step-number">1</div>
-                    <h3>Pick Your Critters</h3>
-                    <p>Browse the shop and decide which 3Doodles you'd like!</p>
-                </div>
-                <div class="step">
-                    <div class="step-number">2</div>
-                    <h3>Send a Message</h3>
-                    <p>Email us with what you want to order and how you'd like to receive it.</p>
-                </div>
-                <div class="step">
-                    <div class="step-number">3</div>
-                    <h3>Get Your Critters!</h3>
-                    <p>Pick up locally or have them shipped to you!</p>
-                </div>
-            </div>
-        </section>
-
-        <section id="delivery">
-            <h2>Delivery Options</h2>
-            <div class="delivery-options">
-                <div class="delivery-card">
-                    <div class="icon">🏠</div>
-                    <h3>Local Pickup</h3>
-                    <p>Pick up your 3Doodles in person! Free for neighbors and local orders. We'll arrange a time that works for you.</p>
-                </div>
-                <div class="delivery-card">
-                    <div class="icon">📦</div>
-                    <h3>Shipping</h3>
-                    <p>We can ship your critters anywhere! Shipping cost depends on location. We'll let you know the price before you pay.</p>
-                </div>
-            </div>
-        </section>
-
-        <section id="payment">
-            <h2>Payment Options</h2>
-            <p style="text-align: center; margin-bottom: 1rem;">We accept several easy ways to pay:</p>
-            <div class="payment-options">
-                <div class="payment-option">
-                    <div class="icon">💵</div>
-                    <h4>Cash</h4>
-                    <p>For local pickup</p>
-                </div>
-                <div class="payment-option">
-                    <div class="icon">🅿️</div>
-                    <h4>PayPal</h4>
-                    <p>Safe & easy online</p>
-                </div>
-                <div class="payment-option">
-                    <div class="icon">💳</div>
-                    <h4>Venmo</h4>
-                    <p>Quick mobile payment</p>
-                </div>
-                <div class="payment-option">
-                    <div class="icon">💳</div>
-                    <h4>Card</h4>
-                    <p>Via Stripe</p>
-                </div>
-            </div>
-        </section>
-
-        <section id="contact">
-            <div class="contact-box">
-                <h2>Ready to Order?</h2>
-                <p>Send us an email and we'll get back to you super fast!</p>
-                <a href="mailto:Mira@3DoodleCritters.com" class="contact-email">
-                    Mira@3DoodleCritters.com
-                </a>
-                <p style="margin-top: 1.5rem; font-size: 1rem; opacity: 0.9;">
-                    Please include: which items you want, your name, and if you want pickup or shipping!
-                </p>
-            </div>
-        </section>
-    </main>
-
-    <footer>
-        <div class="footer-hearts">💜 💙 💖</div>
-        <p>Made with love by Mira | 3Doodle Critters &copy; 2025</p>
-    </footer>
-</body>
-</html>
-'''
-
-    with open(WEBSITE_FILE, 'w', encoding='utf-8') as f:
-        f.write(html)
+    inventory["items"] may be any iterable, including a stream from disk.
+    Only the pages whose items changed are rewritten. Returns the number
+    of items in the shop.
+    """
+    return website_builder.build_website(inventory.get("items", []))
 
 def show_menu():
     """Display the main menu."""
@@ -868,42 +525,87 @@ def show_menu():
     print("=" * 60)
     print("  (Website auto-updates when you make changes)")
     print("""
-  [1] List all items
+  [1] List items
   [2] Add new item
   [3] Edit item
   [4] Remove item
   [5] Toggle sold status
   [6] Regenerate website manually
-  [7] Exit
+  [7] Bulk import from CSV / JSONL
+  [8] Storage (JSON / SQLite)
+  [9] Search items
+  [0] Exit
 """)
 
+def run_command(args):
+    """Run a one-off command given on the command line.
+
+    Items are streamed from storage one at a time, so these work on
+    inventories too big to comfortably load into the menu.
+    """
+    command = args[0]
+    if command == "list":
+        try:
+            sold, low, high = parse_filter(args[1:])
+        except ValueError as e:
+            print(f"\n  Invalid filter: {e}.\n")
+            return 1
+        print_items(filter_items(inventory_stream.iter_items(), sold, low, high))
+    elif command == "website":
+        count = _generate_website_html({"items": inventory_stream.iter_items()})
+        print(f"\n  Website updated: {WEBSITE_FILE}")
+        print(f"  Total items: {count}\n")
+    elif command == "export":
+        path = inventory_store.export_json()
+        print(f"\n  Exported: {path}\n")
+    elif command == "import" and len(args) == 2:
+        bulk_import(load_inventory(), args[1])
+    elif command == "dedupe-images":
+        dedupe_images(load_inventory())
+    elif command == "search" and len(args) > 1:
+        search_items(load_inventory(), " ".join(args[1:]))
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
 def main():
     """Main function."""
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
+
     print("\n  Welcome to the 3Doodle Critters Inventory Manager!")
 
     inventory = load_inventory()
 
     while True:
+        # The in-memory inventory is kept up to date by every action; only
+        # reload if another program (e.g. the GUI) saved in the meantime.
+        inventory = inventory_store.reload_if_changed(inventory)
         show_menu()
-        choice = input("  Enter choice (1-7): ").strip()
+        choice = input("  Enter choice (0-9): ").strip()
 
         if choice == "1":
             list_items(inventory)
         elif choice == "2":
             add_item(inventory)
-            inventory = load_inventory()  # Reload
         elif choice == "3":
             edit_item(inventory)
-            inventory = load_inventory()
         elif choice == "4":
             remove_item(inventory)
-            inventory = load_inventory()
         elif choice == "5":
             toggle_sold(inventory)
-            inventory = load_inventory()
         elif choice == "6":
             generate_website(inventory)
         elif choice == "7":
+            bulk_import(inventory)
+        elif choice == "8":
+            storage_menu(inventory)
+            inventory = load_inventory()
+        elif choice == "9":
+            search_items(inventory)
+        elif choice == "0":
+            inventory_store.export_json(inventory)
             print("\n  Goodbye! 👋\n")
             break
         else:
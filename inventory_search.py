@@ -0,0 +1,166 @@
+"""
+3Doodle Critters Inventory Search
+=================================
+Find items by the words in their title and description.
+
+SearchIndex is an inverted index: every word points to the ids of the items
+that use it. Queries match each word as a prefix ("butt" finds "butterfly")
+and an item must match every word in the query. The index is kept up to
+date by InventoryIndex as items are added, edited and removed, and saved to
+inventory.search next to the inventory so it doesn't have to be rebuilt
+every time the program starts.
+"""
+
+import json
+import re
+from bisect import bisect_left, insort
+from pathlib import Path
+
+from file_utils import atomic_write, stamp_to_json
+
+SCRIPT_DIR = Path(__file__).parent
+SEARCH_FILE = SCRIPT_DIR / "inventory.search"
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    """Split text into lowercase words."""
+    return _WORD.findall(text.lower()) if text else []
+
+
+def item_terms(item):
+    """The set of words an item can be found by."""
+    return frozenset(tokenize(item.get("title", "")) + tokenize(item.get("description", "")))
+
+
+class SearchIndex:
+    """Word -> item ids, plus a sorted word list for prefix lookups."""
+
+    def __init__(self):
+        self.postings = {}  # word -> set of item ids
+        self.terms = []     # every word, sorted
+        self._doc_terms = {}  # item id -> words indexed for it
+
+    @property
+    def doc_terms(self):
+        """Item id -> its words; worked out from postings on first use.
+
+        Only edits need this, so an index loaded from disk for searching
+        doesn't pay for it.
+        """
+        if self._doc_terms is None:
+            doc_terms = {}
+            for term, ids in self.postings.items():
+                for item_id in ids:
+                    doc_terms.setdefault(item_id, []).append(term)
+            self._doc_terms = {item_id: frozenset(terms) for item_id, terms in doc_terms.items()}
+        return self._doc_terms
+
+    @classmethod
+    def build(cls, items):
+        """Index a whole list of items."""
+        index = cls()
+        postings = index.postings
+        doc_terms = index._doc_terms
+        for item in items:
+            terms = item_terms(item)
+            doc_terms[item["id"]] = terms
+            for term in terms:
+                ids = postings.get(term)
+                if ids is None:
+                    postings[term] = {item["id"]}
+                else:
+                    ids.add(item["id"])
+        index.terms = sorted(postings)
+        return index
+
+    # -- keeping the index up to date ---------------------------------------
+
+    def add(self, item):
+        item_id = item["id"]
+        terms = item_terms(item)
+        self.doc_terms[item_id] = terms
+        for term in terms:
+            ids = self.postings.get(term)
+            if ids is None:
+                self.postings[term] = {item_id}
+                insort(self.terms, term)
+            else:
+                ids.add(item_id)
+
+    def remove(self, item_id):
+        for term in self.doc_terms.pop(item_id, ()):
+            ids = self.postings[term]
+            ids.discard(item_id)
+            if not ids:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def update(self, item):
+        """Re-index an item whose title or description may have changed."""
+        if item_terms(item) != self.doc_terms.get(item["id"]):
+            self.remove(item["id"])
+            self.add(item)
+
+    # -- queries -------------------------------------------------------------
+
+    def _prefix_ids(self, prefix):
+        """Ids of items with a word starting with prefix."""
+        matches = []
+        for i in range(bisect_left(self.terms, prefix), len(self.terms)):
+            term = self.terms[i]
+            if not term.startswith(prefix):
+                break
+            matches.append(self.postings[term])
+        if len(matches) == 1:
+            return matches[0]
+        return set().union(*matches)
+
+    def query(self, text):
+        """Ids of items matching every word in text (each as a prefix)."""
+        words = sorted(set(tokenize(text)), key=len, reverse=True)
+        if not words:
+            return set()
+        # Longest words first: they usually match the fewest items
+        result = None
+        for word in words:
+            ids = self._prefix_ids(word)
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    # -- saving --------------------------------------------------------------
+
+    def to_json(self):
+        """Postings as {word: [ids]}, in word order."""
+        return {term: list(self.postings[term]) for term in self.terms}
+
+    @classmethod
+    def from_json(cls, data):
+        index = cls()
+        index.postings = {term: set(ids) for term, ids in data.items()}
+        index.terms = sorted(index.postings)  # already in order, so this is quick
+        index._doc_terms = None
+        return index
+
+
+def load(stamp, path=None):
+    """Load the saved index if it was saved for this version of the inventory."""
+    try:
+        with open(path or SEARCH_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("stamp") != stamp_to_json(stamp):
+        return None
+    return SearchIndex.from_json(data["postings"])
+
+
+def save(index, stamp, path=None):
+    """Save the index, tagged with the inventory version it matches."""
+    with atomic_write(path or SEARCH_FILE) as tmp_path, \
+            open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"stamp": stamp_to_json(stamp), "postings": index.to_json()}, f,
+                  separators=(',', ':'))
@@ -0,0 +1,206 @@
+"""
+3Doodle Critters Inventory Snapshot
+===================================
+A binary copy of inventory.json that opens instantly.
+
+inventory.snapshot is written next to inventory.json whenever the journal
+is folded back into it. On the next start it is opened with mmap instead
+of parsing the JSON, and an item is only decoded the first time something
+looks at it. The snapshot remembers the size and modification time of
+inventory.json and inventory.journal when it was written; if either file
+has changed since, the snapshot is ignored and rebuilt later.
+
+File layout:
+
+    b"3DCSNAP1"   magic
+    uint64        where the header starts
+    records       one fixed-size RECORD per item
+    heap          UTF-8 text of every string field
+    header        JSON: count, heap offset, source stamp, other top-level keys
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections.abc import MutableSequence
+from pathlib import Path
+
+from file_utils import atomic_write, stamp_to_json
+from inventory_item import Item
+
+SCRIPT_DIR = Path(__file__).parent
+SNAPSHOT_FILE = SCRIPT_DIR / "inventory.snapshot"
+
+MAGIC = b"3DCSNAP1"
+PREAMBLE = struct.Struct("<8sQ")
+# (offset, length) into the heap for id, title, description, image and
+# extra (unknown keys as JSON), then price and sold
+RECORD = struct.Struct("<10IdB7x")
+NONE = 0xFFFFFFFF  # length marking a missing image / extra
+
+
+def write_snapshot(items, meta, stamp, path=None):
+    """Write a snapshot of the items, one at a time.
+
+    stamp is inventory_store.disk_version() for the JSON files the items
+    came from. Returns the number of items written.
+    """
+    count = 0
+    heap_size = 0
+    with atomic_write(path or SNAPSHOT_FILE) as tmp_path, \
+            open(tmp_path, 'wb') as f, tempfile.TemporaryFile() as heap:
+        f.write(PREAMBLE.pack(MAGIC, 0))
+
+        def put(text):
+            nonlocal heap_size
+            if text is None:
+                return 0, NONE
+            data = text.encode('utf-8')
+            heap.write(data)
+            heap_size += len(data)
+            return heap_size - len(data), len(data)
+
+        for item in items:
+            if not isinstance(item, Item):
+                item = Item.from_dict(item)
+            fields = []
+            for text in (item.id, item.title, item.description, item.image,
+                         json.dumps(item.extra) if item.extra else None):
+                fields.extend(put(text))
+            f.write(RECORD.pack(*fields, float(item.price), 1 if item.sold else 0))
+            count += 1
+
+        heap_offset = f.tell()
+        heap.seek(0)
+        shutil.copyfileobj(heap, f)
+        header_offset = f.tell()
+        header = {
+            "count": count,
+            "heap_offset": heap_offset,
+            "stamp": stamp_to_json(stamp),
+            "meta": {k: v for k, v in meta.items() if k != "items"},
+        }
+        f.write(json.dumps(header).encode('utf-8'))
+        f.seek(0)
+        f.write(PREAMBLE.pack(MAGIC, header_offset))
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+
+def open_snapshot(stamp, path=None):
+    """Open the snapshot if it matches stamp.
+
+    Returns (items, meta), where items is a SnapshotItems list, or None if
+    there is no usable snapshot.
+    """
+    path = Path(path or SNAPSHOT_FILE)
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty file
+        f.close()
+        return None
+    try:
+        magic, header_offset = PREAMBLE.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise ValueError("not a snapshot")
+        header = json.loads(mm[header_offset:].decode('utf-8'))
+    except (struct.error, ValueError):
+        mm.close()
+        f.close()
+        return None
+    if header["stamp"] != stamp_to_json(stamp):
+        mm.close()
+        f.close()
+        return None
+    items = SnapshotItems(f, mm, header["count"], header["heap_offset"])
+    return items, header["meta"]
+
+
+class SnapshotItems(MutableSequence):
+    """The snapshot's items, as a list that decodes items on first use.
+
+    Reading an item decodes just that record. The first change to the list
+    (append, delete, ...) decodes every item into an ordinary list and
+    closes the file, after which it behaves like a plain list.
+    """
+
+    def __init__(self, f, mm, count, heap_offset):
+        self._file = f
+        self._mm = mm
+        self._heap = heap_offset
+        self._items = [None] * count
+
+    def _decode(self, index):
+        fields = RECORD.unpack_from(self._mm, PREAMBLE.size + index * RECORD.size)
+        texts = []
+        for n in range(5):
+            offset, length = fields[2 * n], fields[2 * n + 1]
+            if length == NONE:
+                texts.append(None)
+            else:
+                start = self._heap + offset
+                texts.append(self._mm[start:start + length].decode('utf-8'))
+        item_id, title, description, image, extra = texts
+        return Item(item_id, title, description, fields[10], image, bool(fields[11]),
+                    json.loads(extra) if extra else None)
+
+    def _get(self, index):
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._decode(index)
+        return item
+
+    def materialize(self):
+        """Decode everything and let go of the snapshot file."""
+        if self._mm is not None:
+            for index in range(len(self._items)):
+                self._get(index)
+            self._mm.close()
+            self._file.close()
+            self._mm = self._file = None
+        return self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if self._mm is None:
+            return self._items[index]
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        if index < 0:
+            index += len(self._items)
+        if not 0 <= index < len(self._items):
+            raise IndexError("list index out of range")
+        return self._get(index)
+
+    def __iter__(self):
+        if self._mm is None:
+            return iter(self._items)
+        return (self._get(index) for index in range(len(self._items)))
+
+    def __setitem__(self, index, value):
+        self.materialize()[index] = value
+
+    def __delitem__(self, index):
+        del self.materialize()[index]
+
+    def insert(self, index, value):
+        self.materialize().insert(index, value)
+
+    def append(self, value):
+        self.materialize().append(value)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"SnapshotItems({len(self)} items)"
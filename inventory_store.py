@@ -0,0 +1,659 @@
+"""
+3Doodle Critters Inventory Storage
+==================================
+Shared load/save code for the inventory manager (CLI) and the GUI app.
+
+By default the inventory lives in inventory.json. Changes are appended to
+inventory.journal (one JSON line per add/update/remove/toggle) and folded
+back into inventory.json every so often, so saving an edit costs about the
+size of the edit rather than the size of the whole inventory. Each time
+that happens a binary inventory.snapshot is written too, which the next
+start opens instead of parsing the JSON (see inventory_snapshot).
+
+Once inventory.db exists, the SQLite engine is used instead, so editing an
+item only touches its row. In either mode inventory.json can be written out
+as an up-to-date export for the static site (see export_json).
+
+Searching builds a word index over titles and descriptions; it is saved to
+inventory.search whenever everything is written out, so the next start can
+load it instead of building it again (see search and inventory_search).
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from file_utils import atomic_write
+import inventory_search
+import inventory_snapshot
+from inventory_index import InventoryIndex
+from inventory_item import Item, items_from_dicts, to_json
+from inventory_snapshot import SnapshotItems
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+INVENTORY_FILE = SCRIPT_DIR / "inventory.json"
+INVENTORY_JOURNAL = SCRIPT_DIR / "inventory.journal"
+INVENTORY_DB = SCRIPT_DIR / "inventory.db"
+
+# Fold the journal into inventory.json after this many changes
+COMPACT_EVERY = 500
+
+# Columns stored for every item, in the order they appear in inventory.json
+ITEM_FIELDS = ("id", "title", "description", "price", "image", "sold")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id          TEXT PRIMARY KEY,
+    position    INTEGER NOT NULL,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    price       REAL NOT NULL DEFAULT 0,
+    image       TEXT,
+    sold        INTEGER NOT NULL DEFAULT 0,
+    extra       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_position ON items (position);
+CREATE INDEX IF NOT EXISTS idx_items_sold ON items (sold);
+CREATE INDEX IF NOT EXISTS idx_items_price ON items (price);
+CREATE INDEX IF NOT EXISTS idx_items_title ON items (title);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_db = None
+_journal_ops = 0
+
+
+class Inventory(dict):
+    """The inventory dict, plus bookkeeping about what is saved on disk.
+
+    To the rest of the code (and to json.dump) this is still a plain dict
+    with "items" and "google_drive_folder_id".
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = None  # disk_version() when last loaded or saved
+        self.dirty = {}      # item id -> (op, item) changed but not saved yet
+        self.session_depth = 0  # > 0 while inside inventory_session()
+        self._index = None
+
+    @property
+    def index(self):
+        """The InventoryIndex over self["items"], built on first use."""
+        items = self.setdefault("items", [])
+        if self._index is None or self._index.items is not items:
+            self._index = InventoryIndex(items)
+        return self._index
+
+
+def index_of(inventory):
+    """Return an InventoryIndex for any inventory dict."""
+    if isinstance(inventory, Inventory):
+        return inventory.index
+    return InventoryIndex(inventory.setdefault("items", []))
+
+
+def search(inventory, query):
+    """Items matching every word in query, in inventory order."""
+    index = index_of(inventory)
+    if index.text is None and isinstance(inventory, Inventory) and not inventory.dirty:
+        # Saved index only matches if memory matches what is on disk
+        index.text = inventory_search.load(inventory.version)
+    return index.search(query)
+
+
+def save_search_index(inventory):
+    """Save the search index to match what is on disk (best effort)."""
+    if not isinstance(inventory, Inventory) or inventory._index is None:
+        return
+    if inventory._index.items is not inventory.get("items"):
+        return
+    text = inventory._index.text
+    if text is None:
+        return
+    try:
+        inventory_search.save(text, disk_version())
+    except OSError:
+        pass  # a stale index is simply rebuilt next time
+
+
+def empty_inventory():
+    """Return a new, empty inventory."""
+    return {"items": [], "google_drive_folder_id": ""}
+
+
+def use_sqlite():
+    """Return True when the SQLite storage engine is switched on."""
+    return INVENTORY_DB.exists()
+
+
+# ---------------------------------------------------------------------------
+# JSON engine
+# ---------------------------------------------------------------------------
+
+def load_json(path=None):
+    """Load inventory from a JSON file (items come back as Items)."""
+    path = Path(path or INVENTORY_FILE)
+    if path.exists():
+        with open(path, 'r') as f:
+            inventory = json.load(f)
+        inventory["items"] = items_from_dicts(inventory.get("items", []))
+        return inventory
+    return empty_inventory()
+
+
+def save_json(inventory, path=None):
+    """Write the whole inventory to a JSON file.
+
+    The file is written next to the target and then renamed over it, so a
+    crash part-way through never leaves a half-written inventory.json.
+    """
+    items = inventory.get("items", [])
+    if not isinstance(items, list):
+        inventory = dict(inventory, items=list(items))
+    with atomic_write(path or INVENTORY_FILE) as tmp_path, open(tmp_path, 'w') as f:
+        json.dump(inventory, f, indent=2, default=to_json)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ---------------------------------------------------------------------------
+# Journal (JSON engine)
+# ---------------------------------------------------------------------------
+
+def append_journal(*entries):
+    """Append changes to the journal and make sure they are on disk.
+
+    Several entries are written as a single "batch" line, so after a crash
+    either all of them are in the journal or none are.
+    """
+    global _journal_ops
+    if not entries:
+        return
+    entry = entries[0] if len(entries) == 1 else {"op": "batch", "ops": list(entries)}
+    line = json.dumps(entry, separators=(',', ':'), default=to_json) + "\n"
+    with open(INVENTORY_JOURNAL, 'a') as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    _journal_ops += len(entries)
+
+
+def read_journal():
+    """Read journal entries.
+
+    A torn last line left by a crash is cut off, so that the next append
+    starts on a fresh line.
+    """
+    entries = []
+    if not INVENTORY_JOURNAL.exists():
+        return entries
+    good_end = 0
+    with open(INVENTORY_JOURNAL, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if entry.get("op") == "batch":
+                entries.extend(entry["ops"])
+            else:
+                entries.append(entry)
+            good_end += len(line)
+    if good_end < INVENTORY_JOURNAL.stat().st_size:
+        os.truncate(INVENTORY_JOURNAL, good_end)
+    return entries
+
+
+def replay_journal(inventory, entries):
+    """Apply journal entries to an inventory loaded from inventory.json.
+
+    Every entry is idempotent (add/update replace the item, toggle sets the
+    sold flag, remove drops it if present), so replaying entries that were
+    already compacted into the snapshot is harmless.
+    """
+    if not entries:
+        return inventory
+    by_id = {item["id"]: item for item in inventory.get("items", [])}
+    for entry in entries:
+        op = entry.get("op")
+        if op in ("add", "update"):
+            item = Item.from_dict(entry["item"])
+            by_id[item.id] = item
+        elif op == "toggle":
+            item = by_id.get(entry["id"])
+            if item is not None:
+                item["sold"] = entry["sold"]
+        elif op == "remove":
+            by_id.pop(entry["id"], None)
+    inventory["items"] = list(by_id.values())
+    return inventory
+
+
+def clear_journal():
+    """Forget journal entries once they are safely in inventory.json."""
+    global _journal_ops
+    if INVENTORY_JOURNAL.exists():
+        INVENTORY_JOURNAL.unlink()
+    _journal_ops = 0
+
+
+def compact(inventory, *pending):
+    """Fold the journal into inventory.json and empty it.
+
+    pending are journal entries of ours that are not in the journal yet.
+    If another program saved since we last loaded or saved, its changes
+    are read back first and ours applied on top, so folding the journal
+    never loses them; the inventory is updated in place to match.
+    """
+    if changed_on_disk(inventory):
+        _merge_saved(inventory, pending)
+    _write_out(inventory)
+    _stamp(inventory)
+
+
+def _merge_saved(inventory, pending):
+    """Make the inventory what is on disk plus our pending changes."""
+    saved = replay_journal(load_json(), read_journal() + list(pending))
+    if isinstance(inventory, Inventory):
+        # Changes not saved yet (inside a session) stay on top
+        replay_journal(saved, [_journal_entry(op, item_id, item)
+                               for item_id, (op, item) in inventory.dirty.items()])
+    # Keep our own Item objects where nothing changed, so references held
+    # by callers (the selected item, dirty entries) stay valid
+    current = {item["id"]: item for item in inventory.get("items", [])}
+    saved["items"] = [current[item["id"]] if current.get(item["id"]) == item else item
+                      for item in saved["items"]]
+    inventory.clear()
+    inventory.update(saved)
+
+
+def _write_out(inventory):
+    """Write inventory.json from memory and empty the journal."""
+    save_json(inventory)
+    clear_journal()
+    refresh_snapshot(inventory)
+    save_search_index(inventory)
+
+
+def refresh_snapshot(inventory):
+    """Rewrite inventory.snapshot to match inventory.json (best effort)."""
+    items = inventory.get("items", [])
+    if isinstance(items, SnapshotItems):
+        # Windows will not replace a file that is still mapped
+        items.materialize()
+    try:
+        inventory_snapshot.write_snapshot(items, inventory, disk_version())
+    except OSError:
+        pass  # a stale snapshot is simply ignored next time
+
+
+# ---------------------------------------------------------------------------
+# SQLite engine
+# ---------------------------------------------------------------------------
+
+def connect_db(path=None):
+    """Open (and create if needed) the SQLite inventory database."""
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(str(path or INVENTORY_DB))
+        _db.executescript(SCHEMA)
+    return _db
+
+
+def close_db():
+    """Close the SQLite connection, if one is open."""
+    global _db
+    if _db is not None:
+        _db.close()
+        _db = None
+
+
+def _row_to_item(row):
+    """Turn an items row back into an Item."""
+    item_id, title, description, price, image, sold, extra = row
+    return Item(item_id, title, description, price, image, bool(sold),
+                json.loads(extra) if extra else None)
+
+
+def _item_values(item):
+    """Column values for an item, with unknown keys packed into 'extra'."""
+    extra = {k: v for k, v in item.items() if k not in ITEM_FIELDS}
+    return (
+        item["id"],
+        item.get("title", ""),
+        item.get("description", ""),
+        float(item.get("price", 0)),
+        item.get("image"),
+        1 if item.get("sold", False) else 0,
+        json.dumps(extra) if extra else None,
+    )
+
+
+def load_sqlite_meta():
+    """Return the inventory's top-level settings (everything but items)."""
+    db = connect_db()
+    return {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM meta")}
+
+
+def iter_sqlite_items():
+    """Yield items from the database one row at a time."""
+    db = connect_db()
+    for row in db.execute(
+            "SELECT id, title, description, price, image, sold, extra "
+            "FROM items ORDER BY position"):
+        yield _row_to_item(row)
+
+
+def load_sqlite():
+    """Load the whole inventory from the SQLite database."""
+    inventory = empty_inventory()
+    inventory.update(load_sqlite_meta())
+    inventory["items"] = list(iter_sqlite_items())
+    return inventory
+
+
+def save_sqlite(inventory):
+    """Replace the database contents with the given inventory."""
+    db = connect_db()
+    with db:
+        db.execute("DELETE FROM items")
+        db.executemany(
+            "INSERT INTO items (id, title, description, price, image, sold, extra, position) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (_item_values(item) + (position,)
+             for position, item in enumerate(inventory.get("items", []))))
+        db.execute("DELETE FROM meta")
+        db.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            ((key, json.dumps(value)) for key, value in inventory.items() if key != "items"))
+
+
+def save_item_sqlite(item):
+    """Insert or update a single item row (new items go to the end)."""
+    apply_changes_sqlite([item], [])
+
+
+def apply_changes_sqlite(saved_items, deleted_ids):
+    """Insert/update and delete item rows in one transaction."""
+    db = connect_db()
+    with db:
+        db.executemany(
+            "INSERT INTO items (id, title, description, price, image, sold, extra, position) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, "
+            "(SELECT COALESCE(MAX(position), -1) + 1 FROM items)) "
+            "ON CONFLICT (id) DO UPDATE SET "
+            "title = excluded.title, description = excluded.description, "
+            "price = excluded.price, image = excluded.image, "
+            "sold = excluded.sold, extra = excluded.extra",
+            (_item_values(item) for item in saved_items))
+        db.executemany("DELETE FROM items WHERE id = ?", ((item_id,) for item_id in deleted_ids))
+
+
+def delete_item_sqlite(item_id):
+    """Delete a single item row."""
+    apply_changes_sqlite([], [item_id])
+
+
+# ---------------------------------------------------------------------------
+# Public API used by inventory_manager and inventory_app
+# ---------------------------------------------------------------------------
+
+def disk_version():
+    """A cheap stamp of the files behind the active engine.
+
+    Only file sizes and modification times are looked at, so checking it
+    costs a few stat() calls no matter how big the inventory is.
+    """
+    if use_sqlite():
+        paths = (INVENTORY_DB,)
+    else:
+        paths = (INVENTORY_FILE, INVENTORY_JOURNAL)
+    version = []
+    for path in paths:
+        try:
+            st = path.stat()
+            version.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            version.append(None)
+    return tuple(version)
+
+
+def _stamp(inventory):
+    """Remember that the inventory now matches what is on disk."""
+    if isinstance(inventory, Inventory):
+        inventory.version = disk_version()
+
+
+def load_inventory():
+    """Load the inventory from whichever engine is active."""
+    global _journal_ops
+    if use_sqlite():
+        inventory = Inventory(load_sqlite())
+        _stamp(inventory)
+        return inventory
+
+    entries = read_journal()
+    _journal_ops = len(entries)
+    if not entries:
+        snapshot = inventory_snapshot.open_snapshot(disk_version())
+        if snapshot is not None:
+            items, meta = snapshot
+            inventory = Inventory(meta)
+            inventory["items"] = items
+            _stamp(inventory)
+            return inventory
+
+    inventory = Inventory(replay_journal(load_json(), entries))
+    _stamp(inventory)
+    if not entries and INVENTORY_FILE.exists():
+        refresh_snapshot(inventory)
+    return inventory
+
+
+def changed_on_disk(inventory):
+    """Return True if another program saved since we loaded or saved."""
+    if not isinstance(inventory, Inventory):
+        return True
+    return inventory.version != disk_version()
+
+
+def reload_if_changed(inventory):
+    """Return the inventory, reloaded only if it changed on disk.
+
+    Unsaved changes are saved first so they are not lost.
+    """
+    if not changed_on_disk(inventory):
+        return inventory
+    flush_changes(inventory)
+    return load_inventory()
+
+
+def save_inventory(inventory):
+    """Save the whole inventory."""
+    if use_sqlite():
+        save_sqlite(inventory)
+    else:
+        _write_out(inventory)
+    if isinstance(inventory, Inventory):
+        inventory.dirty.clear()
+    _stamp(inventory)
+
+
+def _journal_entry(op, item_id, item):
+    """The journal line for one change."""
+    if op == "remove":
+        return {"op": "remove", "id": item_id}
+    if op == "toggle":
+        return {"op": "toggle", "id": item_id, "sold": item.get("sold", False)}
+    return {"op": op, "item": item}
+
+
+def _journal_change(inventory, *entries):
+    """Record changes in the journal, or compact if it would get too long."""
+    if _journal_ops + len(entries) >= COMPACT_EVERY:
+        compact(inventory, *entries)
+        return
+    # Only re-stamp if we were in step with disk; otherwise the stamp would
+    # hide another program's save and the next compact() would lose it
+    in_step = not changed_on_disk(inventory)
+    append_journal(*entries)
+    if in_step:
+        _stamp(inventory)
+
+
+def _index_change(inventory, item, op):
+    """Bring inventory["items"] and its index in step with one change.
+
+    An added item is appended to the list unless it is there already; a
+    removed one is taken out if it is still there.
+    """
+    if isinstance(inventory, Inventory):
+        index = inventory.index
+    elif op in ("add", "remove"):
+        index = index_of(inventory)
+    else:
+        return  # edited in place; nothing else to keep up to date
+    if op == "add":
+        index.add(item)
+    elif op == "remove":
+        index.remove(item["id"])
+    else:
+        index.update(item)
+
+
+def save_item(inventory, item, op="update"):
+    """Save one added or edited item.
+
+    op is "add", "update" or "toggle" (only the sold flag changed). With
+    SQLite only that item's row is written; with JSON one journal line is.
+    The item list and its index are kept up to date (see _index_change).
+    """
+    _index_change(inventory, item, op)
+    if use_sqlite():
+        save_item_sqlite(item)
+        _stamp(inventory)
+    else:
+        _journal_change(inventory, _journal_entry(op, item["id"], item))
+
+
+def delete_item(inventory, item_id):
+    """Save the removal of one item, taking it out of inventory["items"]
+    if it is still there."""
+    _index_change(inventory, {"id": item_id}, "remove")
+    if use_sqlite():
+        delete_item_sqlite(item_id)
+        _stamp(inventory)
+    else:
+        _journal_change(inventory, _journal_entry("remove", item_id, None))
+
+
+def mark_dirty(inventory, item, op="update"):
+    """Flag an item as changed in memory; flush_changes() saves it.
+
+    op is "add", "update", "toggle" or "remove". Several changes to the same
+    item are folded into one (an added-then-edited item is still one "add").
+    The item list and its index are updated straight away.
+    """
+    if not isinstance(inventory, Inventory):
+        # No bookkeeping on a plain dict, so save straight away
+        if op == "remove":
+            delete_item(inventory, item["id"])
+        else:
+            save_item(inventory, item, op)
+        return
+    _index_change(inventory, item, op)
+    item_id = item["id"]
+    previous = inventory.dirty.get(item_id, (None, None))[0]
+    if op == "remove":
+        if previous == "add":
+            # Never saved, so there is nothing on disk to remove
+            del inventory.dirty[item_id]
+            return
+    elif previous == "add" or (previous == "update" and op == "toggle"):
+        op = previous
+    inventory.dirty[item_id] = (op, item)
+
+
+def flush_changes(inventory):
+    """Save every item flagged by mark_dirty() in a single write.
+
+    That is one SQLite transaction, or one journal line (or one rewrite of
+    inventory.json when the journal is due for compacting), so either all
+    of the changes are saved or, after a crash, none of them.
+    """
+    if not isinstance(inventory, Inventory) or not inventory.dirty:
+        return 0
+    changes = list(inventory.dirty.items())
+    if use_sqlite():
+        apply_changes_sqlite(
+            [item for _, (op, item) in changes if op != "remove"],
+            [item_id for item_id, (op, _) in changes if op == "remove"])
+        _stamp(inventory)
+    else:
+        _journal_change(inventory, *(_journal_entry(op, item_id, item)
+                                     for item_id, (op, item) in changes))
+    inventory.dirty.clear()
+    return len(changes)
+
+
+def revert(inventory):
+    """Throw away unsaved changes, putting the inventory back as on disk.
+
+    The same inventory object is updated in place, so callers holding on
+    to it see the saved state.
+    """
+    saved = load_inventory()
+    inventory.clear()
+    inventory.update(saved)
+    if isinstance(inventory, Inventory):
+        inventory.dirty.clear()
+        inventory.version = saved.version
+    return inventory
+
+
+def export_json(inventory=None):
+    """Write an up-to-date inventory.json for the static site.
+
+    Without an inventory the items are streamed from storage to the file,
+    so the whole inventory is never held in memory.
+    """
+    if inventory is None:
+        import inventory_stream
+        meta = {}
+        inventory_stream.write_json(inventory_stream.iter_items(meta), meta)
+        if not use_sqlite():
+            clear_journal()
+        return INVENTORY_FILE
+    flush_changes(inventory)
+    if use_sqlite():
+        save_json(inventory)
+        save_search_index(inventory)
+        _stamp(inventory)
+    else:
+        compact(inventory)
+    return INVENTORY_FILE
+
+
+def migrate_to_sqlite():
+    """Switch storage to SQLite, importing the current inventory.json."""
+    inventory = load_inventory()
+    save_sqlite(inventory)
+    clear_journal()
+    return len(inventory.get("items", []))
+
+
+def migrate_to_json():
+    """Switch storage back to inventory.json and remove the database."""
+    inventory = load_sqlite()
+    save_json(inventory)
+    close_db()
+    INVENTORY_DB.unlink()
+    return len(inventory.get("items", []))
@@ -0,0 +1,220 @@
+"""
+3Doodle Critters Streaming Inventory Reader
+===========================================
+Read inventory items one at a time instead of loading the whole inventory.
+
+load_inventory() in inventory_store still reads everything at once and is
+what the menu and the GUI use. The functions here are for jobs that only
+need to pass over the items once (listing, building the website, writing
+inventory.json), so memory use stays flat however big the inventory is.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import inventory_store
+from file_utils import atomic_write
+from inventory_item import Item, to_json
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONStreamReader:
+    """Pulls JSON values out of a file a piece at a time."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        """Read another chunk, dropping what has already been parsed."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._read_more():
+                break
+        return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in inventory file, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self._read_more():
+                    raise
+                continue
+            # A number at the very end of the buffer might continue in the
+            # next chunk, so only trust it once there is more data after it.
+            if end == len(self.buf) and not self.eof and self._read_more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(path=None, meta=None):
+    """Yield the items of an inventory.json file one at a time, as Items.
+
+    If a dict is passed as meta it is filled with the other top-level keys
+    (such as google_drive_folder_id) as they are read.
+    """
+    path = Path(path or inventory_store.INVENTORY_FILE)
+    if not path.exists():
+        return
+    with open(path, 'r') as f:
+        reader = _JSONStreamReader(f, CHUNK_SIZE)
+        reader.expect("{")
+        while reader.peek() not in ("}", ""):
+            key = reader.value()
+            reader.expect(":")
+            if key == "items":
+                reader.expect("[")
+                while reader.peek() != "]":
+                    yield Item.from_dict(reader.value())
+                    if reader.peek() == ",":
+                        reader.pos += 1
+                reader.expect("]")
+            else:
+                value = reader.value()
+                if meta is not None:
+                    meta[key] = value
+            if reader.peek() == ",":
+                reader.pos += 1
+
+
+def read_meta(path=None):
+    """Return the top-level keys of inventory.json other than "items"."""
+    meta = {}
+    for _item in iter_json_items(path, meta):
+        pass
+    return meta
+
+
+def _journal_overlay(entries):
+    """Work out what the journal does to each item id.
+
+    Returns (changes, appended): changes maps an id to how the snapshot
+    copy of that item should be treated, and appended holds, in order, the
+    ids that go after the snapshot items (unless the snapshot already has
+    them). This mirrors inventory_store.replay_journal without needing the
+    snapshot in memory.
+    """
+    changes = {}   # id -> {"item": Item or None, "sold": bool or None, "removed": bool, "moved": bool}
+    appended = {}  # ids in the order they were added (a dict used as an ordered set)
+    for entry in entries:
+        op = entry.get("op")
+        if op in ("add", "update"):
+            item = Item.from_dict(entry["item"])
+            change = changes.get(item.id)
+            if change is not None and change["removed"]:
+                # Removed and added back: it now goes at the end
+                appended.pop(item.id, None)
+                appended[item.id] = None
+                changes[item.id] = {"item": item, "sold": None, "removed": False, "moved": True}
+                continue
+            appended.setdefault(item.id, None)
+            if change is None:
+                changes[item.id] = {"item": item, "sold": None, "removed": False, "moved": False}
+            else:
+                change.update(item=item, sold=None)
+        elif op == "toggle":
+            change = changes.get(entry["id"])
+            if change is None:
+                changes[entry["id"]] = {"item": None, "sold": entry["sold"], "removed": False, "moved": False}
+            elif change["item"] is not None:
+                change["item"]["sold"] = entry["sold"]
+            elif not change["removed"]:
+                change["sold"] = entry["sold"]
+        elif op == "remove":
+            changes[entry["id"]] = {"item": None, "sold": None, "removed": True, "moved": False}
+    return changes, appended
+
+
+def iter_items(meta=None):
+    """Yield every item from the active storage engine, one at a time.
+
+    As with iter_json_items, a dict passed as meta receives the inventory's
+    other top-level keys; they are all there once the items run out.
+    """
+    if inventory_store.use_sqlite():
+        if meta is not None:
+            meta.update(inventory_store.load_sqlite_meta())
+        yield from inventory_store.iter_sqlite_items()
+        return
+
+    changes, appended = _journal_overlay(inventory_store.read_journal())
+    seen = set()
+    for item in iter_json_items(meta=meta):
+        change = changes.get(item.id)
+        if change is None:
+            yield item
+            continue
+        seen.add(item.id)
+        if change["removed"] or change["moved"]:
+            continue
+        if change["item"] is not None:
+            yield change["item"]
+        else:
+            if change["sold"] is not None:
+                item.sold = change["sold"]
+            yield item
+
+    for item_id in appended:
+        change = changes[item_id]
+        if change["item"] is None or change["removed"]:
+            continue
+        if item_id in seen and not change["moved"]:
+            continue  # it kept its place in the snapshot
+        yield change["item"]
+
+
+def write_json(items, meta, path=None):
+    """Write inventory.json from an item iterator, one item at a time.
+
+    The output matches json.dump(inventory, f, indent=2). It goes to a
+    temporary file that is renamed over the target when complete. meta is
+    only read after the last item, so it can be the dict being filled in
+    by iter_items(meta).
+    """
+    path = path or inventory_store.INVENTORY_FILE
+    count = 0
+    with atomic_write(path) as tmp_path, open(tmp_path, 'w') as f:
+        f.write('{\n  "items": [')
+        for item in items:
+            text = json.dumps(item, indent=2, default=to_json).replace("\n", "\n    ")
+            f.write(("," if count else "") + "\n    " + text)
+            count += 1
+        f.write("\n  ]" if count else "]")
+        for key, value in meta.items():
+            if key == "items":
+                continue
+            text = json.dumps(value, indent=2, default=to_json).replace("\n", "\n  ")
+            f.write(f",\n  {json.dumps(key)}: {text}")
+        f.write("\n}")
+        f.flush()
+        os.fsync(f.fileno())
+    return count
@@ -0,0 +1,82 @@
+"""
+3Doodle Critters Photo Pipeline
+===============================
+Download photos from Google Drive and convert them to PNG at the same
+time.
+
+Downloading first and converting afterwards leaves the CPU idle while the
+network is busy, and the other way round. download_and_convert() instead
+hands each photo to the conversion workers as soon as its download
+finishes (see drive_download and image_convert). Finished downloads wait
+in a queue of at most PIPELINE_QUEUE photos; when conversion falls
+behind, download threads wait for room before starting another file.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import drive_download
+import image_convert
+
+# Downloaded photos that may wait for a conversion worker
+PIPELINE_QUEUE = 4
+
+
+def download_and_convert(files, download_dir, output_dir,
+                         download_workers=drive_download.DOWNLOAD_WORKERS,
+                         convert_workers=image_convert.CONVERT_WORKERS,
+                         queue_size=PIPELINE_QUEUE, report=print,
+                         manifest_file=image_convert.MANIFEST_FILE):
+    """Download files and convert each one to a PNG in output_dir.
+
+    files are as for drive_download.download_all; manifest_file is as for
+    image_convert.convert_batch. Returns (downloaded
+    paths, PNG paths), both in the order of files; failed files are left
+    out of each.
+    """
+    files = list(files)
+    handoff = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+    order = {Path(output_dir) / (Path(file[1]).stem + ".png"): index for index, file in enumerate(files)}
+
+    def hand_over(path):
+        while not stopped.is_set():
+            try:
+                handoff.put(path, timeout=0.2)  # waits while conversion is behind
+                return
+            except queue.Full:
+                pass
+        raise RuntimeError("conversion stopped")
+
+    def download():
+        try:
+            return drive_download.download_all(files, download_dir, download_workers,
+                                               report=report, on_download=hand_over)
+        finally:
+            handoff.put(None)  # no more photos
+
+    def jobs():
+        while True:
+            path = handoff.get()
+            if path is None:
+                return
+            yield path, Path(output_dir) / (path.stem + ".png")
+
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        downloading = runner.submit(download)
+        try:
+            converted = image_convert.convert_batch(jobs(), convert_workers, report, manifest_file,
+                                                    total=len(files))
+        finally:
+            stopped.set()
+            while not downloading.done():  # let a blocked final put() through
+                try:
+                    handoff.get(timeout=0.2)
+                except queue.Empty:
+                    pass
+        downloaded = downloading.result()
+
+    converted.sort(key=lambda png: order.get(png, len(files)))
+    return downloaded, converted
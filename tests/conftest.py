@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules under test live in the project folder, next to tests/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import inventory_search  # noqa: E402
+import inventory_snapshot  # noqa: E402
+import inventory_store  # noqa: E402
+from inventory_item import Item  # noqa: E402
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Inventory storage in tmp_path, starting with one saved item."""
+    monkeypatch.setattr(inventory_store, "INVENTORY_FILE", tmp_path / "inventory.json")
+    monkeypatch.setattr(inventory_store, "INVENTORY_JOURNAL", tmp_path / "inventory.journal")
+    monkeypatch.setattr(inventory_store, "INVENTORY_DB", tmp_path / "inventory.db")
+    monkeypatch.setattr(inventory_snapshot, "SNAPSHOT_FILE", tmp_path / "inventory.snapshot")
+    monkeypatch.setattr(inventory_search, "SEARCH_FILE", tmp_path / "inventory.search")
+    monkeypatch.setattr(inventory_store, "_journal_ops", 0)
+    inventory_store.save_json({"items": [Item("start", "Already there")],
+                               "google_drive_folder_id": ""})
+    return tmp_path
@@ -0,0 +1,66 @@
+"""Downloading from a local stand-in for Google Drive."""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+import drive_download
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from drive_standin import DriveStandIn  # noqa: E402
+
+OLD = b"\x00\x00\x00\x18ftypheic" + b"old photo " * 20_000
+NEW = b"\x00\x00\x00\x18ftypheic" + b"new photo " * 20_000
+
+
+@pytest.fixture(autouse=True)
+def no_waiting(monkeypatch):
+    monkeypatch.setattr(drive_download, "BACKOFF", 0)
+
+
+def etag(data):
+    return '"' + hashlib.md5(data).hexdigest() + '"'
+
+
+def start_part(folder, data, validator):
+    part = folder / "photo.heic.part"
+    part.write_bytes(data[:50_000])
+    if validator:
+        (folder / "photo.heic.part.validator").write_text(validator)
+
+
+def test_resumes_an_unchanged_file(tmp_path):
+    start_part(tmp_path, NEW, etag(NEW))
+    with DriveStandIn({"id1": NEW}) as drive:
+        path = drive_download.download_file("id1", "photo.heic", tmp_path, base_url=drive.url,
+                                            expected_md5=hashlib.md5(NEW).hexdigest())
+        assert drive.ranges == 1
+        assert drive.sent == len(NEW) - 50_000
+    assert path.read_bytes() == NEW
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["photo.heic"]
+
+
+def test_starts_over_when_the_file_changed(tmp_path):
+    start_part(tmp_path, OLD, etag(OLD))
+    with DriveStandIn({"id1": NEW}) as drive:
+        path = drive_download.download_file("id1", "photo.heic", tmp_path, base_url=drive.url)
+        assert drive.ranges == 0
+    assert path.read_bytes() == NEW
+
+
+def test_starts_over_without_a_validator(tmp_path):
+    start_part(tmp_path, OLD, None)
+    with DriveStandIn({"id1": NEW}) as drive:
+        path = drive_download.download_file("id1", "photo.heic", tmp_path, base_url=drive.url)
+        assert drive.ranges == 0
+    assert path.read_bytes() == NEW
+
+
+def test_cut_transfer_resumes_from_its_validator(tmp_path):
+    with DriveStandIn({"id1": NEW}, cut={"id1": 64 * 1024}) as drive:
+        path = drive_download.download_file("id1", "photo.heic", tmp_path, base_url=drive.url)
+        assert drive.ranges == 1
+    assert path.read_bytes() == NEW
+    assert not (tmp_path / "photo.heic.part.validator").exists()
@@ -0,0 +1,60 @@
+"""Converting batches of photos."""
+
+from PIL import Image
+
+import image_convert
+
+
+def make_photo(path, color):
+    Image.new("RGB", (64, 48), color).save(path, "JPEG")
+    return path
+
+
+def test_jobs_for_the_same_output_run_once(tmp_path):
+    photo = make_photo(tmp_path / "photo.jpg", (200, 0, 0))
+    other = make_photo(tmp_path / "other.jpg", (0, 200, 0))
+    out = tmp_path / "out"
+    out.mkdir()
+    jobs = [(photo, out / "photo.png"), (photo, out / "photo.png"),
+            (other, out / "." / "photo.png"), (other, out / "other.png")]
+    lines = []
+
+    converted = image_convert.convert_batch(jobs, workers=2, report=lines.append,
+                                            manifest_file=None)
+
+    assert converted == [out / "photo.png", out / "other.png"]
+    assert sum("Skipped" in line for line in lines) == 2
+    assert sorted(path.name for path in out.iterdir()) == ["other.png", "photo.png"]
+    with Image.open(out / "photo.png") as img:
+        assert img.getpixel((0, 0))[1] < 50  # made from photo, not other
+
+
+def test_streamed_duplicates_still_count_towards_total(tmp_path):
+    photo = make_photo(tmp_path / "photo.jpg", (0, 0, 200))
+    jobs = iter([(photo, tmp_path / "photo.png")] * 3)
+    lines = []
+
+    converted = image_convert.convert_batch(jobs, workers=1, report=lines.append,
+                                            manifest_file=None, total=3)
+
+    assert converted == [tmp_path / "photo.png"]
+    assert lines[-1].startswith("  [3/3]")
+
+
+def test_streamed_jobs_convert_at_the_same_time(tmp_path):
+    big = tmp_path / "big.jpg"
+    Image.effect_noise((1500, 1000), 100).convert("RGB").save(big, "JPEG")
+    small = make_photo(tmp_path / "small.jpg", (0, 200, 0))
+    first_done = []
+
+    def jobs():
+        yield big, tmp_path / "big.png"
+        # Asked for the next job while the first is still converting
+        first_done.append((tmp_path / "big.png").exists())
+        yield small, tmp_path / "small.png"
+
+    converted = image_convert.convert_batch(jobs(), workers=2, report=lambda line: None,
+                                            manifest_file=None, total=2)
+
+    assert converted == [tmp_path / "big.png", tmp_path / "small.png"]
+    assert first_done == [False]
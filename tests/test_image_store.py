@@ -0,0 +1,52 @@
+"""Bringing pictures into the images folder."""
+
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import image_store
+
+
+@pytest.fixture(autouse=True)
+def images_dir(tmp_path, monkeypatch):
+    folder = tmp_path / "images"
+    folder.mkdir()
+    monkeypatch.setattr(image_store, "IMAGES_DIR", folder)
+    return folder
+
+
+def test_parallel_imports_of_the_same_pictures(tmp_path, images_dir, monkeypatch):
+    copyfile = shutil.copyfile
+
+    def slow_copyfile(*args, **kwargs):
+        # Keep each copy unfinished a while, so imports overlap
+        result = copyfile(*args, **kwargs)
+        time.sleep(0.02)
+        return result
+
+    monkeypatch.setattr(shutil, "copyfile", slow_copyfile)
+    originals = []
+    for n in range(2):
+        path = tmp_path / f"photo_{n}.png"
+        path.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes([n]) * 200_000)
+        originals.append(path)
+    copies = originals * 40
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        names = list(pool.map(image_store.import_image, copies))
+
+    expected = [image_store.content_name(image_store.file_hash(path), ".png") for path in originals]
+    assert names == expected * 40
+    assert sorted(path.name for path in images_dir.iterdir()) == sorted(expected)
+    for path in originals:
+        assert (images_dir / names[originals.index(path)]).read_bytes() == path.read_bytes()
+
+
+def test_import_keeps_a_copy_that_is_already_there(tmp_path, images_dir):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"\xff\xd8\xff" + b"x" * 1000)
+    name = image_store.import_image(path)
+    assert image_store.import_image(path) == name
+    assert [p.name for p in images_dir.iterdir()] == [name]
@@ -0,0 +1,81 @@
+"""Bulk importing items from CSV and JSONL files."""
+
+import pytest
+
+import image_store
+import inventory_import
+import inventory_manager
+import inventory_store
+
+
+@pytest.fixture(autouse=True)
+def images_dir(tmp_path, monkeypatch):
+    folder = tmp_path / "images"
+    folder.mkdir()
+    monkeypatch.setattr(image_store, "IMAGES_DIR", folder)
+    return folder
+
+
+def test_csv_rows_are_checked(tmp_path, images_dir):
+    (tmp_path / "owl.png").write_bytes(b"\x89PNG\r\n\x1a\n" + b"o" * 100)
+    path = tmp_path / "critters.csv"
+    path.write_text(
+        "Title,Price,Description,Image,Sold\n"
+        "Blue dragon,$12.50,Scaly,owl.png,yes\n"
+        ",3,No title,,\n"
+        "Cat,three,,,\n"
+        "Frog,-1,,,\n"
+        "Owl,4,,missing.png,\n"
+        "Bee,2,,,maybe\n"
+        "Snail,1,,,\n", encoding='utf-8')
+
+    items, problems = inventory_import.read_items(path)
+
+    assert [(item.title, item.price, item.sold) for item in items] == [
+        ("Blue dragon", 12.5, True), ("Snail", 1.0, False)]
+    assert items[0].image == image_store.content_name(image_store.file_hash(tmp_path / "owl.png"), ".png")
+    assert (images_dir / items[0].image).exists()
+    assert problems == [
+        "line 3: title is missing",
+        "line 4: price 'three' is not a number",
+        "line 5: price must be positive",
+        "line 6: image 'missing.png' not found",
+        "line 7: sold should be yes or no, not 'maybe'",
+    ]
+
+
+def test_jsonl_rows_are_checked(tmp_path):
+    path = tmp_path / "critters.jsonl"
+    path.write_text(
+        '{"title": "Turtle", "price": 5, "sold": true}\n'
+        '\n'
+        '{"title": "Bee", "price": "2"\n'
+        '["not", "an", "object"]\n'
+        '{"title": "Horse", "price": true}\n', encoding='utf-8')
+
+    items, problems = inventory_import.read_items(path)
+
+    assert [(item.title, item.price, item.sold) for item in items] == [("Turtle", 5.0, True)]
+    assert [problem.split(":")[0] for problem in problems] == ["line 3", "line 4", "line 5"]
+    assert "not valid JSON" in problems[0]
+
+
+def test_other_files_are_refused(tmp_path):
+    with pytest.raises(ValueError):
+        inventory_import.read_items(tmp_path / "critters.xlsx")
+
+
+def test_bulk_import_saves_good_rows_and_reports_the_rest(storage, tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(inventory_manager, "generate_website_silent", lambda inventory: None)
+    path = tmp_path / "critters.csv"
+    path.write_text("title,price\nTurtle,5\nCat,\n", encoding='utf-8')
+    inventory = inventory_store.load_inventory()
+
+    assert inventory_manager.bulk_import(inventory, str(path)) == 1
+
+    out = capsys.readouterr().out
+    assert "Skipped line 3: price '' is not a number" in out
+    assert "Imported 1 items (1 problems)" in out
+    saved = inventory_store.load_inventory()
+    assert [item["title"] for item in saved["items"]] == ["Already there", "Turtle"]
+    assert saved.index.filter(low=5) == [saved["items"][1]]
@@ -0,0 +1,79 @@
+"""Looking items up through the inventory index."""
+
+import inventory_store
+from inventory_index import InventoryIndex
+from inventory_item import Item
+
+
+def make_items():
+    return [Item("a", "Red dragon", price=12.0), Item("b", "Blue frog", price=3.0, sold=True),
+            Item("c", "Green cat", price=7.5), Item("d", "Tiny owl", price=20.0)]
+
+
+def test_add_update_and_remove_keep_lookups_right():
+    items = make_items()
+    index = InventoryIndex(items)
+
+    index.add(Item("e", "Big bear", price=5.0))
+    items[0]["price"] = 30.0
+    items[2]["sold"] = True
+    index.update(items[0])
+    index.update(items[2])
+    removed = index.remove("b")
+
+    assert removed["id"] == "b" and "b" not in index
+    assert [item["id"] for item in items] == ["a", "c", "d", "e"]
+    assert [item["id"] for item in index.filter(low=10)] == ["d", "a"]
+    assert [item["id"] for item in index.filter(sold=False, high=25)] == ["e", "d"]
+    assert [item["id"] for item in index.sold()] == ["c"]
+    assert [item["id"] for item in index.search("bear")] == ["e"]
+
+
+def test_positions_follow_removals():
+    items = [Item(str(n), f"Critter {n}") for n in range(50)]
+    index = InventoryIndex(items)
+
+    for n in range(0, 50, 3):
+        index.remove(str(n))
+
+    for i, item in enumerate(items):
+        assert index.position(item["id"]) == i
+
+
+def test_search_follows_edits():
+    items = make_items()
+    index = InventoryIndex(items)
+    assert index.search("frog") == [items[1]]
+
+    items[2]["title"] = "Green frog"
+    index.update(items[2])
+
+    assert index.search("frog") == [items[1], items[2]]
+
+
+def test_saving_an_appended_item_indexes_it(storage):
+    inventory = inventory_store.load_inventory()
+    inventory.index  # built before the item is added
+    item = Item("new", "Spotted newt", price=4.0)
+    inventory["items"].append(item)
+
+    inventory_store.save_item(inventory, item, "add")
+    item["price"] = 9.0
+    inventory_store.save_item(inventory, item)
+
+    assert [entry["id"] for entry in inventory["items"]] == ["start", "new"]
+    assert inventory.index.position("new") == 1
+    assert inventory.index.filter(low=8) == [item]
+
+
+def test_saving_keeps_the_list_and_index_in_step(storage):
+    inventory = inventory_store.load_inventory()
+    item = Item("new", "Spotted newt", price=4.0)
+
+    inventory_store.save_item(inventory, item, "add")  # appends it
+    inventory_store.delete_item(inventory, "start")
+
+    assert inventory["items"] == [item]
+    assert inventory.index.get("start") is None
+    assert inventory.index.position("new") == 0
+    assert inventory_store.load_inventory()["items"] == [item]
@@ -0,0 +1,43 @@
+"""Saving changes to the journal and reading them back."""
+
+import inventory_store
+from inventory_item import Item
+
+
+def ids(inventory):
+    return [item["id"] for item in inventory["items"]]
+
+
+def test_journal_is_replayed_on_load(storage):
+    inventory = inventory_store.load_inventory()
+    frog = Item("frog", "Blue frog", price=4.0)
+    inventory_store.save_item(inventory, frog, "add")
+    frog["sold"] = True
+    inventory_store.save_item(inventory, frog, "toggle")
+    owl = Item("owl", "Tiny owl")
+    inventory_store.mark_dirty(inventory, owl, "add")
+    inventory_store.mark_dirty(inventory, inventory.index.get("start"), "remove")
+    inventory_store.flush_changes(inventory)  # one batch line
+
+    lines = inventory_store.INVENTORY_JOURNAL.read_text().splitlines()
+    loaded = inventory_store.load_inventory()
+
+    assert len(lines) == 3
+    assert ids(loaded) == ["frog", "owl"]
+    assert loaded.index.get("frog")["sold"] is True
+    assert ids(inventory_store.load_json()) == ["start"]  # not compacted yet
+
+
+def test_torn_last_line_is_cut_off(storage):
+    inventory = inventory_store.load_inventory()
+    inventory_store.save_item(inventory, Item("frog", "Blue frog"), "add")
+    good = inventory_store.INVENTORY_JOURNAL.read_bytes()
+    with open(inventory_store.INVENTORY_JOURNAL, 'ab') as f:
+        f.write(b'{"op":"add","item":{"id":"half')  # a crash mid-write
+
+    loaded = inventory_store.load_inventory()
+
+    assert ids(loaded) == ["start", "frog"]
+    assert inventory_store.INVENTORY_JOURNAL.read_bytes() == good
+    inventory_store.save_item(loaded, Item("owl", "Tiny owl"), "add")
+    assert ids(inventory_store.load_inventory()) == ["start", "frog", "owl"]
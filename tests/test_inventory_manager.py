@@ -0,0 +1,32 @@
+"""Saving changes through inventory_manager."""
+
+import inventory_manager
+import inventory_store
+from inventory_item import Item
+
+
+def test_session_changes_reach_the_indexes(storage):
+    with inventory_manager.inventory_session(update_website=False) as inv:
+        inventory_manager.save_item(inv, Item("frog", "Blue toad", price=8.0), op="add")
+        for item in inv["items"]:
+            item["price"] = item["price"] * 3
+            inventory_manager.save_item(inv, item)
+        inv.index.get("frog")["title"] = "Green frog"
+        inventory_manager.save_item(inv, inv.index.get("frog"))
+
+    assert [item["id"] for item in inv.index.filter(low=20)] == ["frog"]
+    assert [item["id"] for item in inventory_store.search(inv, "frog")] == ["frog"]
+
+
+def test_saved_search_index_matches_the_saved_items(storage):
+    inv = inventory_store.load_inventory()
+    inventory_store.search(inv, "frog")  # builds the search index
+    frog = Item("frog", "Green frog")
+    inventory_manager.save_item(inv, frog, op="add", update_website=False)
+    inventory_manager.delete_item(inv, inv.index.get("start"), update_website=False)
+
+    inventory_store.export_json(inv)  # saves the search index too
+
+    again = inventory_store.load_inventory()
+    assert [item["id"] for item in inventory_store.search(again, "frog")] == ["frog"]
+    assert inventory_store.search(again, "already") == []
@@ -0,0 +1,75 @@
+"""Finding items by the words in them."""
+
+import pytest
+
+import inventory_search
+import inventory_store
+from inventory_item import Item
+from inventory_search import SearchIndex
+
+ITEMS = [
+    Item("a", "Blue Butterfly", "Wings of 3D-printed PLA"),
+    Item("b", "Bumble bee", "A blue and yellow buzzer"),
+    Item("c", "Sea horse", "Curly tail"),
+]
+
+
+def test_words_match_as_prefixes():
+    index = SearchIndex.build(ITEMS)
+
+    assert index.query("butt") == {"a"}
+    assert index.query("BLUE") == {"a", "b"}
+    assert index.query("blue bu") == {"a", "b"}
+    assert index.query("blue wing") == {"a"}
+    assert index.query("3d pla") == {"a"}
+    assert index.query("horse wings") == set()
+    assert index.query("  ...  ") == set()
+
+
+def test_edits_are_followed():
+    index = SearchIndex.build(ITEMS)
+    index.update(Item("c", "Sea dragon", "Curly tail"))
+    index.remove("b")
+    index.add(Item("d", "Dragonfly"))
+
+    assert index.query("drag") == {"c", "d"}
+    assert index.query("horse") == set()
+    assert index.query("bumble") == set()
+    assert "horse" not in index.terms
+
+
+def test_saved_index_is_reloaded(storage, monkeypatch):
+    inventory = inventory_store.load_inventory()
+    for item in ITEMS:
+        inventory_store.save_item(inventory, item, "add")
+    assert [item["id"] for item in inventory_store.search(inventory, "blue")] == ["a", "b"]
+    inventory_store.export_json(inventory)  # saves inventory.search as well
+
+    def no_rebuild(items):
+        raise AssertionError("the saved index should have been used")
+
+    monkeypatch.setattr(SearchIndex, "build", no_rebuild)
+    loaded = inventory_store.load_inventory()
+
+    assert [item["id"] for item in inventory_store.search(loaded, "blue")] == ["a", "b"]
+    assert [item["id"] for item in inventory_store.search(loaded, "tail")] == ["c"]
+
+
+def test_stale_saved_index_is_not_used(storage):
+    inventory = inventory_store.load_inventory()
+    inventory_store.search(inventory, "anything")
+    inventory_store.export_json(inventory)
+    stamp = inventory_store.disk_version()
+    assert inventory_search.load(stamp) is not None
+
+    inventory_store.save_item(inventory, Item("frog", "Green frog"), "add")
+
+    assert inventory_search.load(inventory_store.disk_version()) is None
+    loaded = inventory_store.load_inventory()
+    assert [item["id"] for item in inventory_store.search(loaded, "frog")] == ["frog"]
+
+
+@pytest.mark.parametrize("text, words", [("Blue-ish CAT_toy", ["blue", "ish", "cat", "toy"]),
+                                         ("Café ✨ 42", ["café", "42"]), ("", [])])
+def test_tokenize(text, words):
+    assert inventory_search.tokenize(text) == words
@@ -0,0 +1,56 @@
+"""The binary snapshot of inventory.json."""
+
+import inventory_snapshot
+import inventory_store
+from inventory_item import Item
+from inventory_snapshot import SnapshotItems
+
+ITEMS = [
+    Item("a1", "Blue dragon", "Big, \"shiny\" ✨", 12.5, "dragon.png"),
+    Item("b2", "Cat", "", 3.0, None, True),
+    Item("c3", "Owl", extra={"tags": ["small"], "stock": 2}),
+]
+STAMP = ((1, 100), None)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "inventory.snapshot"
+    inventory_snapshot.write_snapshot(ITEMS, {"items": ITEMS, "google_drive_folder_id": "abc"},
+                                      STAMP, path)
+
+    items, meta = inventory_snapshot.open_snapshot(STAMP, path)
+
+    assert isinstance(items, SnapshotItems)
+    assert items[-1] == ITEMS[-1]
+    assert list(items) == ITEMS
+    assert meta == {"google_drive_folder_id": "abc"}
+    items.append(Item("d4", "Frog"))  # becomes a plain list
+    assert [item["id"] for item in items] == ["a1", "b2", "c3", "d4"]
+    items.materialize()
+
+
+def test_other_stamp_is_not_used(tmp_path):
+    path = tmp_path / "inventory.snapshot"
+    inventory_snapshot.write_snapshot(ITEMS, {}, STAMP, path)
+
+    assert inventory_snapshot.open_snapshot(((1, 101), None), path) is None
+    assert inventory_snapshot.open_snapshot(STAMP, tmp_path / "missing") is None
+
+
+def test_load_uses_the_snapshot_until_inventory_json_changes(storage):
+    inventory = inventory_store.load_inventory()
+    inventory_store.save_item(inventory, Item("frog", "Blue frog"), "add")
+    inventory_store.export_json(inventory)  # writes inventory.json and the snapshot
+
+    loaded = inventory_store.load_inventory()
+    assert isinstance(loaded["items"], SnapshotItems)
+    assert [item["id"] for item in loaded["items"]] == ["start", "frog"]
+    loaded["items"].materialize()
+
+    # Edited by hand (or by an older copy of the program)
+    inventory_store.save_json({"items": [Item("owl", "Tiny owl")], "google_drive_folder_id": "x"})
+
+    reloaded = inventory_store.load_inventory()
+    assert not isinstance(reloaded["items"], SnapshotItems)
+    assert [item["id"] for item in reloaded["items"]] == ["owl"]
+    assert reloaded["google_drive_folder_id"] == "x"
@@ -0,0 +1,79 @@
+"""Two programs sharing one inventory.json and journal."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import inventory_store
+from inventory_item import Item
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Saves one item from a separate Python process, with storage in argv[1]
+OTHER_PROGRAM = """
+import sys
+from pathlib import Path
+import inventory_search, inventory_snapshot, inventory_store
+from inventory_item import Item
+data = Path(sys.argv[1])
+inventory_store.INVENTORY_FILE = data / "inventory.json"
+inventory_store.INVENTORY_JOURNAL = data / "inventory.journal"
+inventory_store.INVENTORY_DB = data / "inventory.db"
+inventory_snapshot.SNAPSHOT_FILE = data / "inventory.snapshot"
+inventory_search.SEARCH_FILE = data / "inventory.search"
+inventory = inventory_store.load_inventory()
+item = Item(sys.argv[2], "From the other program")
+inventory["items"].append(item)
+inventory_store.save_item(inventory, item, "add")
+"""
+
+
+def save_elsewhere(storage, item_id):
+    subprocess.run([sys.executable, "-c", OTHER_PROGRAM, str(storage), item_id],
+                   cwd=ROOT, check=True)
+
+
+def add(inventory, item_id):
+    item = Item(item_id, "From this program")
+    inventory["items"].append(item)
+    inventory_store.save_item(inventory, item, "add")
+    return item
+
+
+def test_export_keeps_other_programs_changes(storage):
+    ours = inventory_store.load_inventory()
+    save_elsewhere(storage, "theirs")
+    add(ours, "ours")
+
+    inventory_store.export_json(ours)
+
+    saved = inventory_store.load_inventory()
+    assert [item["id"] for item in saved["items"]] == ["start", "theirs", "ours"]
+    assert [item["id"] for item in ours["items"]] == ["start", "theirs", "ours"]
+    assert not inventory_store.INVENTORY_JOURNAL.exists()
+
+
+def test_threshold_compaction_keeps_other_programs_changes(storage, monkeypatch):
+    monkeypatch.setattr(inventory_store, "COMPACT_EVERY", 3)
+    ours = inventory_store.load_inventory()
+    add(ours, "first")
+    save_elsewhere(storage, "theirs")
+    add(ours, "second")
+    add(ours, "third")  # folds the journal into inventory.json
+
+    assert not inventory_store.INVENTORY_JOURNAL.exists()
+    saved = inventory_store.load_json()
+    assert {item["id"] for item in saved["items"]} == {"start", "first", "theirs", "second", "third"}
+
+
+def test_compact_keeps_our_item_objects(storage):
+    ours = inventory_store.load_inventory()
+    start = ours["items"][0]
+    save_elsewhere(storage, "theirs")
+    mine = add(ours, "ours")
+
+    inventory_store.export_json(ours)
+
+    assert ours.index.get("start") is start
+    assert ours.index.get("ours") is mine
+    assert not inventory_store.changed_on_disk(ours)
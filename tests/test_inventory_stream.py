@@ -0,0 +1,59 @@
+"""Reading and writing inventory.json an item at a time."""
+
+import json
+
+import pytest
+
+import inventory_store
+import inventory_stream
+from inventory_item import Item, to_json
+
+ITEMS = [
+    Item("a1", "Blue dragon", "Scales: {shiny}, \"big\"", 12.5, "dragon.png"),
+    Item("b2", "Café cat ✨", "", 1e3, None, True),
+    Item("c3", "Owl", "line one\nline two", -0.25, extra={"tags": ["small", "brown"], "stock": 10}),
+    Item("d4", "Frog", price=7),
+]
+META = {"google_drive_folder_id": "abc123", "notes": {"x": [1, 2.5, None]}}
+
+
+def test_written_file_matches_json_dump(tmp_path):
+    path = tmp_path / "inventory.json"
+
+    count = inventory_stream.write_json(iter(ITEMS), META, path)
+
+    assert count == len(ITEMS)
+    assert path.read_text() == json.dumps(dict(items=ITEMS, **META), indent=2, default=to_json)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_small_chunks_read_back_the_same(tmp_path, monkeypatch, chunk_size):
+    path = tmp_path / "inventory.json"
+    inventory_stream.write_json(ITEMS, META, path)
+    monkeypatch.setattr(inventory_stream, "CHUNK_SIZE", chunk_size)
+    meta = {}
+
+    items = list(inventory_stream.iter_json_items(path, meta))
+
+    assert items == ITEMS
+    assert meta == META
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5])
+def test_empty_inventory(tmp_path, monkeypatch, chunk_size):
+    path = tmp_path / "inventory.json"
+    inventory_stream.write_json([], {"google_drive_folder_id": ""}, path)
+    monkeypatch.setattr(inventory_stream, "CHUNK_SIZE", chunk_size)
+
+    assert list(inventory_stream.iter_json_items(path)) == []
+    assert inventory_stream.read_meta(path) == {"google_drive_folder_id": ""}
+
+
+def test_iter_items_applies_the_journal(storage, monkeypatch):
+    monkeypatch.setattr(inventory_stream, "CHUNK_SIZE", 4)
+    inventory = inventory_store.load_inventory()
+    frog = Item("frog", "Blue frog")
+    inventory_store.save_item(inventory, frog, "add")
+    inventory_store.delete_item(inventory, "start")
+
+    assert list(inventory_stream.iter_items()) == [frog]
@@ -0,0 +1,66 @@
+"""Building the website into a folder."""
+
+from PIL import Image
+
+import image_store
+import website_builder
+from inventory_item import Item
+
+
+def test_builds_keep_to_their_own_derivatives(tmp_path, monkeypatch):
+    masters = tmp_path / "images"
+    masters.mkdir()
+    Image.new("RGB", (800, 600), "teal").save(masters / "kitty.png")
+    monkeypatch.setattr(image_store, "IMAGES_DIR", masters)
+    shop, throwaway = tmp_path / "shop", tmp_path / "throwaway"
+    shop.mkdir()
+    throwaway.mkdir()
+
+    website_builder.build_website([Item("kitty", "Kitty", image="kitty.png")], shop, workers=1)
+    made = sorted(path.name for path in (shop / "images" / "derived").iterdir())
+    website_builder.build_website([], throwaway, workers=1)
+
+    assert any(name.endswith(".webp") for name in made)
+    assert sorted(path.name for path in (shop / "images" / "derived").iterdir()) == made
+    assert 'images/derived/kitty-' in (shop / "index.html").read_text(encoding='utf-8')
+
+
+def critters(count):
+    return [Item(f"c{n}", f"Critter {n}", price=float(n)) for n in range(count)]
+
+
+def test_single_process_build_renders_a_batch_at_a_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(website_builder, "SHARD_BATCH", 5)
+    render_shards = website_builder._render_shards
+    batches = []
+
+    def spy(shards):
+        batches.append(len(shards))
+        return render_shards(shards)
+
+    monkeypatch.setattr(website_builder, "_render_shards", spy)
+
+    website_builder.build_website(critters(30), tmp_path, per_page=4, workers=1)
+
+    assert max(batches) <= 5
+    assert sum(batches) == 30 + 2 * 8  # item pages, listing pages and catalog chunks
+    assert len(list((tmp_path / "items").iterdir())) == 30
+
+
+def test_rebuild_only_hashes_changed_cards(tmp_path, monkeypatch):
+    items = critters(20)
+    website_builder.build_website(items, tmp_path, per_page=4, workers=1)
+    items[7].sold = True
+    digest = website_builder._digest
+    hashed = []
+
+    def spy(payload):
+        hashed.append(payload)
+        return digest(payload)
+
+    monkeypatch.setattr(website_builder, "_digest", spy)
+
+    website_builder.build_website(items, tmp_path, per_page=4, workers=1)
+
+    assert [payload[0] for payload in hashed if len(payload) == 7] == ["c7"]
+    assert 'sold' in (tmp_path / "items" / "c7.html").read_text(encoding='utf-8').lower()
@@ -0,0 +1,692 @@
+"""
+3Doodle Critters Website Builder
+================================
+Builds the website from the inventory; used by both the menu and the GUI.
+
+The shop is split into shards:
+  - listing pages of ITEMS_PER_PAGE items each: index.html, page-2.html,
+    page-3.html, ... with links between them
+  - a small page per item in items/<id>.html
+  - catalog-0001.json, catalog-0002.json, ... holding the same items as
+    each listing page, using the inventory's field names. Each listing
+    page shows its own items straight away and fetches the following
+    chunks as the visitor scrolls, so the first download stays the same
+    size however big the shop gets; the page links still work without
+    JavaScript.
+  - sitemap.xml listing all of the pages (using the address in CNAME)
+
+Pictures are shown from resized copies (see image_derivatives) through
+srcset/sizes, with their width and height set so the layout doesn't jump
+while they load.
+
+website.manifest.json remembers a digest of what went into every shard,
+so a build only renders the shards whose items changed and deletes the
+ones that are no longer needed. Each card's digest is also kept in memory
+between builds (the menu and the GUI rebuild after every save), so an
+unchanged item isn't hashed again either. When many shards need rendering
+(a first build, or a big import) they are spread over a process pool.
+
+Every file is streamed to a .tmp file next to it and renamed into place,
+so visitors never see a half-written page, and an identical file is left
+untouched. The page shell is split around its placeholders once, when the
+module is imported.
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import image_derivatives
+from file_utils import atomic_write
+from inventory_item import FIELDS, Item
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+WEBSITE_FILE = SCRIPT_DIR / "index.html"
+ITEM_PAGES_DIR = "items"
+DERIVED_DIR = "images/derived"
+SITEMAP_FILE = "sitemap.xml"
+MANIFEST_FILE = "website.manifest.json"
+
+ITEMS_PER_PAGE = 48
+
+# Processes used to render shards (None = one per CPU)
+WEBSITE_WORKERS = None
+# Shards handed to a worker at a time. Fewer changed shards than this are
+# rendered right here: starting a process pool would take longer.
+SHARD_BATCH = 256
+
+# Bytes buffered before each write to a temporary file
+WRITE_BUFFER = 256 * 1024
+
+# How wide pictures are drawn, for the browser to choose a derivative
+CARD_SIZES = "(max-width: 640px) 100vw, 380px"
+ITEM_PAGE_SIZES = "(max-width: 640px) 100vw, 540px"
+
+# card data -> its digest, for the cards of the last build in this process
+_card_digests = {}
+
+NO_PRODUCTS_HTML = '''
+                <div class="no-products">
+                    <p>New items coming soon! Check back later.</p>
+                </div>
+'''
+
+
+def card_data(item, derivatives=None):
+    """The item fields the site shows, as a plain tuple.
+
+    (id, title, description, price, image, sold, picture) - cheap to
+    compare, hash and send to a worker process. picture is what
+    DerivativeCache.picture returns for the image, or None.
+    """
+    if type(item) is Item:
+        # Attribute access is much quicker than the dict-style interface
+        card = (item.id, item.title, item.description, item.price, item.image, bool(item.sold))
+    else:
+        card = (item["id"], item["title"], item["description"], item["price"],
+                item.get("image"), bool(item.get("sold", False)))
+    picture = derivatives.picture(card[4]) if derivatives is not None else None
+    return card + (picture,)
+
+
+def _srcset(prefix, variants):
+    return ", ".join(f"{prefix}{DERIVED_DIR}/{name} {width}w" for width, name in variants)
+
+
+def picture_srcsets(picture, prefix=""):
+    """(webp srcset, jpeg srcset, fallback src) for a picture tuple."""
+    _width, _height, webp, jpeg = picture
+    fallback = next((name for width, name in jpeg if width >= 640), jpeg[-1][1])
+    return _srcset(prefix, webp), _srcset(prefix, jpeg), f"{prefix}{DERIVED_DIR}/{fallback}"
+
+
+def render_image(image, picture, title, sizes, prefix=""):
+    """An <img> for the item's picture, using derivatives when there are some."""
+    if not image:
+        return '<div class="no-image">No Image</div>'
+    if picture is None:
+        return f'<img src="{prefix}images/{image}" alt="{title}">'
+    webp, jpeg, fallback = picture_srcsets(picture, prefix)
+    width, height = picture[0], picture[1]
+    return (f'<picture><source type="image/webp" srcset="{webp}" sizes="{sizes}">'
+            f'<img src="{fallback}" srcset="{jpeg}" sizes="{sizes}" '
+            f'width="{width}" height="{height}" alt="{title}" loading="lazy"></picture>')
+
+
+def render_card(card):
+    """The HTML for one product card on a listing page."""
+    item_id, title, description, price, image, sold, picture = card
+    sold_class = "sold" if sold else ""
+    sold_badge = '<span class="sold-badge">SOLD</span>' if sold else ""
+    image_html = render_image(image, picture, title, CARD_SIZES)
+
+    return f'''
+                <div class="product-card {sold_class}">
+                    <div class="product-image">
+                        {image_html}
+                        {sold_badge}
+                    </div>
+                    <div class="product-info">
+                        <h3><a href="{ITEM_PAGES_DIR}/{item_id}.html">{title}</a></h3>
+                        <p>{description}</p>
+                        <span class="price">${price:.2f}</span>
+                    </div>
+                </div>
+'''
+
+
+def page_name(page_no):
+    """File name of a listing page (page 1 is the home page)."""
+    return "index.html" if page_no == 1 else f"page-{page_no}.html"
+
+
+def catalog_name(page_no):
+    """File name of the JSON chunk holding a listing page's items."""
+    return f"catalog-{page_no:04d}.json"
+
+
+def render_pagination(page_no, has_next):
+    """Links to the previous and next listing pages.
+
+    data-next names the next JSON chunk, for the script that loads more
+    items on scroll.
+    """
+    if page_no == 1 and not has_next:
+        return ""
+    links = []
+    if page_no > 1:
+        links.append(f'<a href="{page_name(page_no - 1)}#products" rel="prev">&larr; Previous</a>')
+    links.append(f'<span>Page {page_no}</span>')
+    next_chunk = ""
+    if has_next:
+        links.append(f'<a href="{page_name(page_no + 1)}#products" rel="next">Next &rarr;</a>')
+        next_chunk = f' data-next="{catalog_name(page_no + 1)}"'
+    return f'            <nav class="pagination"{next_chunk}>{" ".join(links)}</nav>\n'
+
+
+def render_listing(page_no, has_next, cards):
+    """Yield the pieces of a listing page."""
+    yield PAGE_HEAD
+    for card in cards:
+        yield render_card(card)
+    if not cards:
+        yield NO_PRODUCTS_HTML
+    yield PAGE_MIDDLE
+    yield render_pagination(page_no, has_next)
+    yield PAGE_TAIL
+
+
+def _catalog_item(card):
+    """An item for a JSON chunk: the inventory fields, plus srcsets."""
+    item = dict(zip(FIELDS, card))
+    picture = card[-1]
+    if picture is not None:
+        webp, jpeg, fallback = picture_srcsets(picture)
+        item["picture"] = {"width": picture[0], "height": picture[1],
+                           "webp": webp, "jpeg": jpeg, "src": fallback}
+    return item
+
+
+def render_catalog(page_no, has_next, cards):
+    """Yield the JSON chunk for a listing page's items."""
+    chunk = {
+        "page": page_no,
+        "next": catalog_name(page_no + 1) if has_next else None,
+        "items": [_catalog_item(card) for card in cards],
+    }
+    yield json.dumps(chunk, ensure_ascii=False, separators=(',', ':'))
+
+
+def render_item_page(card):
+    """Yield the pieces of an item's own page."""
+    item_id, title, description, price, image, sold, picture = card
+    image_html = render_image(image, picture, title, ITEM_PAGE_SIZES, prefix="../")
+    status = '<span class="sold-badge">SOLD</span>' if sold else ""
+    yield ITEM_PAGE_HEAD
+    yield f'''    <title>{title} | 3Doodle Critters</title>
+</head>
+<body>
+    <header><a href="../index.html">3Doodle Critters</a></header>
+    <main>
+        <div class="product-image">
+            {image_html}
+            {status}
+        </div>
+        <h1>{title}</h1>
+        <p>{description}</p>
+        <p class="price">${price:.2f}</p>
+        <p>Want it? Email <a href="mailto:Mira@3DoodleCritters.com">Mira@3DoodleCritters.com</a></p>
+        <p><a href="../index.html#products">&larr; Back to the shop</a></p>
+    </main>
+</body>
+</html>
+'''
+
+
+def write_if_changed(path, pieces):
+    """Stream pieces of text to path via a temporary file.
+
+    The temporary file replaces path only if it differs. Returns True if
+    path was written.
+    """
+    path = Path(path)
+    with atomic_write(path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+            for piece in pieces:
+                f.write(piece)
+        if path.exists() and filecmp.cmp(tmp_path, path, shallow=False):
+            os.remove(tmp_path)  # nothing changed; leave the old file untouched
+            return False
+    return True
+
+
+def _render_shards(shards):
+    """Render and write a batch of (kind, path, payload) shards."""
+    for kind, path, payload in shards:
+        if kind == "page":
+            write_if_changed(path, render_listing(*payload))
+        elif kind == "catalog":
+            write_if_changed(path, render_catalog(*payload))
+        else:
+            write_if_changed(path, render_item_page(payload))
+    return len(shards)
+
+
+def _iter_shards(items, per_page, derivatives=None):
+    """Yield (kind, relative path, payload) for every shard of the site.
+
+    Works from any iterable, holding only two pages of items at a time.
+    """
+    items = iter(items)
+    page = [card_data(item, derivatives) for item in islice(items, per_page)]
+    page_no = 1
+    while True:
+        following = [card_data(item, derivatives) for item in islice(items, per_page)]
+        listing = (page_no, bool(following), tuple(page))
+        yield "page", page_name(page_no), listing
+        yield "catalog", catalog_name(page_no), listing
+        for card in page:
+            yield "item", f"{ITEM_PAGES_DIR}/{card[0]}.html", card
+        if not following:
+            return
+        page = following
+        page_no += 1
+
+
+def _digest(payload):
+    return hashlib.blake2b(repr(payload).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _shard_digest(kind, payload, digests):
+    """The manifest digest for a shard, from the digests of its cards.
+
+    digests maps card data to its digest and is filled in as cards are
+    hashed; cards found in _card_digests aren't hashed again.
+    """
+    if kind == "item":
+        cards = (payload,)
+    else:
+        page_no, has_next, cards = payload
+    card_digests = []
+    for card in cards:
+        digest = digests.get(card)
+        if digest is None:
+            digest = digests[card] = _card_digests.get(card) or _digest(card)
+        card_digests.append(digest)
+    if kind == "item":
+        return card_digests[0]
+    return _digest((page_no, has_next, card_digests))
+
+
+def _existing_pages(site_dir):
+    """Relative paths of the pages and catalog chunks already in site_dir."""
+    found = set()
+    for folder, prefix in ((site_dir, ""), (site_dir / ITEM_PAGES_DIR, ITEM_PAGES_DIR + "/")):
+        with os.scandir(folder) as entries:
+            found.update(prefix + entry.name for entry in entries)
+    return found
+
+
+def _template_digest():
+    """Changes whenever the page templates do, forcing a full rebuild."""
+    return _digest((PAGE_TEMPLATE, ITEM_PAGE_HEAD, render_card(("id", "t", "d", 0.0, "i", True, (9, 9, ((9, "w"),), ((9, "j"),)))),
+                    ITEMS_PER_PAGE))
+
+
+def _load_manifest(site_dir):
+    try:
+        with open(site_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("template") != _template_digest():
+        return {}
+    return manifest.get("shards", {})
+
+
+def _save_manifest(site_dir, shards):
+    # json.dumps uses the C encoder; json.dump would not
+    text = json.dumps({"template": _template_digest(), "shards": shards}, separators=(',', ':'))
+    with atomic_write(site_dir / MANIFEST_FILE) as tmp_path, \
+            open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def site_url(site_dir=SCRIPT_DIR):
+    """The site's address from CNAME (e.g. https://example.com/), or None."""
+    try:
+        domain = (Path(site_dir) / "CNAME").read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+    return f"https://{domain}/" if domain else None
+
+
+def _sitemap(base_url, paths):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for path in paths:
+        loc = base_url if path == "index.html" else base_url + path
+        yield f"  <url><loc>{loc}</loc></url>\n"
+    yield "</urlset>\n"
+
+
+def build_website(items, site_dir=SCRIPT_DIR, per_page=ITEMS_PER_PAGE, workers=WEBSITE_WORKERS):
+    """Build or update the website for any iterable of items.
+
+    Only shards that changed since the last build (or are missing) are
+    rendered. Picture derivatives go in site_dir's own images/derived, and
+    only those are pruned, so a build elsewhere (a benchmark, say) never
+    deletes the shop's. Returns the number of items in the shop.
+    """
+    global _card_digests
+    site_dir = Path(site_dir)
+    (site_dir / ITEM_PAGES_DIR).mkdir(exist_ok=True)
+    previous = _load_manifest(site_dir)
+    existing = _existing_pages(site_dir) if previous else set()
+    derivatives = image_derivatives.DerivativeCache(site_dir / DERIVED_DIR)
+    shards = {}
+    digests = {}
+    count = 0
+    batch = []
+    pool = None
+    running = []
+    try:
+        for kind, relative, payload in _iter_shards(items, per_page, derivatives):
+            if kind == "item":
+                count += 1
+            digest = shards[relative] = _shard_digest(kind, payload, digests)
+            if previous.get(relative) == digest and relative in existing:
+                continue
+            batch.append((kind, str(site_dir / relative), payload))
+            if len(batch) < SHARD_BATCH:
+                continue
+            if workers == 1:
+                _render_shards(batch)
+                batch = []
+                continue
+            # Plenty to do: render batches in other processes while we go on
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+            running.append(pool.submit(_render_shards, batch))
+            batch = []
+            if len(running) > 2 * (workers or os.cpu_count() or 1):
+                running.pop(0).result()  # don't queue up the whole site
+        _render_shards(batch)
+        _card_digests = digests  # only this build's cards are kept
+        for future in running:
+            future.result()
+        derivatives.prune()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        derivatives.save()
+
+    for relative in previous.keys() - shards.keys():
+        try:
+            os.remove(site_dir / relative)
+        except FileNotFoundError:
+            pass
+
+    base_url = site_url(site_dir)
+    if base_url:
+        pages = (path for path in shards if path.endswith(".html"))
+        write_if_changed(site_dir / SITEMAP_FILE, _sitemap(base_url, pages))
+    if shards != previous:
+        _save_manifest(site_dir, shards)
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Page templates. In PAGE_TEMPLATE {products} marks where the product cards
+# go and {pagination} the page links; nothing else in it is a placeholder,
+# so CSS braces need no escaping.
+# ---------------------------------------------------------------------------
+
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>3Doodle Critters | Handmade 3D Pen Art</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Fredoka+One&family=Nunito:wght@400;600;700&display=swap" rel="stylesheet">
+    <style>
+        :root {
+            --purple: #9B59B6;
+            --purple-dark: #7D3C98;
+            --teal: #1ABC9C;
+            --teal-dark: #16A085;
+            --pink: #FF6B9D;
+            --pink-light: #FFB8D0;
+            --yellow: #FFDC50;
+            --cream: #FFF9F0;
+            --text-dark: #2C3E50;
+        }
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: 'Nunito', sans-serif; background: var(--cream); color: var(--text-dark); line-height: 1.6; }
+        .bg-decoration { position: fixed; top: 0; left: 0; width: 100%; height: 100%; pointer-events: none; z-index: -1; overflow: hidden; }
+        .bg-decoration::before, .bg-decoration::after { content: ''; position: absolute; border-radius: 50%; opacity: 0.1; }
+        .bg-decoration::before { width: 400px; height: 400px; background: var(--purple); top: -100px; right: -100px; }
+        .bg-decoration::after { width: 300px; height: 300px; background: var(--teal); bottom: -50px; left: -50px; }
+        header { background: linear-gradient(135deg, var(--yellow) 0%, #3498DB 50%, var(--purple) 100%); padding: 2rem 1rem; text-align: center; }
+        h1 { font-family: 'Fredoka One', cursive; font-size: 3rem; color: white; text-shadow: 3px 3px 0 rgba(0,0,0,0.2); margin-bottom: 0.5rem; }
+        .tagline { font-size: 1.3rem; color: white; opacity: 0.95; font-weight: 600; }
+        nav { background: white; padding: 1rem; box-shadow: 0 2px 10px rgba(0,0,0,0.1); position: sticky; top: 0; z-index: 100; }
+        nav ul { list-style: none; display: flex; justify-content: center; flex-wrap: wrap; gap: 1rem; }
+        nav a { text-decoration: none; color: var(--purple-dark); font-weight: 700; padding: 0.5rem 1.5rem; border-radius: 25px; transition: all 0.3s ease; }
+        nav a:hover { background: var(--purple); color: white; }
+        main { max-width: 1200px; margin: 0 auto; padding: 2rem 1rem; }
+        section { margin-bottom: 4rem; }
+        h2 { font-family: 'Fredoka One', cursive; font-size: 2.2rem; color: var(--purple); text-align: center; margin-bottom: 2rem; }
+        h2::after { content: ''; display: block; width: 80px; height: 4px; background: linear-gradient(90deg, var(--teal), var(--pink)); margin: 0.5rem auto 0; border-radius: 2px; }
+        .welcome { background: white; border-radius: 20px; padding: 2.5rem; text-align: center; box-shadow: 0 5px 20px rgba(155, 89, 182, 0.15); border: 3px solid var(--pink-light); }
+        .welcome p { font-size: 1.2rem; max-width: 700px; margin: 0 auto; }
+        .welcome .highlight { color: var(--purple); font-weight: 700; }
+        .products-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 2rem; }
+        .product-card { background: white; border-radius: 20px; overflow: hidden; box-shadow: 0 5px 20px rgba(0,0,0,0.1); transition: transform 0.3s ease, box-shadow 0.3s ease; }
+        .product-card:hover { transform: translateY(-5px); box-shadow: 0 10px 30px rgba(155, 89, 182, 0.2); }
+        .product-card.sold { opacity: 0.7; }
+        .product-image { width: 100%; height: 250px; background: linear-gradient(135deg, var(--pink-light) 0%, #E8DAEF 100%); display: flex; align-items: center; justify-content: center; position: relative; overflow: hidden; }
+        .product-image img { width: 100%; height: 100%; object-fit: cover; }
+        .product-image picture { display: block; width: 100%; height: 100%; }
+        .product-image .no-image { color: var(--purple); font-weight: 600; }
+        .sold-badge { position: absolute; top: 15px; right: -35px; background: var(--pink); color: white; padding: 5px 40px; font-weight: 700; transform: rotate(45deg); font-size: 0.9rem; }
+        .product-info { padding: 1.5rem; }
+        .product-info h3 { font-family: 'Fredoka One', cursive; color: var(--teal-dark); font-size: 1.3rem; margin-bottom: 0.5rem; }
+        .product-info h3 a { color: inherit; text-decoration: none; }
+        .product-info p { color: #666; margin-bottom: 1rem; min-height: 3rem; }
+        .price { font-family: 'Fredoka One', cursive; font-size: 1.5rem; color: var(--pink); }
+        .no-products { text-align: center; padding: 3rem; color: var(--purple); font-size: 1.2rem; }
+        .pagination { display: flex; justify-content: center; align-items: center; gap: 1rem; margin-top: 2rem; font-weight: 700; color: var(--purple-dark); }
+        .pagination a { background: white; color: var(--purple-dark); text-decoration: none; padding: 0.5rem 1.5rem; border-radius: 25px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .pagination a:hover { background: var(--purple); color: white; }
+        .order-steps { display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 2rem; }
+        .step { background: white; border-radius: 20px; padding: 2rem; text-align: center; box-shadow: 0 5px 20px rgba(0,0,0,0.08); border-top: 5px solid var(--teal); }
+        .step-number { width: 50px; height: 50px; background: linear-gradient(135deg, var(--purple), var(--pink)); color: white; border-radius: 50%; display: flex; align-items: center; justify-content: center; font-family: 'Fredoka One', cursive; font-size: 1.5rem; margin: 0 auto 1rem; }
+        .step h3 { color: var(--purple-dark); margin-bottom: 0.5rem; }
+        .payment-options { display: flex; flex-wrap: wrap; justify-content: center; gap: 1.5rem; margin-top: 1.5rem; }
+        .payment-option { background: white; padding: 1.5rem 2rem; border-radius: 15px; box-shadow: 0 3px 15px rgba(0,0,0,0.08); text-align: center; min-width: 150px; }
+        .payment-option .icon { font-size: 2.5rem; margin-bottom: 0.5rem; }
+        .payment-option h4 { color: var(--teal-dark); font-weight: 700; }
+        .delivery-options { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 2rem; margin-top: 1.5rem; }
+        .delivery-card { background: white; border-radius: 20px; padding: 2rem; text-align: center; box-shadow: 0 5px 20px rgba(0,0,0,0.08); border-left: 5px solid var(--pink); }
+        .delivery-card .icon { font-size: 3rem; margin-bottom: 1rem; }
+        .delivery-card h3 { color: var(--purple-dark); margin-bottom: 0.5rem; }
+        .contact-box { background: linear-gradient(135deg, var(--yellow) 0%, #3498DB 50%, var(--purple) 100%); border-radius: 20px; padding: 3rem; text-align: center; color: white; }
+        .contact-box h2 { color: white; }
+        .contact-box h2::after { background: white; }
+        .contact-box p { font-size: 1.2rem; margin-bottom: 1.5rem; }
+        .contact-email { display: inline-block; background: white; color: var(--purple-dark); font-family: 'Fredoka One', cursive; font-size: 1.3rem; padding: 1rem 2rem; border-radius: 30px; text-decoration: none; transition: transform 0.3s ease; }
+        .contact-email:hover { transform: scale(1.05); }
+        footer { background: var(--text-dark); color: white; text-align: center; padding: 2rem; margin-top: 2rem; }
+        footer p { opacity: 0.8; }
+        .footer-hearts { font-size: 1.5rem; margin-bottom: 0.5rem; }
+        @media (max-width: 768px) { h1 { font-size: 2rem; } .tagline { font-size: 1rem; } h2 { font-size: 1.8rem; } nav ul { gap: 0.5rem; } nav a { padding: 0.4rem 1rem; font-size: 0.9rem; } }
+    </style>
+</head>
+<body>
+    <div class="bg-decoration"></div>
+    <header>
+        <div class="logo">
+            <h1>3Doodle Critters</h1>
+            <p class="tagline">Handmade 3D Pen Art</p>
+        </div>
+    </header>
+    <nav>
+        <ul>
+            <li><a href="#welcome">Home</a></li>
+            <li><a href="#products">Shop</a></li>
+            <li><a href="#how-to-order">How to Order</a></li>
+            <li><a href="#payment">Payment</a></li>
+            <li><a href="#contact">Contact</a></li>
+        </ul>
+    </nav>
+    <main>
+        <section id="welcome" class="welcome">
+            <h2>Welcome!</h2>
+            <p>Hi! I'm <span class="highlight">Mira</span>, and I make cute animals and fun creations using a <span class="highlight">3D printing pen</span>! Each piece is carefully crafted by hand, making every 3Doodle unique and special. Check out my critters below and take one home today!</p>
+        </section>
+        <section id="products">
+            <h2>My Creations</h2>
+            <div class="products-grid">
+{products}
+            </div>
+{pagination}        </section>
+        <section id="how-to-order">
+            <h2>How to Order</h2>
+            <div class="order-steps">
+                <div class="step"><div class="step-number">1</div><h3>Pick Your Critters</h3><p>Browse the shop and decide which 3Doodles you'd like!</p></div>
+                <div class="step"><div class="step-number">2</div><h3>Send a Message</h3><p>Email us with what you want to order and how you'd like to receive it.</p></div>
+                <div class="step"><div class="step-number">3</div><h3>Get Your Critters!</h3><p>Pick up locally or have them shipped to you!</p></div>
+            </div>
+        </section>
+        <section id="delivery">
+            <h2>Delivery Options</h2>
+            <div class="delivery-options">
+                <div class="delivery-card"><div class="icon">🏠</div><h3>Local Pickup</h3><p>Pick up your 3Doodles in person! Free for neighbors and local orders.</p></div>
+                <div class="delivery-card"><div class="icon">📦</div><h3>Shipping</h3><p>We can ship your critters anywhere! Shipping cost depends on location.</p></div>
+            </div>
+        </section>
+        <section id="payment">
+            <h2>Payment Options</h2>
+            <p style="text-align: center; margin-bottom: 1rem;">We accept several easy ways to pay:</p>
+            <div class="payment-options">
+                <div class="payment-option"><div class="icon">💵</div><h4>Cash</h4><p>For local pickup</p></div>
+                <div class="payment-option"><div class="icon">🅿️</div><h4>PayPal</h4><p>Safe & easy online</p></div>
+                <div class="payment-option"><div class="icon">💳</div><h4>Venmo</h4><p>Quick mobile payment</p></div>
+                <div class="payment-option"><div class="icon">💳</div><h4>Card</h4><p>Via Stripe</p></div>
+            </div>
+        </section>
+        <section id="contact">
+            <div class="contact-box">
+                <h2>Ready to Order?</h2>
+                <p>Send us an email and we'll get back to you super fast!</p>
+                <a href="mailto:Mira@3DoodleCritters.com" class="contact-email">Mira@3DoodleCritters.com</a>
+                <p style="margin-top: 1.5rem; font-size: 1rem; opacity: 0.9;">Please include: which items you want, your name, and if you want pickup or shipping!</p>
+            </div>
+        </section>
+    </main>
+    <footer>
+        <div class="footer-hearts">💛 💙 💜</div>
+        <p>Made with love by Mira | 3Doodle Critters &copy; 2026</p>
+    </footer>
+    <script>
+        // Load the following catalog chunks as the visitor nears the end of the grid
+        (function () {
+            var nav = document.querySelector('.pagination[data-next]');
+            if (!nav || !window.fetch || !('IntersectionObserver' in window)) return;
+            var grid = document.querySelector('.products-grid');
+            var next = nav.getAttribute('data-next');
+            var nextLink = nav.querySelector('a[rel=next]');
+            var loading = false;
+            var sizes = '(max-width: 640px) 100vw, 380px';  // CARD_SIZES
+
+            function el(tag, className, text) {
+                var node = document.createElement(tag);
+                if (className) node.className = className;
+                if (text !== undefined) node.textContent = text;
+                return node;
+            }
+
+            function card(item) {
+                var div = el('div', 'product-card' + (item.sold ? ' sold' : ''));
+                var image = el('div', 'product-image');
+                if (item.picture) {
+                    var picture = el('picture');
+                    var source = el('source');
+                    source.type = 'image/webp';
+                    source.srcset = item.picture.webp;
+                    source.sizes = sizes;
+                    picture.appendChild(source);
+                    var img = el('img');
+                    img.src = item.picture.src;
+                    img.srcset = item.picture.jpeg;
+                    img.sizes = sizes;
+                    img.width = item.picture.width;
+                    img.height = item.picture.height;
+                    img.alt = item.title;
+                    img.loading = 'lazy';
+                    picture.appendChild(img);
+                    image.appendChild(picture);
+                } else if (item.image) {
+                    var plain = el('img');
+                    plain.src = 'images/' + item.image;
+                    plain.alt = item.title;
+                    plain.loading = 'lazy';
+                    image.appendChild(plain);
+                } else {
+                    image.appendChild(el('div', 'no-image', 'No Image'));
+                }
+                if (item.sold) image.appendChild(el('span', 'sold-badge', 'SOLD'));
+                var info = el('div', 'product-info');
+                var link = el('a', '', item.title);
+                link.href = 'items/' + item.id + '.html';
+                info.appendChild(el('h3')).appendChild(link);
+                info.appendChild(el('p', '', item.description));
+                info.appendChild(el('span', 'price', '$' + Number(item.price).toFixed(2)));
+                div.appendChild(image);
+                div.appendChild(info);
+                return div;
+            }
+
+            var sentinel = el('div');
+            nav.parentNode.insertBefore(sentinel, nav);
+            var observer = new IntersectionObserver(function (entries) {
+                if (!entries[0].isIntersecting || loading || !next) return;
+                loading = true;
+                fetch(next).then(function (response) {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.json();
+                }).then(function (chunk) {
+                    chunk.items.forEach(function (item) { grid.appendChild(card(item)); });
+                    next = chunk.next;
+                    loading = false;
+                    if (!next) {
+                        observer.disconnect();
+                    } else {
+                        // Check again in case the end of the grid is still in view
+                        observer.unobserve(sentinel);
+                        observer.observe(sentinel);
+                    }
+                }).catch(function () {
+                    observer.disconnect();
+                    if (nextLink) nextLink.hidden = false;
+                });
+            }, { rootMargin: '800px' });
+            if (nextLink) nextLink.hidden = true;
+            observer.observe(sentinel);
+        })();
+    </script>
+</body>
+</html>'''
+
+PAGE_HEAD, _rest = PAGE_TEMPLATE.split("{products}")
+PAGE_MIDDLE, PAGE_TAIL = _rest.split("{pagination}")
+
+# Start of an item page, up to its <title>
+ITEM_PAGE_HEAD = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link href="https://fonts.googleapis.com/css2?family=Fredoka+One&family=Nunito:wght@400;600;700&display=swap" rel="stylesheet">
+    <style>
+        body { font-family: 'Nunito', sans-serif; background: #FFF9F0; color: #2C3E50; line-height: 1.6; margin: 0; }
+        header { background: linear-gradient(135deg, #FFDC50 0%, #3498DB 50%, #9B59B6 100%); padding: 1rem; text-align: center; }
+        header a { font-family: 'Fredoka One', cursive; font-size: 2rem; color: white; text-decoration: none; text-shadow: 2px 2px 0 rgba(0,0,0,0.2); }
+        main { max-width: 600px; margin: 2rem auto; padding: 2rem; background: white; border-radius: 20px; box-shadow: 0 5px 20px rgba(155, 89, 182, 0.15); }
+        .product-image { position: relative; overflow: hidden; border-radius: 15px; background: linear-gradient(135deg, #FFB8D0, #FFDC50); text-align: center; }
+        .product-image img { max-width: 100%; max-height: 400px; width: auto; height: auto; display: block; margin: 0 auto; }
+        .no-image { padding: 4rem; color: white; font-size: 1.5rem; }
+        .sold-badge { position: absolute; top: 15px; right: -35px; background: #FF6B9D; color: white; padding: 5px 40px; font-weight: 700; transform: rotate(45deg); }
+        h1 { font-family: 'Fredoka One', cursive; color: #16A085; }
+        .price { font-family: 'Fredoka One', cursive; font-size: 1.5rem; color: #FF6B9D; }
+        a { color: #7D3C98; font-weight: 700; }
+    </style>
+'''